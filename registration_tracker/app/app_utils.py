@@ -1,98 +1,81 @@
-import sqlite3, time
 import streamlit as st
 import pandas as pd
 import controllers.plans as c_plans
-import controllers.majors as c_majors
-import controllers.courses as c_courses
-import controllers.semesters as c_semesters
-
-# Database Configuration (SQLite)
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return conn
+import catalog
+from db_utils import get_db_connection
+import prereq_graph
+import prereq_analysis
+import read_cache
+import reads
+import eligibility
+import plan_validator
+import requirements
+import revalidation
 
 def check_prerequisites(plan_id, course_subject, course_number, target_semester_id):
     """
     Check if prerequisites for a course are met in previous semesters.
+    Prerequisites come from the in-memory graph; the plan's history is one query.
     Returns: 
         - True if all prerequisites are met
         - False if some prerequisites are not met
-        - A list of missing prerequisites if detailed=True
     """
-    con = get_db_connection()
     try:
-        # Get all prerequisites for this course
-        prerequisites = c_courses.get_course_prereq(course_subject, course_number)
-        
-        if not prerequisites:
+        graph = prereq_graph.get_graph()
+        if not graph.has_prereqs(course_subject, course_number):
             # No prerequisites, so requirements are met
             return True
         
-        # Get all previous semesters in this plan (before target_semester_id)
-        sem_order_query = """
-            SELECT ps.semester_id, s.term, s.year
-            FROM Plan_Semesters ps
-            JOIN Semesters s ON ps.semester_id = s.id
-            WHERE ps.plan_id = ?
-            ORDER BY s.year, 
-                    CASE WHEN s.term = 'Spring' THEN 0 ELSE 1 END
-        """
-        all_semesters = con.execute(sem_order_query, (plan_id,)).fetchall()
-        
-        # Find the index of the target semester
-        target_idx = -1
-        for i, sem in enumerate(all_semesters):
-            if sem[0] == target_semester_id:
-                target_idx = i
-                break
-        
-        if target_idx == -1:
+        # Get all courses in semesters before target_semester_id
+        previous_courses = c_plans.get_prior_courses(plan_id, target_semester_id)
+        if previous_courses is None:
             # Target semester not found
             return False
         
-        # Get all courses in previous semesters
-        previous_courses = []
-        for i in range(target_idx):
-            semester_id = all_semesters[i][0]
-            courses_query = """
-                SELECT course_subject, course_number
-                FROM Plan_Semester_Courses
-                WHERE plan_id = ? AND semester_id = ?
-            """
-            courses = con.execute(courses_query, (plan_id, semester_id)).fetchall()
-            previous_courses.extend([(c[0], c[1]) for c in courses])
-        
-        # Group prerequisites by group_id
-        grouped_prereqs = {}
-        for prereq in prerequisites:
-            group_id = prereq[0]
-            if group_id not in grouped_prereqs:
-                grouped_prereqs[group_id] = []
-            grouped_prereqs[group_id].append((prereq[1], prereq[2]))
-        
-        # Check if all prerequisite groups are satisfied
-        missing_prereqs = []
-        for group_id, prereqs in grouped_prereqs.items():
-            group_satisfied = False
-            for prereq in prereqs:
-                if prereq in previous_courses:
-                    group_satisfied = True
-                    break
-            
-            if not group_satisfied:
-                missing_prereqs.extend(prereqs)
-        
-        return len(missing_prereqs) == 0
+        return graph.is_satisfied(course_subject, course_number, previous_courses)
         
     except Exception as e:
         print(f"Error checking prerequisites: {e}")
         return False
-    finally:
-        con.close()
+
+def _prerequisite_hint(course_subject, course_number):
+    # Explain from the catalog-wide analysis how far into a plan the course can go
+    try:
+        semesters = prereq_analysis.get_analysis().min_semesters_before(course_subject, course_number)
+    except Exception as e:
+        print(f"Error analyzing prerequisites: {e}")
+        return ""
+    if semesters is None:
+        return " Its prerequisites can never be met (they form a cycle or name a missing course)."
+    if semesters:
+        return f" It needs at least {semesters} earlier semester{'s' if semesters > 1 else ''} of prerequisites."
+    return ""
+
+def _validator_for_edit(plan_id):
+    # Taken before the write so the edit can be applied to it incrementally
+    try:
+        return plan_validator.get_validator(plan_id)
+    except Exception as e:
+        print(f"Error loading plan validator: {e}")
+        return None
+
+def _store_violations(plan_id, validator):
+    # Keep the advisor dashboard's Plan_Violations rows in step with the edit
+    try:
+        revalidation.write_violations({plan_id: validator.get_violations()})
+    except Exception as e:
+        print(f"Error storing plan violations: {e}")
+
+def get_plan_violations(plan_id):
+    """
+    Scheduled courses in a plan whose prerequisites are not met, as
+    plan_validator.Violation tuples in plan order.
+    """
+    try:
+        return plan_validator.get_validator(plan_id).get_violations()
+    except Exception as e:
+        print(f"Error validating plan: {e}")
+        return []
 
 def add_course_to_semester(plan_id, semester_id, course_subject, course_number):
     """
@@ -105,9 +88,11 @@ def add_course_to_semester(plan_id, semester_id, course_subject, course_number):
     if not prereqs_met:
         return {
             "success": False,
-            "message": "Prerequisites for this course are not met in previous semesters."
+            "message": "Prerequisites for this course are not met in previous semesters." + _prerequisite_hint(course_subject, course_number)
         }
     
+    validator = _validator_for_edit(plan_id)
+
     # Check if course already exists in this semester
     con = get_db_connection()
     try:
@@ -131,6 +116,11 @@ def add_course_to_semester(plan_id, semester_id, course_subject, course_number):
         """
         con.execute(insert_query, (plan_id, semester_id, course_subject, course_number))
         con.commit()
+        read_cache.invalidate("plan", plan_id)
+        if validator:
+            validator.add(course_subject, course_number, semester_id)
+            plan_validator.record_edit(plan_id, validator)
+            _store_violations(plan_id, validator)
         
         return {
             "success": True,
@@ -150,166 +140,82 @@ def get_available_courses(plan_id, semester_id, major_id):
     """
     Get courses that are required for the major and meet prerequisites for the given semester.
     This function checks major sections, concentrations, and gen ed requirements.
+    The plan's history is loaded once and every candidate is checked in memory.
     """
-    con = get_db_connection()
     try:
-        # Get plan information to check if it has a concentration
-        plan_query = """
-            SELECT concentration_id FROM Plans
-            WHERE id = ?
-        """
-        plan = con.execute(plan_query, (plan_id,)).fetchone()
-        concentration_id = plan['concentration_id'] if plan else None
-        
-        # Get courses already in the plan
-        plan_courses_query = """
-            SELECT course_subject, course_number
-            FROM Plan_Semester_Courses
-            WHERE plan_id = ?
-        """
-        plan_courses = con.execute(plan_courses_query, (plan_id,)).fetchall()
-        plan_course_set = {(c['course_subject'], c['course_number']) for c in plan_courses}
-        
-        available_courses = []
-        
-        # 1. Get major section requirements
-        major_section_query = """
-            SELECT msr.course_subject, msr.course_number, c.name, c.credits, ms.section
-            FROM Major_Sections ms
-            JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
-            JOIN Courses c ON msr.course_subject = c.subject AND msr.course_number = c.number
-            WHERE ms.major_id = ?
-            ORDER BY ms.section, msr.group_id
-        """
-        major_courses = con.execute(major_section_query, (major_id,)).fetchall()
-        
-        # 2. Get concentration requirements if applicable
-        concentration_courses = []
-        if concentration_id:
-            concentration_query = """
-                SELECT csr.course_subject, csr.course_number, c.name, c.credits, cs.section
-                FROM Concentration_Sections cs
-                JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
-                JOIN Courses c ON csr.course_subject = c.subject AND csr.course_number = c.number
-                WHERE cs.concentration_id = ?
-                ORDER BY cs.section, csr.group_id
-            """
-            concentration_courses = con.execute(concentration_query, (concentration_id,)).fetchall()
-        
-        # 3. Get gen ed requirements
-        gen_ed_query = """
-            SELECT ger.course_subject, ger.course_number, c.name, c.credits, ges.section
-            FROM Gen_Ed_Sections ges
-            JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
-            JOIN Courses c ON ger.course_subject = c.subject AND ger.course_number = c.number
-            ORDER BY ges.section, ger.group_id
-        """
-        gen_ed_courses = con.execute(gen_ed_query).fetchall()
-        
-  
-        # Combine all required courses
-        all_courses = major_courses + concentration_courses + gen_ed_courses
-        # Process courses to check prerequisites and build available courses list
-        for course in all_courses:
-            course_key = (course['course_subject'], course['course_number'])
-            
-            # Skip if already in the plan
-            if course_key in plan_course_set:
-                continue
-            
-            # Check prerequisites
-            if check_prerequisites(plan_id, course['course_subject'], course['course_number'], semester_id):
-                available_courses.append({
-                    'subject': course[0],
-                    'number': course[1],
-                    'name': course[2],
-                    'credits': course[3],
-                    'section': course[4]  # Include section information for display
-                })
-        return available_courses
-        
-        
+        return eligibility.get_available_courses(plan_id, semester_id, major_id)
     except Exception as e:
         print(f"Error getting available courses: {e}")
         return []
-    finally:
-        con.close()
         
+def get_eligibility_matrix(plan_id, major_id):
+    """
+    Available courses for every semester of a plan, as {semester_id: [course dicts]}.
+    Compute it once per render and slice it per semester instead of calling
+    get_available_courses() inside the semester loop.
+    """
+    try:
+        return eligibility.get_eligibility_matrix(plan_id, major_id)
+    except Exception as e:
+        print(f"Error getting available courses: {e}")
+        return {}
+
+def group_courses_by_section(courses, major_id, concentration_id=None):
+    """
+    Group available courses for the "Add Courses" tabs as
+    {"major" | "concentration" | "gen_ed": {section name: [courses]}}.
+    Every section of the plan's major/concentration and the gen eds is present,
+    and the course-to-section index behind it is cached per catalog version.
+    """
+    try:
+        index = eligibility.get_section_index(major_id, concentration_id)
+    except Exception as e:
+        print(f"Error getting requirement sections: {e}")
+        index = eligibility.SectionIndex({kind: () for kind in eligibility.SECTION_KINDS}, {})
+    return eligibility.group_by_section(courses, index)
+
 def remove_from_semester(plan_id, semester_id, course_subject, course_number):
     """
-    Remove a course from a semester.
+    Remove a course from a semester unless a later course in the plan still
+    needs it. One history query, then a set-based check against the reverse
+    prerequisite index; a course that has another scheduled alternative in the
+    same OR-group does not block the removal.
     Returns a dictionary with success status and message.
     """
-    con = get_db_connection()
     try:
-        # Check if any courses in future semesters depend on this as a prerequisite
-        # First get all future semesters
-        sem_order_query = """
-            SELECT ps.semester_id, s.term, s.year
-            FROM Plan_Semesters ps
-            JOIN Semesters s ON ps.semester_id = s.id
-            WHERE ps.plan_id = ?
-            ORDER BY s.year, 
-                    CASE WHEN s.term = 'Spring' THEN 0 ELSE 1 END
-        """
-        all_semesters = con.execute(sem_order_query, (plan_id,)).fetchall()
-        
-        # Find the index of the current semester
-        current_idx = -1
-        for i, sem in enumerate(all_semesters):
-            if sem[0] == semester_id:
-                current_idx = i
-                break
-                
-        if current_idx == -1:
-            return {"success": False, "message": "Semester not found in plan."}
-            
-        # Check for future semesters' courses that might depend on this course
+        history = c_plans.get_plan_history(plan_id)
+        broken = prereq_graph.get_graph().broken_by_removal(course_subject, course_number, semester_id, history)
+    except Exception as e:
+        return {"success": False, "message": f"Error removing course: {e}"}
+
+    if broken is None:
+        return {"success": False, "message": "Semester not found in plan."}
+
+    if broken:
         dependent_courses = []
-        
-        for i in range(current_idx + 1, len(all_semesters)):
-            future_semester_id = all_semesters[i][0]
-            
-            # Get courses in this future semester
-            future_courses_query = """
-                SELECT psc.course_subject, psc.course_number, c.name
-                FROM Plan_Semester_Courses psc
-                JOIN Courses c ON psc.course_subject = c.subject AND psc.course_number = c.number
-                WHERE psc.plan_id = ? AND psc.semester_id = ?
-            """
-            future_courses = con.execute(future_courses_query, 
-                                       (plan_id, future_semester_id)).fetchall()
-                                       
-            for fc in future_courses:
-                # Check if this course depends on the course we're trying to remove
-                prereq_query = """
-                    SELECT 1 FROM Prerequisites
-                    WHERE parent_subject = ? AND parent_number = ? 
-                    AND course_subject = ? AND course_number = ?
-                """
-                is_prereq = con.execute(prereq_query, 
-                                      (fc[0], fc[1], course_subject, course_number)).fetchone()
-                                      
-                if is_prereq:
-                    dependent_courses.append(f"{fc[0]} {fc[1]} - {fc[2]}")
-        
-        if dependent_courses:
-            error_msg = f"Cannot remove. It is a prerequeisite for: \n\n{', '.join(dependent_courses)}"
-            st.error(error_msg)
-            time.sleep(3)
-            return {
-                "success": False,
-                "message": error_msg
-            }
-            
-        
-        # If no dependencies, remove the course
+        for _, (subject, number) in broken:
+            course = catalog.get_course(subject, number)
+            name = f" - {course['name']}" if course else ""
+            dependent_courses.append(f"{subject} {number}{name}")
+        return {
+            "success": False,
+            "message": f"Cannot remove. It is a prerequisite for: \n\n{', '.join(dependent_courses)}"
+        }
+
+    validator = _validator_for_edit(plan_id)
+    con = get_db_connection()
+    try:
         delete_query = """
             DELETE FROM Plan_Semester_Courses
             WHERE plan_id = ? AND semester_id = ? AND course_subject = ? AND course_number = ?
         """
         con.execute(delete_query, (plan_id, semester_id, course_subject, course_number))
         con.commit()
+        read_cache.invalidate("plan", plan_id)
+        if validator:
+            validator.remove(course_subject, course_number, semester_id)
+            plan_validator.record_edit(plan_id, validator)
+            _store_violations(plan_id, validator)
         
         return {"success": True, "message": "Course removed successfully."}
         
@@ -319,25 +225,36 @@ def remove_from_semester(plan_id, semester_id, course_subject, course_number):
     finally:
         con.close()
 
+# Degree length used when a major has no requirement sections recorded
+DEFAULT_TARGET_CREDITS = 120
+
 def display_plan(plan_id):
     st.title("Degree Plan")
     
-    plan = c_plans.get_plan_from_id(plan_id)
+    # Plan, major, semesters and courses in one snapshot
+    snapshot = reads.load_plan_snapshot(plan_id)
 
-    if not plan:
+    if not snapshot:
         st.error("Plan not found")
         return
-
-    major = c_majors.get_major(plan['major_id'])
     
-    st.header(f"Plan: {plan['name']}")
-    st.subheader(f"Major: {major['name']}")
-    
-    # Get all semesters in the plan
-    semesters = c_semesters.get_semesters(plan_id)
+    st.header(f"Plan: {snapshot.name}")
+    st.subheader(f"Major: {snapshot.major_name}")
+
+    # Courses whose prerequisites are no longer met (e.g. after a prerequisite change)
+    violations = get_plan_violations(plan_id)
+    if violations:
+        semester_names = {semester.id: f"{semester.term} {semester.year}" for semester in snapshot.semesters}
+        lines = []
+        for violation in violations:
+            lines.append(f"{violation.subject} {violation.number} ({semester_names.get(violation.semester_id, '')}) "
+                         f"needs {plan_validator.describe_missing(violation.missing)}")
+        st.warning("Prerequisites not met:\n\n" + "\n\n".join(lines))
     
-    # Initialize total credit count
-    total_credits = 0
+    # Credit totals are already computed by the snapshot
+    total_credits = snapshot.total_credits
+    # Section-by-section progress toward the major, concentration and gen eds
+    audit = reads.get_degree_audit(plan_id)
     
     # Create a container for the progress bar
     progress_container = st.container()
@@ -346,22 +263,14 @@ def display_plan(plan_id):
         progress_bar = st.progress(0)
     
     # Display each semester in an expander
-    for semester in semesters:
-        semester_id = semester['id']
-        semester_name = f"{semester['term']} {semester['year']}"
-        
-        # Get courses for this semester
-        courses = c_courses.get_semester_courses(semester_id, plan_id)
-        
-        # Calculate semester credit total
-        semester_credits = sum(course['credits'] for course in courses)
-        total_credits += semester_credits
+    for semester in snapshot.semesters:
+        semester_name = f"{semester.term} {semester.year}"
         
         # Create an expander for this semester
-        with st.expander(f"{semester_name} - {semester_credits} Credits"):
-            if courses:
+        with st.expander(f"{semester_name} - {semester.credits} Credits"):
+            if semester.courses:
                 # Convert to DataFrame for display
-                df = pd.DataFrame([dict(c) for c in courses])
+                df = pd.DataFrame([c._asdict() for c in semester.courses])
                 # Add a course code column that combines subject and number
                 df['Course'] = df['subject'] + ' ' + df['number'].astype(str)
                 # Reorder and rename columns
@@ -373,14 +282,31 @@ def display_plan(plan_id):
             else:
                 st.write("No courses assigned to this semester yet.")
     
-    # Update the progress indicator
-    # Assuming a typical degree requires 120 credits
-    target_credits = 120
-    progress_percentage = min(total_credits / target_credits, 1.0)
+    # Update the progress indicator from the audit; majors without recorded
+    # requirement sections fall back to a typical 120-credit degree
+    if audit.credits_required:
+        counted_credits, target_credits = audit.credits_counted, audit.credits_required
+    else:
+        counted_credits, target_credits = total_credits, DEFAULT_TARGET_CREDITS
+    progress_percentage = min(counted_credits / target_credits, 1.0)
     
     with progress_container:
-        st.write(f"Total Credits: {total_credits}/{target_credits} - {progress_percentage:.0%}")
+        st.write(f"Requirement Credits: {counted_credits}/{target_credits} - {progress_percentage:.0%}")
         progress_bar.progress(progress_percentage)
+
+    if audit.sections:
+        with st.expander("Degree Audit", expanded=not audit.complete):
+            st.table(pd.DataFrame(
+                [[progress.section.name,
+                  f"{min(progress.credits, progress.section.credits_required)}/{progress.section.credits_required}",
+                  "✅" if requirements.is_complete(progress) else "⏳",
+                  requirements.describe_missing(progress) or "-"]
+                 for progress in audit.sections],
+                columns=["Requirement", "Credits", "Done", "Still Needed"]
+            ))
+            if audit.other_courses:
+                st.caption("Not counted toward any requirement: " +
+                           ", ".join(f"{subject} {number}" for subject, number in audit.other_courses))
     
     # Display overall plan statistics
     st.subheader("Plan Summary")
@@ -388,9 +314,9 @@ def display_plan(plan_id):
     with col1:
         st.metric("Total Credits", total_credits)
     with col2:
-        st.metric("Semesters", len(semesters))
+        st.metric("Semesters", len(snapshot.semesters))
     with col3:
-        st.metric("Remaining Credits", max(0, target_credits - total_credits))
+        st.metric("Remaining Credits", max(0, target_credits - counted_credits))
 
 # Sort semesters chronologically (Spring comes before Fall in same year)
 def semester_sort_key(semester_name):
@@ -405,8 +331,8 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
     st.subheader("Plan Comparison")
     
     # Get plan details
-    original_plan = c_plans.get_plan_from_id(original_plan_id)
-    suggestion_plan = c_plans.get_plan_from_id(suggestion_plan_id)
+    original_plan = reads.get_plan_from_id(original_plan_id)
+    suggestion_plan = reads.get_plan_from_id(suggestion_plan_id)
     
     if not original_plan or not suggestion_plan:
         st.error("One or both plans not found")
@@ -420,7 +346,7 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
     
     with col1:
         st.markdown(f"### Original Plan: {original_plan['name']}")
-        major = c_majors.get_major(original_plan['major_id'])
+        major = catalog.get_major(original_plan['major_id'])
         st.write(f"**Major:** {major['name']}")
     
     with col2:
@@ -430,8 +356,8 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
                 st.write(advisor_notes)
     
     # Get all semesters from both plans
-    original_semesters = c_semesters.get_semesters(original_plan_id)
-    suggestion_semesters = c_semesters.get_semesters(suggestion_plan_id)
+    original_semesters = reads.get_semesters(original_plan_id)
+    suggestion_semesters = reads.get_semesters(suggestion_plan_id)
     
     # Map semesters by term+year for easy matching
     original_sem_map = {f"{sem['term']} {sem['year']}": sem for sem in original_semesters}
@@ -452,7 +378,7 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
             st.markdown("### Original Courses")
             if semester_name in original_sem_map:
                 sem = original_sem_map[semester_name]
-                original_courses = c_courses.get_semester_courses(sem['id'], original_plan_id)
+                original_courses = reads.get_semester_courses(sem['id'], original_plan_id)
                 
                 if original_courses:
                     # Create a map of course identifiers for easy comparison
@@ -462,7 +388,7 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
                     suggestion_courses = []
                     if semester_name in suggestion_sem_map:
                         suggestion_sem = suggestion_sem_map[semester_name]
-                        suggestion_courses = c_courses.get_semester_courses(suggestion_sem['id'], suggestion_plan_id)
+                        suggestion_courses = reads.get_semester_courses(suggestion_sem['id'], suggestion_plan_id)
                     
                     suggestion_course_map = {f"{c['subject']} {c['number']}": c for c in suggestion_courses}
                     
@@ -520,7 +446,7 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
             st.markdown("### Suggested Courses")
             if semester_name in suggestion_sem_map:
                 sem = suggestion_sem_map[semester_name]
-                suggestion_courses = c_courses.get_semester_courses(sem['id'], suggestion_plan_id)
+                suggestion_courses = reads.get_semester_courses(sem['id'], suggestion_plan_id)
                 
                 if suggestion_courses:
                     # Create a map of course identifiers for easy comparison
@@ -530,7 +456,7 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
                     original_courses = []
                     if semester_name in original_sem_map:
                         original_sem = original_sem_map[semester_name]
-                        original_courses = c_courses.get_semester_courses(original_sem['id'], original_plan_id)
+                        original_courses = reads.get_semester_courses(original_sem['id'], original_plan_id)
                     
                     original_course_map = {f"{c['subject']} {c['number']}": c for c in original_courses}
                     
@@ -588,47 +514,27 @@ def display_plan_comparison(original_plan_id, suggestion_plan_id):
     
     col1, col2 = st.columns(2)
     with col1:
-        # Update the suggestion plan with original plan's metadata and remove suggestion flags
+        # Promote the suggestion in place of the original plan
         if st.button("Accept Suggestion", key=f"accept_{suggestion_plan_id}"):
-            original_name = original_plan['name']
-            con = get_db_connection()
-            try:
-                update_result = c_plans.update_plan(
-                    suggestion_plan_id, 
-                    name=original_name,  
-                    student_id=original_plan['student_id'],
-                    advisor_id=original_plan['advisor_id'],
-                    suggestion_accepted=True
-                )
-                if not update_result["success"]:
-                    st.error(f"Error updating plan: {update_result['message']}")
-                    return False
-                delete_result = c_plans.delete_plan(original_plan_id)
-                if not delete_result["success"]:
-                    st.error(f"Error deleting original plan: {delete_result['message']}")
-                    return False
-                
-                st.success("Suggestion accepted! Your plan has been updated.")
-                time.sleep(1)
-                st.rerun() 
-                return True
-            except Exception as e:
-                st.error(f"Error processing plan acceptance: {e}")
+            accept_result = c_plans.accept_suggestion(suggestion_plan_id)
+            if not accept_result["success"]:
+                st.error(f"Error accepting suggestion: {accept_result['message']}")
                 return False
-            finally:
-                con.close()
+
+            st.success("Suggestion accepted! Your plan has been updated.")
+            st.rerun()
+            return True
     
     with col2:
          # When rejecting, delete the suggestion plan
         if st.button("Reject Suggestion", key=f"reject_{suggestion_plan_id}"):
-            delete_result = c_plans.delete_plan(suggestion_plan_id)
+            reject_result = c_plans.reject_suggestion(suggestion_plan_id)
             
-            if delete_result["success"]:
+            if reject_result["success"]:
                 st.info("Suggestion rejected and removed.")
-                time.sleep(1)
                 st.rerun()
                 return False
             else:
-                st.error(f"Error deleting suggestion plan: {delete_result['message']}")
+                st.error(f"Error deleting suggestion plan: {reject_result['message']}")
                 return False
     return None
\ No newline at end of file
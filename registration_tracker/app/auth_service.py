@@ -0,0 +1,140 @@
+import hmac
+import os
+import secrets
+import sqlite3
+from collections import namedtuple
+from concurrent.futures import TimeoutError as VerifyTimeout
+import passwords
+from cache_utils import TTLCache
+from db_utils import get_db_connection, apply_users_table, USER_TABLES
+
+# How long a successful login is remembered, and for how many usernames
+LOGIN_CACHE_TTL = float(os.environ.get("REG_TRACKER_LOGIN_CACHE_TTL", 300))
+LOGIN_CACHE_SIZE = 1024
+
+# The page each role lands on after logging in
+HOME_PAGES = {
+    "student": "pages/student.py",
+    "advisor": "pages/advisor.py",
+    "admin": "pages/admin.py",
+}
+
+Identity = namedtuple("Identity", ["role", "id", "username"])
+
+# One primary-key probe on the Users login table (see db_utils.apply_users_table)
+IDENTITY_QUERY = """ SELECT role, id, password FROM Users
+                     WHERE username = :username """
+
+_identities = TTLCache(maxsize=LOGIN_CACHE_SIZE, ttl=LOGIN_CACHE_TTL)
+
+
+def lookup_identity(username):
+    """Returns (Identity, stored password hash) for a username, or None if no user has it."""
+    con = get_db_connection()
+    try:
+        try:
+            row = con.execute(IDENTITY_QUERY, {"username": username}).fetchone()
+        except sqlite3.OperationalError as e:
+            # A database from before the Users table: migrate it once and retry
+            if "no such table" not in str(e):
+                raise
+            apply_users_table(con)
+            row = con.execute(IDENTITY_QUERY, {"username": username}).fetchone()
+    finally:
+        con.close()
+    if row is None:
+        return None
+    return Identity(row[0], row[1], username), row[2]
+
+
+# Per-process key for remembering verified passwords without keeping them or their slow hashes
+_fingerprint_key = secrets.token_bytes(32)
+
+
+def _fingerprint(password):
+    return hmac.new(_fingerprint_key, password.encode("utf-8"), "sha256").digest()
+
+
+def _upgrade_password(identity, password):
+    """Replace a plaintext or outdated stored password with a current hash."""
+    table = dict(USER_TABLES)[identity.role]
+    new_hash = passwords.get_executor().submit(passwords.hash_password, password).result()
+    con = get_db_connection()
+    try:
+        con.execute(f""" UPDATE {table}
+                         SET password = ?
+                         WHERE id = ? """, (new_hash, identity.id))
+        con.commit()
+    except sqlite3.Error as e:
+        # The login itself succeeded; the upgrade is retried next time
+        print(f"Error upgrading password hash: {e}")
+    finally:
+        con.close()
+
+
+def authenticate(username, password):
+    """
+    Check a username and password.
+    Returns {"success": bool, "message": str, "identity": Identity or None}.
+
+    The key derivation runs on the passwords worker pool so concurrent logins
+    don't queue behind each other. Successful logins are cached for
+    LOGIN_CACHE_TTL seconds, so repeat logins skip both the database and the
+    hash. Plaintext or outdated stored passwords are re-hashed on login.
+    """
+    cached = _identities.get(username)
+    if cached is not None and hmac.compare_digest(cached[1], _fingerprint(password)):
+        return {"success": True, "message": "Logged in.", "identity": cached[0]}
+
+    found = lookup_identity(username)
+    if found is None:
+        _identities.pop(username)
+        return {"success": False, "message": "Username not found. Please try again.", "identity": None}
+
+    identity, stored_password = found
+    try:
+        verified = passwords.verify_password_async(password, stored_password).result(passwords.VERIFY_TIMEOUT)
+    except VerifyTimeout:
+        return {"success": False, "message": "Login is taking too long. Please try again.", "identity": None}
+    if not verified:
+        _identities.pop(username)
+        return {"success": False, "message": "Credentials do not match. Please try again.", "identity": None}
+
+    if passwords.needs_rehash(stored_password):
+        _upgrade_password(identity, password)
+    _identities.set(username, (identity, _fingerprint(password)))
+    return {"success": True, "message": "Logged in.", "identity": identity}
+
+
+def forget_identities():
+    """Drop cached logins. Called whenever user accounts are changed or deleted."""
+    _identities.clear()
+
+
+def rehash_stored_passwords(batch_size=500):
+    """
+    Migration: hash every plaintext password still stored in Students, Advisors
+    and Admins. Batches are hashed on the worker pool and committed one at a
+    time at passwords.HASH_ITERATIONS, the cost logins check against (set it with
+    REG_TRACKER_HASH_ITERATIONS). Hashes with an outdated cost can't be redone
+    without the password and are upgraded at the user's next login instead.
+    Returns {table: rows hashed}.
+    """
+    counts = {}
+    con = get_db_connection()
+    try:
+        for _, table in USER_TABLES:
+            rows = [row for row in con.execute(f"SELECT id, password FROM {table}").fetchall()
+                    if not passwords.is_hashed(row[1])]
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                hashes = passwords.hash_passwords([row[1] for row in batch])
+                con.executemany(f""" UPDATE {table}
+                                     SET password = ?
+                                     WHERE id = ? """, zip(hashes, (row[0] for row in batch)))
+                con.commit()
+            counts[table] = len(rows)
+    finally:
+        con.close()
+    forget_identities()
+    return counts
@@ -22,9 +22,11 @@ def check_auth(required_roles: Union[RoleType, List[RoleType]]) -> bool:
     if "username" not in st.session_state or not st.session_state.username:
         return False
     
-    # Check if role is stored in session state
+    # Check if role and id are stored in session state (both are set at login)
     if "user_role" not in st.session_state or not st.session_state.user_role:
         return False
+    if "user_id" not in st.session_state or st.session_state.user_id is None:
+        return False
     
     # Now check if user's role is in the required roles
     return st.session_state.user_role in required_roles
@@ -0,0 +1,70 @@
+"""
+Logins per second at several password hashing costs.
+
+Simulated sessions log in concurrently; each login verifies a PBKDF2 hash on
+the passwords worker pool, the same way auth_service.authenticate does. Use it
+to pick REG_TRACKER_HASH_ITERATIONS for the server. Run it from the app directory:
+
+    python benchmarks/bench_logins.py --sessions 16 --workers 4 --seconds 3
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import passwords
+
+
+def run_cost(iterations, sessions, seconds):
+    stored = passwords.hash_password("pword", iterations)
+
+    # latency of one verification with nothing else running
+    start = time.perf_counter()
+    passwords.verify_password("pword", stored)
+    single = time.perf_counter() - start
+
+    stop = threading.Event()
+    counts = []
+    lock = threading.Lock()
+
+    def session():
+        done = 0
+        while not stop.is_set():
+            passwords.verify_password_async("pword", stored).result()
+            done += 1
+        with lock:
+            counts.append(done)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {"single_ms": single * 1000, "logins_per_sec": sum(counts) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--costs", type=int, nargs="+", default=[10000, 100000, 240000, 600000],
+                        help="PBKDF2 iteration counts to compare")
+    parser.add_argument("--sessions", type=int, default=16, help="concurrent logins")
+    parser.add_argument("--workers", type=int, default=passwords.VERIFY_WORKERS, help="verifier threads")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    passwords.VERIFY_WORKERS = args.workers
+    print(f"{args.sessions} sessions, {args.workers} verifier workers, {args.seconds:.0f}s per cost")
+    print(f"{'iterations':>10}{'ms/login':>12}{'logins/s':>12}")
+    for iterations in args.costs:
+        result = run_cost(iterations, args.sessions, args.seconds)
+        print(f"{iterations:>10}{result['single_ms']:>12.1f}{result['logins_per_sec']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Reader/writer throughput of reg_tracker.db under each storage profile.
+
+Several reader threads load plan semesters the way the student pages do while
+writer threads save notes and add plan courses the way advisors do. Run it from
+the app directory:
+
+    python benchmarks/bench_storage.py --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_utils import DB_NAME, STORAGE_PROFILES, apply_storage_profile
+
+READ_QUERY = """ SELECT * FROM Courses c
+                 JOIN Plan_Semester_Courses pcs
+                 ON c.subject = pcs.course_subject AND c.number = pcs.course_number
+                 WHERE pcs.plan_id = ?
+                 ORDER BY c.subject, c.number """
+
+NOTE_QUERY = """ INSERT INTO Notes (advisor_id, student_id, plan_id, content, timestamp)
+                 VALUES (?, NULL, ?, ?, strftime('%s', 'now')) """
+
+COURSE_QUERY = """ INSERT OR IGNORE INTO Plan_Semester_Courses (plan_id, semester_id, course_subject, course_number)
+                   VALUES (?, ?, ?, ?) """
+
+
+def connect(path, profile):
+    con = sqlite3.connect(path, check_same_thread=False)
+    apply_storage_profile(con, profile)
+    return con
+
+
+def run_profile(source, profile, readers, writers, seconds):
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, "bench.db")
+    shutil.copy(source, path)
+
+    # switch the copied file into the profile's journal mode up front
+    connect(path, profile).close()
+
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def reader():
+        con = connect(path, profile)
+        done = locked = 0
+        while not stop.is_set():
+            try:
+                con.execute(READ_QUERY, (1,)).fetchall()
+                done += 1
+            except sqlite3.OperationalError:
+                locked += 1
+        con.close()
+        with lock:
+            counts["reads"] += done
+            counts["locked"] += locked
+
+    def writer(worker_id):
+        con = connect(path, profile)
+        done = locked = 0
+        i = 0
+        while not stop.is_set():
+            try:
+                con.execute(NOTE_QUERY, (1, 1, f"bench note {worker_id}-{i}"))
+                con.execute(COURSE_QUERY, (1000 + worker_id, 1, "ITSC", 1212 + i % 50))
+                con.commit()
+                done += 1
+            except sqlite3.OperationalError:
+                con.rollback()
+                locked += 1
+            i += 1
+        con.close()
+        with lock:
+            counts["writes"] += done
+            counts["locked"] += locked
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    shutil.rmtree(tmpdir, ignore_errors=True)
+    return {
+        "reads_per_sec": counts["reads"] / elapsed,
+        "writes_per_sec": counts["writes"] / elapsed,
+        "locked": counts["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=DB_NAME, help="database file to copy for the run")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "tuned"],
+                        choices=sorted(STORAGE_PROFILES))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"{args.db} not found; run database_creation.py first")
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile")
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'locked':>10}")
+    for profile in args.profiles:
+        result = run_profile(args.db, profile, args.readers, args.writers, args.seconds)
+        print(f"{profile:<10}{result['reads_per_sec']:>12.0f}{result['writes_per_sec']:>12.0f}{result['locked']:>10}")
+
+
+if __name__ == "__main__":
+    main()
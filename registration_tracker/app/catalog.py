@@ -0,0 +1,18 @@
+import controllers.majors as c_majors
+import controllers.concentration as c_concentration
+import controllers.courses as c_courses
+from catalog_cache import cached
+
+# Cached versions of the catalog lookups pages make on every rerun.
+# They return the same rows as the controllers (lists come back as tuples).
+
+get_major = cached(c_majors.get_major)
+get_major_id = cached(c_majors.get_major_id)
+get_all_majors = cached(c_majors.get_all_majors)
+
+get_concentration = cached(c_concentration.get_concentration)
+get_concentration_id = cached(c_concentration.get_concentration_id)
+get_concentrations_by_major = cached(c_concentration.get_concentrations_by_major)
+
+get_course = cached(c_courses.get_course)
+get_all_courses = cached(c_courses.get_all_courses)
@@ -0,0 +1,65 @@
+import functools
+import threading
+
+# Process-wide cache for catalog data (majors, concentrations, courses and
+# requirement sections). Every entry is tagged with the catalog version it was
+# loaded at; admin writes call bump(), which makes every entry stale at once.
+
+_version = 0
+_entries = {}
+_hits = 0
+_misses = 0
+_lock = threading.Lock()
+
+
+def version():
+    return _version
+
+
+def bump():
+    """Start a new catalog version. Called by controllers after catalog writes."""
+    global _version
+    with _lock:
+        _version += 1
+        _entries.clear()
+
+
+def stats():
+    """Counters for monitoring: {"version", "hits", "misses", "entries"}."""
+    with _lock:
+        return {"version": _version, "hits": _hits, "misses": _misses, "entries": len(_entries)}
+
+
+def reset_stats():
+    global _hits, _misses
+    with _lock:
+        _hits = _misses = 0
+
+
+def cached(func):
+    """
+    Cache a read-only catalog lookup by its arguments for the current catalog
+    version. Lists are returned as tuples so callers can't change shared entries.
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        global _hits, _misses
+        key = (func.__module__, func.__qualname__, args)
+        with _lock:
+            loaded_at = _version
+            entry = _entries.get(key)
+            if entry is not None and entry[0] == loaded_at:
+                _hits += 1
+                return entry[1]
+            _misses += 1
+
+        value = func(*args)
+        if isinstance(value, list):
+            value = tuple(value)
+        with _lock:
+            # a bump() while loading means the value may already be stale
+            if _version == loaded_at:
+                _entries[key] = (loaded_at, value)
+        return value
+
+    return wrapper
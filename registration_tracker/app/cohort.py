@@ -0,0 +1,235 @@
+import csv
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import catalog
+import prereq_analysis
+import prereq_graph
+import read_cache
+import requirements
+import scheduler
+from db_utils import get_db_connection
+
+# Starter plans for a whole cohort of incoming students, built by the
+# scheduler on worker processes.
+#
+# The parent process loads everything read-only once (prerequisite rows, the
+# catalog's credits, the requirement sections of every program in the cohort)
+# and hands it to each worker when it starts; workers only compute schedules
+# and never open the database. The parent writes each chunk of plans in one
+# transaction as it comes back, so an interrupted run loses at most the
+# chunks in flight, and a rerun skips every student who already has a plan
+# with the batch's name.
+
+# Worker processes for a run; 0 schedules in the calling process
+COHORT_WORKERS = int(os.environ.get("REG_TRACKER_COHORT_WORKERS", os.cpu_count() or 2))
+# Students handed to a worker at a time, and plans written per transaction
+CHUNK_SIZE = 500
+DEFAULT_PLAN_NAME = "Starter Plan"
+# Never fork: callers other than generate_plans.py may run threads (see revalidation.py)
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+# Same length as plans.create_plan
+NUM_SEMESTERS = 8
+
+# One line of the cohort file
+Student = namedtuple("Student", ["student_id", "major_id", "concentration_id", "start_term"])
+
+
+def term_sequence(start_term, count=NUM_SEMESTERS):
+    """[(term, year)] of `count` Fall/Spring semesters from "Fall 2025"-style `start_term`."""
+    parts = start_term.split()
+    if len(parts) != 2 or parts[0] not in ("Fall", "Spring") or not parts[1].isdigit():
+        raise ValueError(f"invalid start term: {start_term!r}")
+    term, year = parts[0], int(parts[1])
+    terms = []
+    for _ in range(count):
+        terms.append((term, year))
+        if term == "Fall":
+            term, year = "Spring", year + 1
+        else:
+            term = "Fall"
+    return terms
+
+
+def _lookup(value, get_id, what):
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    found = get_id(value)
+    if found is None:
+        raise ValueError(f"unknown {what}: {value!r}")
+    return found
+
+
+def read_students(path):
+    """
+    Read a CSV with the columns student_id, major, concentration, start_term.
+    Majors and concentrations may be given by id or by name; concentration may
+    be empty. Raises ValueError naming the first bad line.
+    """
+    students = []
+    with open(path, newline="") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                term_sequence(row["start_term"])
+                major_id = _lookup(row["major"], catalog.get_major_id, "major")
+                if major_id is None:
+                    raise ValueError("missing major")
+                students.append(Student(int(row["student_id"]), major_id,
+                                        _lookup(row.get("concentration"), catalog.get_concentration_id, "concentration"),
+                                        row["start_term"].strip()))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}, line {line}: {e}") from None
+    return students
+
+
+def already_generated(name):
+    """Ids of the students who already have a (non-suggestion) plan called `name`."""
+    con = get_db_connection()
+    try:
+        rows = con.execute(""" SELECT DISTINCT student_id FROM Plans
+                               WHERE name = ? AND is_suggestion = 0 """, (name,)).fetchall()
+    finally:
+        con.close()
+    return {row[0] for row in rows}
+
+
+def _student_advisors():
+    con = get_db_connection()
+    try:
+        rows = con.execute(""" SELECT id, advisor_id FROM Students """).fetchall()
+    finally:
+        con.close()
+    return {row[0]: row[1] for row in rows}
+
+
+def _semester_ids(terms):
+    """{(term, year): id} for `terms`, creating the semesters that don't exist yet."""
+    con = get_db_connection()
+    try:
+        con.executemany(""" INSERT OR IGNORE INTO Semesters (term, year) VALUES (?, ?) """, sorted(terms))
+        con.commit()
+        rows = con.execute(""" SELECT id, term, year FROM Semesters """).fetchall()
+    finally:
+        con.close()
+    return {(row[1], row[2]): row[0] for row in rows}
+
+
+_context = None
+
+
+def _init_worker(rows, catalog_courses, credits, sections, credit_cap):
+    global _context
+    graph = prereq_graph.PrerequisiteGraph(rows)
+    _context = (graph, prereq_analysis.PrerequisiteAnalysis(graph, catalog_courses), credits, sections, credit_cap)
+
+
+def _schedule_chunk(chunk):
+    """[(student, semester ids)] -> [(student, semester ids, Schedule)], run in a worker process."""
+    graph, analysis, credits, sections, credit_cap = _context
+    return [(student, semester_ids,
+             scheduler.build_schedule(sections[student.major_id, student.concentration_id],
+                                      [(semester_id, set()) for semester_id in semester_ids],
+                                      graph, analysis, credits, credit_cap))
+            for student, semester_ids in chunk]
+
+
+def write_plans(results, name, advisors):
+    """Insert a plan with its semesters and courses for every result, in one transaction."""
+    con = get_db_connection()
+    try:
+        semester_rows = []
+        course_rows = []
+        for student, semester_ids, schedule in results:
+            cur = con.execute(""" INSERT INTO Plans (name, num_semesters, student_id, advisor_id, concentration_id, major_id)
+                                  VALUES (?, ?, ?, ?, ?, ?) """,
+                              (name, len(semester_ids), student.student_id, advisors.get(student.student_id),
+                               student.concentration_id, student.major_id))
+            plan_id = cur.lastrowid
+            semester_rows.extend((semester_id, plan_id) for semester_id in semester_ids)
+            course_rows.extend((plan_id, semester_id, subject, number)
+                               for semester_id, (subject, number) in schedule.placements)
+        con.executemany(""" INSERT INTO Plan_Semesters (semester_id, plan_id) VALUES (?, ?) """, semester_rows)
+        con.executemany(""" INSERT INTO Plan_Semester_Courses (plan_id, semester_id, course_subject, course_number)
+                            VALUES (?, ?, ?, ?) """, course_rows)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.close()
+
+
+def generate_cohort(students, name=DEFAULT_PLAN_NAME, workers=None, chunk_size=CHUNK_SIZE,
+                    credit_cap=scheduler.MAX_CREDITS, progress=None):
+    """
+    Create a plan called `name` for every Student that doesn't have one yet.
+
+    progress, if given, is called as progress(done, total, plans_per_second)
+    after every chunk is written. Returns {"plans", "skipped", "unknown",
+    "incomplete", "seconds", "plans_per_second"}: skipped students already had
+    the plan, unknown ones are not in the Students table, and incomplete plans
+    have requirement sections the scheduler could not fill.
+    """
+    started = time.perf_counter()
+    workers = COHORT_WORKERS if workers is None else workers
+
+    done = already_generated(name)
+    advisors = _student_advisors()
+    todo = {}
+    skipped = unknown = 0
+    for student in students:
+        if student.student_id in done or student.student_id in todo:
+            skipped += 1
+        elif student.student_id not in advisors:
+            unknown += 1
+        else:
+            todo[student.student_id] = student
+    todo = list(todo.values())
+
+    terms = {student.start_term: term_sequence(student.start_term) for student in todo}
+    semester_ids = _semester_ids({term for sequence in terms.values() for term in sequence})
+    programs = {(student.major_id, student.concentration_id) for student in todo}
+    sections = {program: requirements.get_sections(*program) for program in programs}
+    initargs = (prereq_graph.load_rows(), [(course['subject'], course['number']) for course in catalog.get_all_courses()],
+                requirements.get_course_credits(), sections, credit_cap)
+
+    work = [(student, [semester_ids[term] for term in terms[student.start_term]]) for student in todo]
+    chunks = [work[start:start + chunk_size] for start in range(0, len(work), chunk_size)]
+    written = incomplete = 0
+
+    def collect(results):
+        nonlocal written, incomplete
+        write_plans(results, name, advisors)
+        written += len(results)
+        incomplete += sum(1 for _, _, schedule in results if schedule.unmet or schedule.unscheduled)
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress(written, len(work), written / elapsed if elapsed else 0.0)
+
+    if workers and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context(START_METHOD),
+                                 initializer=_init_worker, initargs=initargs) as pool:
+            for future in as_completed([pool.submit(_schedule_chunk, chunk) for chunk in chunks]):
+                collect(future.result())
+    else:
+        _init_worker(*initargs)
+        for chunk in chunks:
+            collect(_schedule_chunk(chunk))
+
+    if written:
+        read_cache.invalidate("plan")
+    seconds = time.perf_counter() - started
+    return {
+        "plans": written,
+        "skipped": skipped,
+        "unknown": unknown,
+        "incomplete": incomplete,
+        "seconds": seconds,
+        "plans_per_second": written / seconds if seconds else 0.0,
+    }
@@ -0,0 +1,28 @@
+"""
+Purge plan rows orphaned by deletes made before they cascaded.
+
+Removes suggestions whose original plan no longer exists, then semesters,
+courses and notes that point at a missing plan. Run it from the app directory:
+
+    python compact_db.py --dry-run
+"""
+import argparse
+from controllers.plans import purge_orphans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report what would be removed without deleting")
+    args = parser.parse_args()
+
+    counts = purge_orphans(dry_run=args.dry_run)
+    if counts is None:
+        raise SystemExit(1)
+
+    verb = "would remove" if args.dry_run else "removed"
+    for table, count in counts.items():
+        print(f"{table:<24} {verb} {count}")
+
+
+if __name__ == "__main__":
+    main()
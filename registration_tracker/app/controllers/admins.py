@@ -1,12 +1,4 @@
-import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+from db_utils import get_db_connection
 
 # get one admin
 def get_admin(id):
@@ -14,8 +6,10 @@ def get_admin(id):
                 WHERE id = ?
                 LIMIT 1 """
     con = get_db_connection()
-    admin = con.execute(query, (id,)).fetchone()
-    con.close()
+    try:
+        admin = con.execute(query, (id,)).fetchone()
+    finally:
+        con.close()
     return admin
 
 def get_admin_user(user):
@@ -23,8 +17,10 @@ def get_admin_user(user):
                 WHERE username = ?
                 LIMIT 1 """
     con = get_db_connection()
-    admin = con.execute(query, (user,)).fetchone()
-    con.close()
+    try:
+        admin = con.execute(query, (user,)).fetchone()
+    finally:
+        con.close()
     return admin
 
 # get all admins
@@ -32,8 +28,10 @@ def get_all_admins():
     query = """ SELECT * FROM Admins
                 """
     con = get_db_connection()
-    admins = con.execute(query).fetchall()
-    con.close()
+    try:
+        admins = con.execute(query).fetchall()
+    finally:
+        con.close()
     return admins
 
 # # add an admin (admin)
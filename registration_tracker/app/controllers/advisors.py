@@ -1,12 +1,8 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import auth_service
+import passwords
+import read_cache
+from db_utils import get_db_connection
 
 # get one advisor
 def get_advisor(id):
@@ -14,8 +10,10 @@ def get_advisor(id):
                 WHERE id = ?
                 LIMIT 1 """
     con = get_db_connection()
-    advisor = con.execute(query, (id,)).fetchone()
-    con.close()
+    try:
+        advisor = con.execute(query, (id,)).fetchone()
+    finally:
+        con.close()
     return advisor
 
 def get_advisor_user(user):
@@ -23,8 +21,10 @@ def get_advisor_user(user):
                 WHERE username = ?
                 LIMIT 1 """
     con = get_db_connection()
-    advisor = con.execute(query, (user,)).fetchone()
-    con.close()
+    try:
+        advisor = con.execute(query, (user,)).fetchone()
+    finally:
+        con.close()
     return advisor
 
 # get all advisors
@@ -32,8 +32,10 @@ def get_all_advisors():
     query = """ SELECT * FROM Advisors
                 """
     con = get_db_connection()
-    advisors = con.execute(query).fetchall()
-    con.close()
+    try:
+        advisors = con.execute(query).fetchall()
+    finally:
+        con.close()
     return advisors
 
 # add an advisor (admin)
@@ -45,8 +47,10 @@ def add_advisor(id, username, password, f_name, l_name):
                 VALUES (?, ?, ?, ?, ?) """
     con = get_db_connection()
     try:
-        con.execute(query, (id, username, password, f_name, l_name))
+        con.execute(query, (id, username, passwords.hash_password(password), f_name, l_name))
         con.commit()
+        auth_service.forget_identities()
+        read_cache.invalidate("advisor", id)
         return {"success": True, "message": "Advisor added successfully."}
     except sqlite3.IntegrityError as e:
         return {"success": False, "message": f"Error adding advisor: {e}"}
@@ -63,7 +67,7 @@ def update_advisor(id, username=None, password=None, f_name=None, l_name=None):
         values.append(username)
     if password:
         fields.append("password = ?")
-        values.append(password)
+        values.append(passwords.hash_password(password))
     if f_name:
         fields.append("f_name = ?")
         values.append(f_name)
@@ -83,6 +87,8 @@ def update_advisor(id, username=None, password=None, f_name=None, l_name=None):
     try:
         con.execute(query, values)
         con.commit()
+        auth_service.forget_identities()
+        read_cache.invalidate("advisor", id)
         return {"success": True, "message": "Advisor updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating advisor: {e}"}
@@ -97,6 +103,8 @@ def delete_advisor(id):
     try:
         con.execute(query, (id,))
         con.commit()
+        auth_service.forget_identities()
+        read_cache.invalidate("advisor", id)
         return {"success": True, "message": "Advisor deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting advisor: {e}"}
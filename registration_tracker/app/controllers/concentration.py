@@ -1,12 +1,6 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import catalog_cache
+from db_utils import get_db_connection
 
 # Get a specific concentration
 def get_concentration(id):
@@ -14,8 +8,10 @@ def get_concentration(id):
                 WHERE id = ?
                 """
     con = get_db_connection()
-    concentration = con.execute(query, (id,)).fetchone()
-    con.close()
+    try:
+        concentration = con.execute(query, (id,)).fetchone()
+    finally:
+        con.close()
     return concentration
 
 # Get a concentration ID by name
@@ -26,8 +22,10 @@ def get_concentration_id(name):
     query = """ SELECT id FROM Concentrations
                 WHERE name = ? """
     con = get_db_connection()
-    concentration = con.execute(query, (name,)).fetchone()
-    con.close()
+    try:
+        concentration = con.execute(query, (name,)).fetchone()
+    finally:
+        con.close()
     return concentration['id'] if concentration else None
 
 # Get concentrations by major_id
@@ -38,8 +36,10 @@ def get_concentrations_by_major(major_id):
     query = """ SELECT * FROM Concentrations
                 WHERE major_id = ? """
     con = get_db_connection()
-    concentrations = con.execute(query, (major_id,)).fetchall()
-    con.close()
+    try:
+        concentrations = con.execute(query, (major_id,)).fetchall()
+    finally:
+        con.close()
     return concentrations
 
 # Add a concentration (admin)
@@ -53,6 +53,7 @@ def add_concentration(name, major_id):
     try:
         con.execute(query, (name, major_id))
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Concentration added successfully."}
     except sqlite3.IntegrityError as e:
         return {"success": False, "message": f"Error adding concentration: {e}"}
@@ -86,6 +87,7 @@ def update_concentration(concentration_id, name=None, major_id=None):
     try:
         con.execute(query, values)
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Concentration updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating concentration: {e}"}
@@ -103,6 +105,7 @@ def delete_concentration(concentration_id):
     try:
         con.execute(query, (concentration_id,))
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Concentration deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting concentration: {e}"}
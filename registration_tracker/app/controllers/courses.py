@@ -1,12 +1,8 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import catalog_cache
+import read_cache
+from db_utils import get_db_connection, apply_violations_table, cascade_delete
+import prereq_graph
 
 # get one course
 def get_course(subject, number):
@@ -14,8 +10,10 @@ def get_course(subject, number):
                 WHERE subject = ? AND number = ?
                 LIMIT 1 """
     con = get_db_connection()
-    course = con.execute(query, (subject, number)).fetchone()
-    con.close()
+    try:
+        course = con.execute(query, (subject, number)).fetchone()
+    finally:
+        con.close()
     return course
 
 # get several courses from prereq
@@ -23,15 +21,19 @@ def get_course_prereq(course_subject, course_number):
     query = """ SELECT group_id, course_subject, course_number FROM Prerequisites
                 WHERE parent_subject = ? AND parent_number = ? """
     con = get_db_connection()
-    prereqs = con.execute(query, (course_subject, course_number)).fetchall()
-    con.close()
+    try:
+        prereqs = con.execute(query, (course_subject, course_number)).fetchall()
+    finally:
+        con.close()
     return prereqs
 
 def get_all_courses():
     query = """ SELECT * FROM Courses """
     con = get_db_connection()
-    courses = con.execute(query).fetchall()
-    con.close()
+    try:
+        courses = con.execute(query).fetchall()
+    finally:
+        con.close()
     return courses
 
 # get several courses from semester
@@ -42,8 +44,10 @@ def get_semester_courses(semester_id, plan_id):
                 WHERE pcs.semester_id = ? AND pcs.plan_id = ?
                 ORDER BY c.subject, c.number """
     con = get_db_connection()
-    courses = con.execute(query, (semester_id, plan_id)).fetchall()
-    con.close()
+    try:
+        courses = con.execute(query, (semester_id, plan_id)).fetchall()
+    finally:
+        con.close()
     return courses
 
 # add a course (admin)
@@ -54,6 +58,7 @@ def add_course(subject, number, name, credits):
     try:
         con.execute(query, (subject, number, name, credits))
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Course added successfully."}
     except sqlite3.IntegrityError as e:
         return {"success": False, "message": f"Error adding course: {e}"}
@@ -84,6 +89,7 @@ def update_course(subject, number, name=None, credits=None):
     try:
         con.execute(query, values)
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Course updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating course: {e}"}
@@ -98,8 +104,46 @@ def delete_course(subject, number):
     try:
         con.execute(query, (subject, number))
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Course deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting course: {e}"}
     finally:
-        con.close()
\ No newline at end of file
+        con.close()
+
+# delete many courses at once (admin)
+def delete_courses(courses):
+    """
+    Deletes (subject, number) courses along with their prerequisites, degree
+    requirements and plan entries in one transaction with foreign keys enforced.
+    Returns the usual result dictionary plus "counts": {table: rows removed}.
+    """
+    if not courses:
+        return {"success": True, "message": "No courses to delete.", "counts": {}}
+    keys = f"(VALUES {', '.join('(?, ?)' for _ in courses)})"
+    params = [value for course in courses for value in course]
+    statements = [
+        ("Prerequisites", f""" DELETE FROM Prerequisites
+                               WHERE (parent_subject, parent_number) IN {keys}
+                               OR (course_subject, course_number) IN {keys} """, params * 2)
+    ]
+    for table in ("Major_Section_Requirements", "Concentration_Section_Requirements",
+                  "Gen_Ed_Section_Requirements", "Minor_Section_Requirements", "Plan_Violations",
+                  "Plan_Semester_Courses"):
+        statements.append((table, f""" DELETE FROM {table}
+                                       WHERE (course_subject, course_number) IN {keys} """, params))
+    statements.append(("Courses", f""" DELETE FROM Courses
+                                       WHERE (subject, number) IN {keys} """, params))
+    con = get_db_connection()
+    try:
+        apply_violations_table(con, commit=False)
+        counts = cascade_delete(con, statements)
+        catalog_cache.bump()
+        prereq_graph.invalidate()
+        # plan entries were removed too
+        read_cache.invalidate("plan")
+        return {"success": True, "message": f"Deleted {counts['Courses']} courses.", "counts": counts}
+    except sqlite3.Error as e:
+        return {"success": False, "message": f"Error deleting courses: {e}"}
+    finally:
+        con.close()
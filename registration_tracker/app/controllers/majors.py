@@ -1,12 +1,6 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import catalog_cache
+from db_utils import get_db_connection
 
 # get a specific major
 def get_major(id):
@@ -14,8 +8,10 @@ def get_major(id):
                 WHERE id = ?
                 """
     con = get_db_connection()
-    majors = con.execute(query, (id,)).fetchone()
-    con.close()
+    try:
+        majors = con.execute(query, (id,)).fetchone()
+    finally:
+        con.close()
     return majors
 
 # Get a major ID by name
@@ -26,8 +22,10 @@ def get_major_id(name):
     query = """ SELECT id FROM Majors
                 WHERE name = ? """
     con = get_db_connection()
-    major = con.execute(query, (name,)).fetchone()
-    con.close()
+    try:
+        major = con.execute(query, (name,)).fetchone()
+    finally:
+        con.close()
     return major['id'] if major else None
 
 # Get all majors
@@ -37,8 +35,10 @@ def get_all_majors():
     """
     query = """ SELECT * FROM Majors """
     con = get_db_connection()
-    majors = con.execute(query).fetchall()
-    con.close()
+    try:
+        majors = con.execute(query).fetchall()
+    finally:
+        con.close()
     return majors
 
 # Add a major (admin)
@@ -52,6 +52,7 @@ def add_major(name, department):
     try:
         con.execute(query, (name, department))
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Major added successfully."}
     except sqlite3.IntegrityError as e:
         return {"success": False, "message": f"Error adding major: {e}"}
@@ -85,6 +86,7 @@ def update_major(major_id, name=None, department=None):
     try:
         con.execute(query, values)
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Major updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating major: {e}"}
@@ -102,6 +104,7 @@ def delete_major(major_id):
     try:
         con.execute(query, (major_id,))
         con.commit()
+        catalog_cache.bump()
         return {"success": True, "message": "Major deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting major: {e}"}
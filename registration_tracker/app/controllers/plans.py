@@ -1,13 +1,16 @@
 import sqlite3
-import controllers.semesters as semesters
+from collections import namedtuple
+import read_cache
+from db_utils import get_db_connection, apply_violations_table, cascade_delete
 
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+# Read-only snapshot of a plan, built by load_plan_snapshot()
+PlanSnapshot = namedtuple("PlanSnapshot", [
+    "id", "name", "student_id", "advisor_id", "advisor_name",
+    "major_id", "major_name", "concentration_id", "concentration_name",
+    "is_suggestion", "original_plan_id", "semesters", "total_credits"
+])
+SemesterSnapshot = namedtuple("SemesterSnapshot", ["id", "term", "year", "courses", "credits"])
+CourseSnapshot = namedtuple("CourseSnapshot", ["subject", "number", "name", "credits"])
 
 def create_plan(student_id, advisor_id, name, major_id, concentration_id, start_term, is_suggestion=0, original_plan_id=None):
     # Parse the start_term string (expected format: "Fall 2025" or "Spring 2026")
@@ -71,6 +74,7 @@ def create_plan(student_id, advisor_id, name, major_id, concentration_id, start_
                 current_term = "Fall"
                 
         con.commit()
+        read_cache.invalidate("plan", plan_id)
         return plan_id
     except Exception as e:
         con.rollback()
@@ -79,6 +83,72 @@ def create_plan(student_id, advisor_id, name, major_id, concentration_id, start_
     finally:
         con.close()
 
+# copy a plan, its semesters and its courses
+def clone_plan(plan_id, as_suggestion_by=None, name=None):
+    """
+    Copies a plan with set-based INSERT ... SELECT statements in one transaction.
+    With as_suggestion_by=advisor_id the copy is an advisor suggestion pointing
+    back at the original. Returns the new plan id, or False on failure.
+    """
+    is_suggestion = 1 if as_suggestion_by else 0
+    plan_query = """
+        INSERT INTO Plans (name, num_semesters, student_id, advisor_id, concentration_id, major_id, is_suggestion, original_plan_id)
+        SELECT COALESCE(?, name), num_semesters, student_id, COALESCE(?, advisor_id), concentration_id, major_id, ?,
+               CASE WHEN ? THEN id ELSE NULL END
+        FROM Plans
+        WHERE id = ?
+    """
+    semesters_query = """
+        INSERT INTO Plan_Semesters (semester_id, plan_id)
+        SELECT semester_id, ? FROM Plan_Semesters
+        WHERE plan_id = ?
+    """
+    courses_query = """
+        INSERT INTO Plan_Semester_Courses (plan_id, semester_id, course_subject, course_number)
+        SELECT ?, semester_id, course_subject, course_number FROM Plan_Semester_Courses
+        WHERE plan_id = ?
+    """
+    con = get_db_connection()
+    try:
+        cur = con.execute(plan_query, (name, as_suggestion_by, is_suggestion, is_suggestion, plan_id))
+        if cur.rowcount == 0:
+            con.rollback()
+            return False  # Original plan not found
+        new_plan_id = cur.lastrowid
+
+        con.execute(semesters_query, (new_plan_id, plan_id))
+        con.execute(courses_query, (new_plan_id, plan_id))
+        con.commit()
+        read_cache.invalidate("plan", new_plan_id)
+        return new_plan_id
+    except sqlite3.Error as e:
+        con.rollback()
+        print(f"Error cloning plan: {e}")
+        return False
+    finally:
+        con.close()
+
+# add many courses to a plan's semesters at once (see scheduler.py)
+def add_plan_courses(plan_id, placements):
+    """
+    Inserts every (semester_id, (subject, number)) in `placements` in one
+    transaction; courses already in a semester are skipped.
+    """
+    query = """ INSERT OR IGNORE INTO Plan_Semester_Courses (plan_id, semester_id, course_subject, course_number)
+                VALUES (?, ?, ?, ?) """
+    con = get_db_connection()
+    try:
+        con.executemany(query, [(plan_id, semester_id, subject, number)
+                                for semester_id, (subject, number) in placements])
+        con.commit()
+        read_cache.invalidate("plan", plan_id)
+        return {"success": True, "message": f"Added {len(placements)} courses to the plan."}
+    except sqlite3.Error as e:
+        con.rollback()
+        return {"success": False, "message": f"Error adding courses to plan: {e}"}
+    finally:
+        con.close()
+
 # get one plan from id
 def get_plan(name, user, user_id):
     if user == "student":
@@ -90,8 +160,10 @@ def get_plan(name, user, user_id):
                     WHERE name = ? AND advisor_id = ?
                     LIMIT 1 """
     con = get_db_connection()
-    plan = con.execute(query, (name, user_id)).fetchone()
-    con.close()
+    try:
+        plan = con.execute(query, (name, user_id)).fetchone()
+    finally:
+        con.close()
     return plan
 
 # get one plan from plan id
@@ -101,8 +173,10 @@ def get_plan_from_id(plan_id):
                 LIMIT 1
                 """
     con = get_db_connection()
-    plan = con.execute(query, (plan_id,)).fetchone()
-    con.close()
+    try:
+        plan = con.execute(query, (plan_id,)).fetchone()
+    finally:
+        con.close()
     return plan
 
 # get first plan attatched to student
@@ -111,16 +185,191 @@ def get_first_plan(student_id):
                 WHERE student_id = ?
                 LIMIT 1 """
     con = get_db_connection()
-    plan = con.execute(query, (student_id,)).fetchone()
-    con.close()
+    try:
+        plan = con.execute(query, (student_id,)).fetchone()
+    finally:
+        con.close()
     return plan
 
+# load a whole plan for display
+def load_plan_snapshot(plan_id):
+    """
+    Loads a plan with its major, concentration, advisor, ordered semesters and
+    every course in two queries. Returns an immutable PlanSnapshot (nested
+    namedtuples/tuples) with per-semester and total credits, or None.
+    """
+    plan_query = """ SELECT p.id, p.name, p.student_id, p.advisor_id,
+                            a.f_name || ' ' || a.l_name AS advisor_name,
+                            p.major_id, m.name AS major_name,
+                            p.concentration_id, c.name AS concentration_name,
+                            p.is_suggestion, p.original_plan_id
+                     FROM Plans p
+                     LEFT JOIN Majors m ON p.major_id = m.id
+                     LEFT JOIN Concentrations c ON p.concentration_id = c.id
+                     LEFT JOIN Advisors a ON p.advisor_id = a.id
+                     WHERE p.id = ? """
+    courses_query = """ SELECT s.id, s.term, s.year, co.subject, co.number, co.name, co.credits
+                        FROM Plan_Semesters ps
+                        JOIN Semesters s ON ps.semester_id = s.id
+                        LEFT JOIN Plan_Semester_Courses psc
+                        ON psc.plan_id = ps.plan_id AND psc.semester_id = ps.semester_id
+                        LEFT JOIN Courses co
+                        ON co.subject = psc.course_subject AND co.number = psc.course_number
+                        WHERE ps.plan_id = ?
+                        ORDER BY s.year,
+                            CASE
+                                WHEN s.term = 'Spring' THEN 1
+                                WHEN s.term = 'Summer' THEN 2
+                                WHEN s.term = 'Fall' THEN 3
+                            END,
+                            co.subject, co.number """
+    con = get_db_connection()
+    try:
+        plan = con.execute(plan_query, (plan_id,)).fetchone()
+        if not plan:
+            return None
+        rows = con.execute(courses_query, (plan_id,)).fetchall()
+    finally:
+        con.close()
+
+    semester_rows = []
+    for row in rows:
+        if not semester_rows or semester_rows[-1][0] != row[0]:
+            semester_rows.append((row[0], row[1], row[2], []))
+        if row[3] is not None:
+            semester_rows[-1][3].append(CourseSnapshot(row[3], row[4], row[5], row[6]))
+
+    semester_list = tuple(
+        SemesterSnapshot(id, term, year, tuple(courses), sum(c.credits for c in courses))
+        for id, term, year, courses in semester_rows
+    )
+    return PlanSnapshot(
+        *tuple(plan),
+        semesters=semester_list,
+        total_credits=sum(s.credits for s in semester_list)
+    )
+
+# get the courses scheduled in each semester of a plan, in order
+def get_plan_history(plan_id):
+    """
+    Returns a list of (semester_id, set of (subject, number)) for every semester
+    in the plan, ordered chronologically. One query for the whole plan.
+    """
+    query = """ SELECT ps.semester_id, psc.course_subject, psc.course_number
+                FROM Plan_Semesters ps
+                JOIN Semesters s ON ps.semester_id = s.id
+                LEFT JOIN Plan_Semester_Courses psc
+                ON psc.plan_id = ps.plan_id AND psc.semester_id = ps.semester_id
+                WHERE ps.plan_id = ?
+                ORDER BY s.year,
+                    CASE
+                        WHEN s.term = 'Spring' THEN 1
+                        WHEN s.term = 'Summer' THEN 2
+                        WHEN s.term = 'Fall' THEN 3
+                    END """
+    con = get_db_connection()
+    try:
+        rows = con.execute(query, (plan_id,)).fetchall()
+    finally:
+        con.close()
+    return _history_from_rows(rows)
+
+def _history_from_rows(rows):
+    # rows of (semester_id, subject, number) in semester order
+    history = []
+    for row in rows:
+        if not history or history[-1][0] != row[0]:
+            history.append((row[0], set()))
+        if row[1] is not None:
+            history[-1][1].add((row[1], row[2]))
+    return history
+
+# get the histories of many plans at once
+def get_plan_histories(plan_ids=None):
+    """
+    Returns {plan_id: get_plan_history(plan_id)} for the given plans, or for
+    every plan with at least one semester. One query for all of them.
+    """
+    where = ""
+    params = ()
+    if plan_ids is not None:
+        params = tuple(plan_ids)
+        if not params:
+            return {}
+        where = f"WHERE ps.plan_id IN ({', '.join('?' * len(params))})"
+    query = f""" SELECT ps.plan_id, ps.semester_id, psc.course_subject, psc.course_number
+                 FROM Plan_Semesters ps
+                 JOIN Semesters s ON ps.semester_id = s.id
+                 LEFT JOIN Plan_Semester_Courses psc
+                 ON psc.plan_id = ps.plan_id AND psc.semester_id = ps.semester_id
+                 {where}
+                 ORDER BY ps.plan_id, s.year,
+                    CASE
+                        WHEN s.term = 'Spring' THEN 1
+                        WHEN s.term = 'Summer' THEN 2
+                        WHEN s.term = 'Fall' THEN 3
+                    END """
+    con = get_db_connection()
+    try:
+        rows = con.execute(query, params).fetchall()
+    finally:
+        con.close()
+
+    by_plan = {}
+    for row in rows:
+        by_plan.setdefault(row[0], []).append(row[1:])
+    return {plan_id: _history_from_rows(plan_rows) for plan_id, plan_rows in by_plan.items()}
+
+# get the courses a plan schedules before a semester
+def get_prior_courses(plan_id, semester_id):
+    """
+    Returns the set of (subject, number) courses scheduled in the plan's semesters
+    before `semester_id`, or None if the semester is not part of the plan.
+    """
+    prior = set()
+    for history_semester_id, courses in get_plan_history(plan_id):
+        if history_semester_id == semester_id:
+            return prior
+        prior |= courses
+    return None
+
+# get the stored prerequisite violations of an advisor's plans (see revalidation.py)
+def get_advisor_violations(advisor_id):
+    """
+    Rows of Plan_Violations for plans advised by `advisor_id`, with the plan
+    name, student and semester, ordered by student, plan and semester.
+    """
+    query = """ SELECT pv.plan_id, p.name AS plan_name, p.student_id, pv.semester_id, s.term, s.year,
+                       pv.course_subject, pv.course_number, pv.missing, pv.checked_at
+                FROM Plans p
+                JOIN Plan_Violations pv ON pv.plan_id = p.id
+                JOIN Semesters s ON s.id = pv.semester_id
+                WHERE p.advisor_id = ?
+                ORDER BY p.student_id, pv.plan_id, s.year,
+                    CASE
+                        WHEN s.term = 'Spring' THEN 1
+                        WHEN s.term = 'Summer' THEN 2
+                        WHEN s.term = 'Fall' THEN 3
+                    END """
+    con = get_db_connection()
+    try:
+        return con.execute(query, (advisor_id,)).fetchall()
+    except sqlite3.Error as e:
+        # Plan_Violations is created by database_creation.py or the first revalidation
+        if "no such table" not in str(e):
+            print(f"Error getting plan violations: {e}")
+        return []
+    finally:
+        con.close()
+
 # get all entries in Plans table
 def get_all_plans():
     query = """ SELECT * FROM Plans """
     con = get_db_connection()
-    plans = con.execute(query).fetchall()
-    con.close()
+    try:
+        plans = con.execute(query).fetchall()
+    finally:
+        con.close()
     return plans
 
 # get several plans from a student
@@ -134,8 +383,10 @@ def get_plans(user, user_id):
                     WHERE advisor_id = ?
                 """
     con = get_db_connection()
-    plans = con.execute(query, (user_id,)).fetchall()
-    con.close()
+    try:
+        plans = con.execute(query, (user_id,)).fetchall()
+    finally:
+        con.close()
     return plans
 
 # update a plan (admin)
@@ -173,22 +424,170 @@ def update_plan(plan_id, name=None, num_semesters=None, student_id=None, advisor
     try:
         con.execute(query, values)
         con.commit()
+        read_cache.invalidate("plan", plan_id)
         return {"success": True, "message": "Plan updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating plan: {e}"}
     finally:
         con.close()
 
-# delete a plan (admin)
+# ordered statements deleting the plans matched by plan_filter and the rows that belong to them
+def plan_cascade(plan_filter, params):
+    plan_ids = f"SELECT id FROM Plans WHERE {plan_filter}"
+    statements = [
+        (table, f""" DELETE FROM {table}
+                     WHERE plan_id IN ({plan_ids}) """, params)
+        for table in ("Plan_Violations", "Notes", "Plan_Semester_Courses", "Plan_Semesters")
+    ]
+    statements.append(("Plans", f""" DELETE FROM Plans
+                                     WHERE {plan_filter} """, params))
+    return statements
+
+# delete plans and the rows that belong to them on an open connection (caller commits)
+def _delete_plan_rows(con, plan_ids):
+    placeholders = ", ".join("?" for _ in plan_ids)
+    counts = {}
+    apply_violations_table(con, commit=False)
+    for table, query, params in plan_cascade(f"id IN ({placeholders})", plan_ids):
+        counts[table] = con.execute(query, params).rowcount
+    return counts
+
+# delete a plan (admin), its semesters, courses and notes, and any suggestions made from it
 def delete_plan(plan_id):
-    query = """ DELETE FROM Plans
-                WHERE id = ? """
+    query = """ SELECT id FROM Plans
+                WHERE original_plan_id = ? """
     con = get_db_connection()
     try:
-        con.execute(query, (plan_id,))
+        suggestion_ids = [row[0] for row in con.execute(query, (plan_id,)).fetchall()]
+        _delete_plan_rows(con, [plan_id] + suggestion_ids)
         con.commit()
+        for deleted_id in [plan_id] + suggestion_ids:
+            read_cache.invalidate("plan", deleted_id)
         return {"success": True, "message": "Plan deleted successfully."}
     except sqlite3.Error as e:
+        con.rollback()
         return {"success": False, "message": f"Error deleting plan: {e}"}
     finally:
-        con.close()
\ No newline at end of file
+        con.close()
+
+# accept an advisor suggestion: it replaces the original plan in one transaction
+def accept_suggestion(suggestion_id):
+    """
+    The suggestion takes over the original plan's name and owner, the original's
+    notes and other pending suggestions are moved onto it, and the original plan
+    is deleted along with its semesters and courses.
+    """
+    suggestion_query = """ SELECT original_plan_id FROM Plans
+                           WHERE id = ? AND is_suggestion = 1 """
+    promote_query = """ UPDATE Plans
+                        SET (name, student_id, advisor_id) = (
+                                SELECT o.name, o.student_id, COALESCE(o.advisor_id, Plans.advisor_id)
+                                FROM Plans o
+                                WHERE o.id = ?),
+                            is_suggestion = 0,
+                            original_plan_id = NULL
+                        WHERE id = ? """
+    notes_query = """ UPDATE Notes
+                      SET plan_id = ?
+                      WHERE plan_id = ? """
+    rewire_query = """ UPDATE Plans
+                       SET original_plan_id = ?
+                       WHERE original_plan_id = ? """
+    con = get_db_connection()
+    try:
+        suggestion = con.execute(suggestion_query, (suggestion_id,)).fetchone()
+        if not suggestion or suggestion[0] is None:
+            return {"success": False, "message": "Suggestion not found."}
+        original_plan_id = suggestion[0]
+
+        con.execute(promote_query, (original_plan_id, suggestion_id))
+        con.execute(notes_query, (suggestion_id, original_plan_id))
+        con.execute(rewire_query, (suggestion_id, original_plan_id))
+        _delete_plan_rows(con, [original_plan_id])
+        con.commit()
+        # other suggestions were rewired too, so drop every cached plan read
+        read_cache.invalidate("plan")
+        return {"success": True, "message": "Suggestion accepted successfully."}
+    except sqlite3.Error as e:
+        con.rollback()
+        return {"success": False, "message": f"Error accepting suggestion: {e}"}
+    finally:
+        con.close()
+
+# reject an advisor suggestion: delete it with its semesters, courses and notes
+def reject_suggestion(suggestion_id):
+    query = """ SELECT id FROM Plans
+                WHERE id = ? AND is_suggestion = 1 """
+    con = get_db_connection()
+    try:
+        if not con.execute(query, (suggestion_id,)).fetchone():
+            return {"success": False, "message": "Suggestion not found."}
+        _delete_plan_rows(con, [suggestion_id])
+        con.commit()
+        read_cache.invalidate("plan", suggestion_id)
+        return {"success": True, "message": "Suggestion rejected successfully."}
+    except sqlite3.Error as e:
+        con.rollback()
+        return {"success": False, "message": f"Error rejecting suggestion: {e}"}
+    finally:
+        con.close()
+
+# statements that remove rows left behind by plans deleted before deletes cascaded, in dependency order
+ORPHAN_QUERIES = [
+    ("Plans", """ DELETE FROM Plans
+                  WHERE original_plan_id IS NOT NULL
+                  AND original_plan_id NOT IN (SELECT id FROM Plans) """),
+    ("Plan_Violations", """ DELETE FROM Plan_Violations
+                            WHERE plan_id NOT IN (SELECT id FROM Plans) """),
+    ("Notes", """ DELETE FROM Notes
+                  WHERE plan_id NOT IN (SELECT id FROM Plans) """),
+    ("Plan_Semester_Courses", """ DELETE FROM Plan_Semester_Courses
+                                  WHERE plan_id NOT IN (SELECT id FROM Plans) """),
+    ("Plan_Semesters", """ DELETE FROM Plan_Semesters
+                           WHERE plan_id NOT IN (SELECT id FROM Plans) """),
+]
+
+# find and delete orphaned plan rows
+def purge_orphans(dry_run=False):
+    """
+    Deletes suggestions whose original plan is gone and semesters, courses,
+    notes and violations whose plan is gone. Returns {table: rows removed}; with dry_run=True
+    the counts are reported and the transaction is rolled back.
+    """
+    con = get_db_connection()
+    try:
+        apply_violations_table(con, commit=False)
+        counts = {table: con.execute(query).rowcount for table, query in ORPHAN_QUERIES}
+        if dry_run:
+            con.rollback()
+        else:
+            con.commit()
+            read_cache.invalidate("plan")
+        return counts
+    except sqlite3.Error as e:
+        con.rollback()
+        print(f"Error purging orphaned plan rows: {e}")
+        return None
+    finally:
+        con.close()
+
+# delete many plans at once, with the suggestions made from them
+def delete_plans(plan_ids):
+    """
+    Bulk delete in one transaction with foreign keys enforced.
+    Returns the usual result dictionary plus "counts": {table: rows removed}.
+    """
+    if not plan_ids:
+        return {"success": True, "message": "No plans to delete.", "counts": {}}
+    placeholders = ", ".join("?" for _ in plan_ids)
+    plan_filter = f"id IN ({placeholders}) OR original_plan_id IN ({placeholders})"
+    con = get_db_connection()
+    try:
+        apply_violations_table(con, commit=False)
+        counts = cascade_delete(con, plan_cascade(plan_filter, list(plan_ids) * 2))
+        read_cache.invalidate("plan")
+        return {"success": True, "message": f"Deleted {counts['Plans']} plans.", "counts": counts}
+    except sqlite3.Error as e:
+        return {"success": False, "message": f"Error deleting plans: {e}"}
+    finally:
+        con.close()
@@ -1,12 +1,7 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import catalog_cache
+from db_utils import get_db_connection
+import prereq_graph
 
 # get all prereqs
 def get_prereq(subject, number):
@@ -15,16 +10,20 @@ def get_prereq(subject, number):
                 ON p.course_subject = c.subject AND p.course_number = c.number
                 WHERE parent_subject = ? AND parent_number = ? """
     con = get_db_connection()
-    prereqs = con.execute(query, (subject, number)).fetchall()
-    con.close()
+    try:
+        prereqs = con.execute(query, (subject, number)).fetchall()
+    finally:
+        con.close()
     return prereqs
 
 # get all entries in Prerequisites table
 def get_all_prereqs():
     query = """ SELECT * FROM Prerequisites """
     con = get_db_connection()
-    prereqs = con.execute(query).fetchall()
-    con.close()
+    try:
+        prereqs = con.execute(query).fetchall()
+    finally:
+        con.close()
     return prereqs
 
 # add a prereq (admin)
@@ -35,6 +34,8 @@ def add_prereq(parent_subject, parent_number, group_id, course_subject, course_n
     try:
         con.execute(query, (parent_subject, parent_number, group_id, course_subject, course_number))
         con.commit()
+        catalog_cache.bump()
+        prereq_graph.invalidate()
         return {"success": True, "message": "Prerequisite added successfully."}
     except sqlite3.IntegrityError as e:
         return {"success": False, "message": f"Error adding prerequisite: {e}"}
@@ -65,6 +66,8 @@ def update_prereq(parent_subject, parent_number, group_id, course_subject=None,
     try:
         con.execute(query, values)
         con.commit()
+        catalog_cache.bump()
+        prereq_graph.invalidate()
         return {"success": True, "message": "Prerequisite updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating prerequisite: {e}"}
@@ -79,6 +82,8 @@ def delete_prereq(parent_subject, parent_number, group_id):
     try:
         con.execute(query, (parent_subject, parent_number, group_id))
         con.commit()
+        catalog_cache.bump()
+        prereq_graph.invalidate()
         return {"success": True, "message": "Prerequisite deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting prerequisite: {e}"}
@@ -1,12 +1,6 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import read_cache
+from db_utils import get_db_connection, apply_violations_table, cascade_delete
 
 # get one semester
 def get_semester(term, year):
@@ -14,8 +8,10 @@ def get_semester(term, year):
                 WHERE term = ? AND year = ? 
                 LIMIT 1 """
     con = get_db_connection()
-    semester = con.execute(query, (term, year)).fetchone()
-    con.close()
+    try:
+        semester = con.execute(query, (term, year)).fetchone()
+    finally:
+        con.close()
     return semester
 
 # get semesters associated with a plan
@@ -31,16 +27,20 @@ def get_semesters(plan_id):
                         WHEN s.term = 'Fall' THEN 3
                     END"""
     con = get_db_connection()
-    semesters = con.execute(query, (plan_id,)).fetchall()
-    con.close()
+    try:
+        semesters = con.execute(query, (plan_id,)).fetchall()
+    finally:
+        con.close()
     return semesters
 
 # get all entries in Semesters table
 def get_all_semesters():
     query = """ SELECT * FROM Semesters """
     con = get_db_connection()
-    semesters = con.execute(query).fetchall()
-    con.close()
+    try:
+        semesters = con.execute(query).fetchall()
+    finally:
+        con.close()
     return semesters
 
 def insert_to_plan(plan_id, semester_id):
@@ -68,6 +68,7 @@ def insert_to_plan(plan_id, semester_id):
             # Record doesn't exist, so insert it
             con.execute(insert_query, (plan_id, semester_id))
             con.commit()
+            read_cache.invalidate("plan", plan_id)
             return {"success": True, "message": "Semester added to plan successfully."}
     except sqlite3.Error as e:
         # Catch any SQLite errors, not just IntegrityError
@@ -119,6 +120,7 @@ def update_semester(id, term=None, year=None):
     try:
         con.execute(query, values)
         con.commit()
+        read_cache.invalidate("plan")
         return {"success": True, "message": "Semester updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating semester: {e}"}
@@ -136,8 +138,38 @@ def delete_semester(id):
     try:
         con.execute(query, (id,))
         con.commit()
+        read_cache.invalidate("plan")
         return {"success": True, "message": "Semester deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting semester: {e}"}
     finally:
-        con.close()
\ No newline at end of file
+        con.close()
+
+# delete every semester before a year (admin)
+def delete_semesters_before(year):
+    """
+    Deletes semesters older than `year` and removes them from every plan, in one
+    transaction with foreign keys enforced.
+    Returns the usual result dictionary plus "counts": {table: rows removed}.
+    """
+    semester_ids = "SELECT id FROM Semesters WHERE year < ?"
+    statements = [
+        ("Plan_Violations", f""" DELETE FROM Plan_Violations
+                                 WHERE semester_id IN ({semester_ids}) """, (year,)),
+        ("Plan_Semester_Courses", f""" DELETE FROM Plan_Semester_Courses
+                                       WHERE semester_id IN ({semester_ids}) """, (year,)),
+        ("Plan_Semesters", f""" DELETE FROM Plan_Semesters
+                                WHERE semester_id IN ({semester_ids}) """, (year,)),
+        ("Semesters", """ DELETE FROM Semesters
+                          WHERE year < ? """, (year,)),
+    ]
+    con = get_db_connection()
+    try:
+        apply_violations_table(con, commit=False)
+        counts = cascade_delete(con, statements)
+        read_cache.invalidate("plan")
+        return {"success": True, "message": f"Deleted {counts['Semesters']} semesters.", "counts": counts}
+    except sqlite3.Error as e:
+        return {"success": False, "message": f"Error deleting semesters: {e}"}
+    finally:
+        con.close()
@@ -1,12 +1,9 @@
 import sqlite3
-
-DB_NAME = "reg_tracker.db"
-
-# Function to create a connection to SQLite
-def get_db_connection():
-    con = sqlite3.connect(DB_NAME)
-    con.row_factory = sqlite3.Row  # Enables dictionary-like row access
-    return con
+import controllers.plans as plans
+import auth_service
+import passwords
+import read_cache
+from db_utils import get_db_connection, apply_violations_table, cascade_delete
 
 # get one student
 def get_student(identifier, value):
@@ -19,8 +16,10 @@ def get_student(identifier, value):
                     WHERE id = ?
                     LIMIT 1 """
     con = get_db_connection()
-    student = con.execute(query, (value,)).fetchone()
-    con.close()
+    try:
+        student = con.execute(query, (value,)).fetchone()
+    finally:
+        con.close()
     return student
 
 # get several students from an advisor
@@ -29,8 +28,10 @@ def get_students(advisor_id):
                 WHERE advisor_id = ?
                 """
     con = get_db_connection()
-    students = con.execute(query, (advisor_id,)).fetchall()
-    con.close()
+    try:
+        students = con.execute(query, (advisor_id,)).fetchall()
+    finally:
+        con.close()
     return students
 
 # get all students
@@ -38,8 +39,10 @@ def get_all_students():
     query = """ SELECT * FROM Students
                 """
     con = get_db_connection()
-    students = con.execute(query).fetchall()
-    con.close()
+    try:
+        students = con.execute(query).fetchall()
+    finally:
+        con.close()
     return students
 
 # add a student (admin)
@@ -48,8 +51,10 @@ def add_student(id, f_name, l_name, username, password, major_id, graduation_dat
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?) """
     con = get_db_connection()
     try:
-        con.execute(query, (id, f_name, l_name, username, password, major_id, graduation_date, advisor_id))
+        con.execute(query, (id, f_name, l_name, username, passwords.hash_password(password), major_id, graduation_date, advisor_id))
         con.commit()
+        auth_service.forget_identities()
+        read_cache.invalidate("student", id)
         return {"success": True, "message": "Student added successfully."}
     except sqlite3.IntegrityError as e:
         return {"success": False, "message": f"Error adding student: {e}"}
@@ -75,7 +80,7 @@ def update_student(student_id, f_name=None, l_name=None, username=None, password
         values.append(username)
     if password:
         fields.append("password = ?")
-        values.append(password)
+        values.append(passwords.hash_password(password))
     if major_id:
         fields.append("major = ?")
         values.append(major_id)
@@ -98,6 +103,8 @@ def update_student(student_id, f_name=None, l_name=None, username=None, password
     try:
         con.execute(query, values)
         con.commit()
+        auth_service.forget_identities()
+        read_cache.invalidate("student", student_id)
         return {"success": True, "message": "Student updated successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error updating student: {e}"}
@@ -115,8 +122,62 @@ def delete_student(student_id):
     try:
         con.execute(query, (student_id,))
         con.commit()
+        auth_service.forget_identities()
+        read_cache.invalidate("student", student_id)
         return {"success": True, "message": "Student deleted successfully."}
     except sqlite3.Error as e:
         return {"success": False, "message": f"Error deleting student: {e}"}
     finally:
-        con.close()
\ No newline at end of file
+        con.close()
+
+# ordered statements deleting the students matched by student_filter, their plans and notes
+def _student_cascade(student_filter, params):
+    student_ids = f"SELECT id FROM Students WHERE {student_filter}"
+    statements = plans.plan_cascade(f"student_id IN ({student_ids})", params)
+    statements.append(("Notes", f""" DELETE FROM Notes
+                                     WHERE student_id IN ({student_ids}) """, params))
+    statements.append(("Students", f""" DELETE FROM Students
+                                        WHERE {student_filter} """, params))
+    return statements
+
+# delete many students at once (admin)
+def delete_students(student_ids):
+    """
+    Deletes the students with their plans, plan semesters and courses, and notes
+    in one transaction with foreign keys enforced.
+    Returns the usual result dictionary plus "counts": {table: rows removed}.
+    """
+    if not student_ids:
+        return {"success": True, "message": "No students to delete.", "counts": {}}
+    placeholders = ", ".join("?" for _ in student_ids)
+    con = get_db_connection()
+    try:
+        apply_violations_table(con, commit=False)
+        counts = cascade_delete(con, _student_cascade(f"id IN ({placeholders})", list(student_ids)))
+        auth_service.forget_identities()
+        read_cache.invalidate("student")
+        read_cache.invalidate("plan")
+        return {"success": True, "message": f"Deleted {counts['Students']} students.", "counts": counts}
+    except sqlite3.Error as e:
+        return {"success": False, "message": f"Error deleting students: {e}"}
+    finally:
+        con.close()
+
+# delete a graduated cohort (admin)
+def delete_graduated_students(before_date):
+    """
+    Like delete_students() for every student whose graduation_date (YYYYMMDD)
+    is before `before_date`.
+    """
+    con = get_db_connection()
+    try:
+        apply_violations_table(con, commit=False)
+        counts = cascade_delete(con, _student_cascade("graduation_date < ?", (before_date,)))
+        auth_service.forget_identities()
+        read_cache.invalidate("student")
+        read_cache.invalidate("plan")
+        return {"success": True, "message": f"Deleted {counts['Students']} students.", "counts": counts}
+    except sqlite3.Error as e:
+        return {"success": False, "message": f"Error deleting students: {e}"}
+    finally:
+        con.close()
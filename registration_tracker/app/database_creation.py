@@ -1,9 +1,13 @@
 import sqlite3
+from db_utils import DB_NAME, apply_storage_profile, apply_indexes, apply_users_table, apply_violations_table, check_indexed_lookups
 
 # implicitly creates it if it does not exist
-con = sqlite3.connect("reg_tracker.db")
+con = sqlite3.connect(DB_NAME)
 # con represents the connection to the on-disk database
 
+# switch the file to the configured storage profile (WAL etc.) before building it
+apply_storage_profile(con)
+
 # database cursor to traverse database
 cur = con.cursor()
 
@@ -1216,4 +1220,10 @@ if (res[0] == 0):
     con.commit()
 
 #endregion
+
+# Migration: add the secondary indexes, the Users login table and Plan_Violations (safe to re-run on an existing database)
+apply_users_table(con)
+apply_violations_table(con)
+apply_indexes(con)
+check_indexed_lookups(con)
 con.close()
\ No newline at end of file
@@ -0,0 +1,432 @@
+import os
+import sqlite3
+import threading
+import queue
+import weakref
+
+# Database Configuration (SQLite)
+DB_NAME = "reg_tracker.db"
+
+# Maximum number of idle connections kept open by the pool
+POOL_SIZE = 8
+# Seconds a thread waits for a free connection before giving up
+POOL_TIMEOUT = 10.0
+
+# SQLite storage profiles, applied to every connection when it is opened.
+# "tuned" lets readers keep going while an advisor or student writes (WAL),
+# "legacy" is SQLite's default rollback journal and is kept for comparison.
+STORAGE_PROFILES = {
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,       # milliseconds
+        "mmap_size": 268435456,     # 256 MB
+        "cache_size": -16000,       # negative = KiB, so ~16 MB per connection
+        "temp_store": "MEMORY",
+    },
+    "legacy": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,       # what sqlite3.connect() uses by default
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+    },
+}
+
+# Pick a profile with REG_TRACKER_STORAGE_PROFILE=legacy|tuned
+STORAGE_PROFILE = os.environ.get("REG_TRACKER_STORAGE_PROFILE", "tuned")
+
+
+def get_storage_profile(name=None):
+    """Return the pragma settings for a storage profile (defaults to STORAGE_PROFILE)."""
+    name = name or STORAGE_PROFILE
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {name}")
+    return STORAGE_PROFILES[name]
+
+
+def apply_storage_profile(con, profile=None):
+    """
+    Apply a storage profile's pragmas to a connection.
+    `profile` may be a profile name or a dict of pragma settings.
+    """
+    if profile is None or isinstance(profile, str):
+        profile = get_storage_profile(profile)
+    for pragma, value in profile.items():
+        # pragma names/values come from our own config, not user input
+        con.execute(f"PRAGMA {pragma} = {value}")
+    return con
+
+
+def _default_factory():
+    return sqlite3.connect(DB_NAME, check_same_thread=False)
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a pooled sqlite3 connection.
+    Behaves like a normal connection, except close() hands it back to the pool.
+    Used as a context manager it commits (or rolls back) and then closes.
+    A wrapper that is dropped without close() still returns its connection
+    when it is garbage collected.
+    """
+
+    def __init__(self, pool, con, generation, took_slot=True, held=None):
+        object.__setattr__(self, "_con", con)
+        object.__setattr__(self, "_release", weakref.finalize(
+            self, pool.release, con, generation, took_slot, held))
+
+    def __getattr__(self, name):
+        if self._con is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._con, name)
+
+    def __setattr__(self, name, value):
+        # e.g. con.row_factory = ... should reach the real connection
+        setattr(self._con, name, value)
+
+    def __enter__(self):
+        self._con.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            return self._con.__exit__(exc_type, exc, tb)
+        finally:
+            self.close()
+
+    def close(self):
+        # Closing twice is a no-op, just like sqlite3
+        if self._con is None:
+            return
+        object.__setattr__(self, "_con", None)
+        self._release()
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-aware pool of SQLite connections.
+
+    Connections are created lazily and set up once (row factory, storage profile pragmas).
+    A thread that already holds a connection never blocks waiting for another
+    one, so nested controller calls cannot deadlock on an exhausted pool.
+    Each connection keeps a reference to its thread's checkout count, so a
+    leaked connection collected on another thread is still credited to its owner.
+    """
+
+    def __init__(self, factory=None, size=POOL_SIZE, timeout=POOL_TIMEOUT, profile=None):
+        self.factory = factory or _default_factory
+        self.profile = profile
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._local = threading.local()
+        # Reentrant: a finalizer may return a leaked connection while this thread holds it
+        self._lock = threading.RLock()
+        self._generation = 0
+
+    def _setup(self, con):
+        """Connection-level setup, applied once per physical connection."""
+        con.row_factory = sqlite3.Row  # Enables dictionary-like row access
+        apply_storage_profile(con, self.profile)
+        return con
+
+    def _held_count(self):
+        # One-element list, shared with this thread's PooledConnection finalizers
+        if not hasattr(self._local, "held"):
+            self._local.held = [0]
+        return self._local.held
+
+    def _held(self):
+        return self._held_count()[0]
+
+    def acquire(self):
+        held = self._held_count()
+        nested = held[0] > 0
+        if not nested:
+            if not self._slots.acquire(timeout=self.timeout):
+                raise sqlite3.OperationalError("Timed out waiting for a database connection.")
+        try:
+            try:
+                con = self._idle.get_nowait()
+            except queue.Empty:
+                con = self._setup(self.factory())
+        except Exception:
+            if not nested:
+                self._slots.release()
+            raise
+        with self._lock:
+            held[0] += 1
+        # Nested checkouts do not hold a slot of their own
+        return PooledConnection(self, con, self._generation, took_slot=not nested, held=held)
+
+    def release(self, con, generation, took_slot=True, held=None):
+        held = self._held_count() if held is None else held
+        with self._lock:
+            held[0] = max(held[0] - 1, 0)
+        try:
+            # Never hand the next borrower a half-finished transaction
+            if con.in_transaction:
+                con.rollback()
+            if generation == self._generation and self._idle.qsize() < self.size:
+                self._idle.put(con)
+            else:
+                con.close()
+        except sqlite3.Error:
+            con.close()
+        finally:
+            if took_slot:
+                self._slots.release()
+
+    def clear(self):
+        """Close every idle connection; checked-out ones are dropped when returned."""
+        with self._lock:
+            self._generation += 1
+            while True:
+                try:
+                    con = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                con.close()
+
+
+_pool = ConnectionPool()
+
+
+def get_pool():
+    return _pool
+
+
+# Function to create a connection to SQLite
+def get_db_connection():
+    """
+    Borrow a connection from the shared pool.
+    Calling close() on it returns it to the pool instead of closing the file;
+    `with get_db_connection() as con:` commits and returns it on exit.
+    """
+    return _pool.acquire()
+
+
+def set_connection_factory(factory=None, size=POOL_SIZE, profile=None):
+    """
+    Test hook: replace the function used to open physical connections.
+    Passing None restores the default reg_tracker.db factory.
+    """
+    global _pool
+    _pool.clear()
+    _pool = ConnectionPool(factory, size=size, profile=profile)
+    return _pool
+
+
+# Secondary indexes for the lookups the controllers run on every page render.
+# CREATE INDEX IF NOT EXISTS makes this safe to re-run against an existing database.
+INDEX_DEFINITIONS = [
+    # courses.get_course_prereq / prerequisites.get_prereq (covering)
+    """ CREATE INDEX IF NOT EXISTS idx_prereq_parent
+        ON Prerequisites (parent_subject, parent_number, group_id, course_subject, course_number) """,
+    # reverse lookup: which courses list this one as a prerequisite
+    """ CREATE INDEX IF NOT EXISTS idx_prereq_course
+        ON Prerequisites (course_subject, course_number) """,
+    # plans.get_plans / get_plan / get_first_plan
+    """ CREATE INDEX IF NOT EXISTS idx_plans_student ON Plans (student_id, name) """,
+    """ CREATE INDEX IF NOT EXISTS idx_plans_advisor ON Plans (advisor_id, name) """,
+    """ CREATE INDEX IF NOT EXISTS idx_plans_original ON Plans (original_plan_id) """,
+    # semesters.get_semesters looks Plan_Semesters up by plan
+    """ CREATE INDEX IF NOT EXISTS idx_plan_semesters_plan ON Plan_Semesters (plan_id, semester_id) """,
+    # revalidation.find_affected_plans: plans that schedule a course
+    """ CREATE INDEX IF NOT EXISTS idx_plan_courses_course
+        ON Plan_Semester_Courses (course_subject, course_number, plan_id) """,
+    # students.get_students / get_student("username", ...)
+    """ CREATE INDEX IF NOT EXISTS idx_students_advisor ON Students (advisor_id) """,
+    """ CREATE INDEX IF NOT EXISTS idx_students_username ON Students (username) """,
+    """ CREATE INDEX IF NOT EXISTS idx_advisors_username ON Advisors (username) """,
+    """ CREATE INDEX IF NOT EXISTS idx_admins_username ON Admins (username) """,
+    # notes.get_advisor_notes / get_student_notes, newest first
+    """ CREATE INDEX IF NOT EXISTS idx_notes_advisor_plan ON Notes (advisor_id, plan_id, timestamp) """,
+    """ CREATE INDEX IF NOT EXISTS idx_notes_student_plan ON Notes (student_id, plan_id, timestamp) """,
+    """ CREATE INDEX IF NOT EXISTS idx_notes_plan ON Notes (plan_id) """,
+    # requirement sections for a major / concentration
+    """ CREATE INDEX IF NOT EXISTS idx_concentrations_major ON Concentrations (major_id) """,
+    """ CREATE INDEX IF NOT EXISTS idx_major_sections_major ON Major_Sections (major_id) """,
+    """ CREATE INDEX IF NOT EXISTS idx_conc_sections_conc ON Concentration_Sections (concentration_id) """,
+    """ CREATE INDEX IF NOT EXISTS idx_major_reqs_section
+        ON Major_Section_Requirements (section_id, group_id, course_subject, course_number) """,
+    """ CREATE INDEX IF NOT EXISTS idx_conc_reqs_section
+        ON Concentration_Section_Requirements (section_id, group_id, course_subject, course_number) """,
+    """ CREATE INDEX IF NOT EXISTS idx_gen_ed_reqs_section
+        ON Gen_Ed_Section_Requirements (section_id, group_id, course_subject, course_number) """,
+]
+
+# (table, columns) pairs that must be answered by an index, checked after migrating
+INDEXED_LOOKUPS = [
+    ("Prerequisites", ("parent_subject", "parent_number")),
+    ("Prerequisites", ("course_subject", "course_number")),
+    ("Plans", ("student_id",)),
+    ("Plans", ("advisor_id",)),
+    ("Plan_Semesters", ("plan_id",)),
+    ("Plan_Semester_Courses", ("plan_id",)),
+    ("Plan_Semester_Courses", ("course_subject", "course_number")),
+    ("Students", ("advisor_id",)),
+    ("Students", ("username",)),
+    ("Advisors", ("username",)),
+    ("Admins", ("username",)),
+    ("Notes", ("advisor_id", "plan_id")),
+    ("Notes", ("student_id", "plan_id")),
+    ("Concentrations", ("major_id",)),
+    ("Major_Sections", ("major_id",)),
+    ("Concentration_Sections", ("concentration_id",)),
+    ("Major_Section_Requirements", ("section_id",)),
+    ("Concentration_Section_Requirements", ("section_id",)),
+    ("Gen_Ed_Section_Requirements", ("section_id",)),
+]
+
+
+def apply_indexes(con):
+    """Migration step: create any missing secondary indexes and refresh planner statistics."""
+    for statement in INDEX_DEFINITIONS:
+        con.execute(statement)
+    con.execute("ANALYZE")
+    con.commit()
+
+
+def find_table_scans(con, query, params=()):
+    """
+    Run EXPLAIN QUERY PLAN for a query and return the steps that scan a whole table.
+    An empty list means every table in the query is reached through an index.
+    Scans of subquery results ("SCAN (subquery-N)") are not table scans and are ignored.
+    """
+    plan = con.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return [row[3] for row in plan
+            if row[3].startswith("SCAN ") and not row[3].startswith("SCAN (") and "CONSTANT ROW" not in row[3]]
+
+
+def schema_copy(con):
+    """
+    In-memory database with the same tables and indexes but no rows or statistics.
+    With tiny tables the planner rightly prefers a scan, so plans are checked here
+    to see what it does once the catalog is large.
+    """
+    copy = sqlite3.connect(":memory:")
+    rows = con.execute(""" SELECT sql FROM sqlite_master
+                           WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+                           ORDER BY CASE type WHEN 'table' THEN 0 ELSE 1 END """).fetchall()
+    for row in rows:
+        copy.execute(row[0])
+    return copy
+
+
+def check_indexed_lookups(con, lookups=INDEXED_LOOKUPS):
+    """Raise if any of the hot lookups would fall back to a full table scan."""
+    failures = []
+    copy = schema_copy(con)
+    for table, columns in lookups:
+        where = " AND ".join(f"{column} = ?" for column in columns)
+        query = f"SELECT * FROM {table} WHERE {where}"
+        scans = find_table_scans(copy, query, [None] * len(columns))
+        if scans:
+            failures.append(f"{query}: {'; '.join(scans)}")
+    copy.close()
+    if failures:
+        raise sqlite3.OperationalError("Queries fall back to a table scan:\n" + "\n".join(failures))
+
+
+# Users mirrors the login columns of Students, Advisors and Admins so a username
+# resolves to (role, id, password) with one primary-key probe. Triggers keep it in
+# sync and its primary key makes usernames unique across all three roles.
+USER_TABLES = [("student", "Students"), ("advisor", "Advisors"), ("admin", "Admins")]
+
+USERS_TABLE = """ CREATE TABLE IF NOT EXISTS Users (
+                  username TEXT PRIMARY KEY,
+                  role TEXT NOT NULL,
+                  id INTEGER NOT NULL,
+                  password TEXT NOT NULL,
+                  UNIQUE(role, id)
+                  ) WITHOUT ROWID """
+
+
+def user_triggers(role, table):
+    name = table.lower()
+    return [
+        f""" CREATE TRIGGER IF NOT EXISTS {name}_users_insert AFTER INSERT ON {table}
+             BEGIN
+                 INSERT INTO Users (username, role, id, password)
+                 VALUES (NEW.username, '{role}', NEW.id, NEW.password);
+             END """,
+        f""" CREATE TRIGGER IF NOT EXISTS {name}_users_update AFTER UPDATE OF id, username, password ON {table}
+             BEGIN
+                 UPDATE Users SET username = NEW.username, id = NEW.id, password = NEW.password
+                 WHERE role = '{role}' AND id = OLD.id;
+             END """,
+        f""" CREATE TRIGGER IF NOT EXISTS {name}_users_delete AFTER DELETE ON {table}
+             BEGIN
+                 DELETE FROM Users WHERE role = '{role}' AND id = OLD.id;
+             END """,
+    ]
+
+
+def apply_users_table(con):
+    """
+    Migration step: create Users and its triggers, then copy in any existing
+    accounts. If a username is already taken by another role the first one in
+    USER_TABLES order keeps it, matching the old login precedence.
+    """
+    con.execute(USERS_TABLE)
+    for role, table in USER_TABLES:
+        for statement in user_triggers(role, table):
+            con.execute(statement)
+        con.execute(f""" INSERT OR IGNORE INTO Users (username, role, id, password)
+                         SELECT username, '{role}', id, password FROM {table} """)
+    con.commit()
+
+
+# Prerequisite violations found by the revalidation job (see revalidation.py),
+# one row per scheduled course whose prerequisites aren't met. Rows are replaced
+# per plan each time the plan is re-checked.
+PLAN_VIOLATIONS_TABLE = """ CREATE TABLE IF NOT EXISTS Plan_Violations (
+                            plan_id INTEGER NOT NULL,
+                            semester_id INTEGER NOT NULL,
+                            course_subject TEXT NOT NULL,
+                            course_number INTEGER NOT NULL,
+                            missing TEXT NOT NULL,
+                            checked_at TEXT NOT NULL,
+                            PRIMARY KEY (plan_id, semester_id, course_subject, course_number)
+                            ) WITHOUT ROWID """
+
+
+def apply_violations_table(con, commit=True):
+    """
+    Migration step: create Plan_Violations. Plan deletes pass commit=False, since
+    they may already be inside the transaction that cascades to it.
+    """
+    con.execute(PLAN_VIOLATIONS_TABLE)
+    if commit:
+        con.commit()
+
+
+def cascade_delete(con, statements):
+    """
+    Run ordered DELETE statements in one transaction with foreign keys enforced.
+
+    statements is a list of (table, query, params), children before parents. If
+    the cascade misses a referencing row SQLite raises, the transaction is rolled
+    back and the error propagates. On success the touched tables are re-analyzed
+    and {table: rows removed} is returned.
+    """
+    counts = {}
+    # foreign_keys is a no-op inside a transaction, so set it before the first DELETE
+    con.execute("PRAGMA foreign_keys = ON")
+    try:
+        for table, query, params in statements:
+            counts[table] = counts.get(table, 0) + con.execute(query, params).rowcount
+        con.commit()
+    except sqlite3.Error:
+        con.rollback()
+        raise
+    finally:
+        con.execute("PRAGMA foreign_keys = OFF")
+    for table in counts:
+        if counts[table]:
+            con.execute(f"ANALYZE {table}")
+    return counts
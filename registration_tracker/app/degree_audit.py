@@ -0,0 +1,47 @@
+from collections import namedtuple
+import controllers.plans as c_plans
+import requirements
+
+# Degree audit: how far a plan's courses go toward each requirement section
+# of its major, concentration and gen eds (requirements.evaluate), with each
+# course counted once across overlapping sections.
+#
+# An audit needs the plan snapshot (which already carries every course's
+# credits) and the plan's requirement sections, loaded in one query and cached
+# per catalog version. Pages read it through reads.get_degree_audit, cached
+# per plan revision.
+
+# sections: [SectionProgress] in requirement order
+# credits_counted: credits counted toward the sections, at most each section's requirement
+# credits_required: sum of the sections' credit requirements
+# total_credits: every scheduled credit, counted or not
+# other_courses: scheduled courses that count toward no section
+Audit = namedtuple("Audit", [
+    "plan_id", "sections", "credits_counted", "credits_required", "total_credits", "other_courses", "complete"
+])
+
+
+def audit_snapshot(snapshot, sections):
+    """Audit a PlanSnapshot against requirement `sections`."""
+    credits = {}
+    for semester in snapshot.semesters:
+        for course in semester.courses:
+            credits[(course.subject, course.number)] = course.credits
+    progress = tuple(requirements.evaluate(sections, credits, credits))
+    counted = {course for section in progress for course in section.courses}
+    return Audit(
+        snapshot.id, progress,
+        sum(min(section.credits, section.section.credits_required) for section in progress),
+        sum(section.section.credits_required for section in progress),
+        snapshot.total_credits,
+        tuple(sorted(course for course in credits if course not in counted)),
+        all(requirements.is_complete(section) for section in progress),
+    )
+
+
+def audit_plan(plan_id):
+    """Audit of a stored plan, or None if it doesn't exist."""
+    snapshot = c_plans.load_plan_snapshot(plan_id)
+    if snapshot is None:
+        return None
+    return audit_snapshot(snapshot, requirements.get_sections(snapshot.major_id, snapshot.concentration_id))
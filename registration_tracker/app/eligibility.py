@@ -0,0 +1,217 @@
+from collections import namedtuple
+import controllers.plans as c_plans
+from catalog_cache import cached
+from db_utils import get_db_connection
+import prereq_graph
+
+MAJOR_REQUIREMENTS_QUERY = """
+    SELECT msr.course_subject, msr.course_number, c.name, c.credits, ms.section
+    FROM Major_Sections ms
+    JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
+    JOIN Courses c ON msr.course_subject = c.subject AND msr.course_number = c.number
+    WHERE ms.major_id = ?
+    ORDER BY ms.section, msr.group_id
+"""
+
+CONCENTRATION_REQUIREMENTS_QUERY = """
+    SELECT csr.course_subject, csr.course_number, c.name, c.credits, cs.section
+    FROM Concentration_Sections cs
+    JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
+    JOIN Courses c ON csr.course_subject = c.subject AND csr.course_number = c.number
+    WHERE cs.concentration_id = ?
+    ORDER BY cs.section, csr.group_id
+"""
+
+GEN_ED_REQUIREMENTS_QUERY = """
+    SELECT ger.course_subject, ger.course_number, c.name, c.credits, ges.section
+    FROM Gen_Ed_Sections ges
+    JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
+    JOIN Courses c ON ger.course_subject = c.subject AND ger.course_number = c.number
+    ORDER BY ges.section, ger.group_id
+"""
+
+# Every section of a major / concentration / the gen eds with its required
+# courses; sections without requirements still appear (with NULL courses)
+MAJOR_SECTIONS_QUERY = """
+    SELECT ms.section, msr.course_subject, msr.course_number
+    FROM Major_Sections ms
+    LEFT JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
+    WHERE ms.major_id = ?
+    ORDER BY ms.id
+"""
+
+CONCENTRATION_SECTIONS_QUERY = """
+    SELECT cs.section, csr.course_subject, csr.course_number
+    FROM Concentration_Sections cs
+    LEFT JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
+    WHERE cs.concentration_id = ?
+    ORDER BY cs.id
+"""
+
+GEN_ED_SECTIONS_QUERY = """
+    SELECT ges.section, ger.course_subject, ger.course_number
+    FROM Gen_Ed_Sections ges
+    LEFT JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
+    ORDER BY ges.id
+"""
+
+# Requirement kinds in the order a course is attributed to them
+SECTION_KINDS = ("major", "concentration", "gen_ed")
+OTHER_SECTION = "Other Courses"
+
+# sections: {kind: tuple of section names in display order}
+# courses:  {(subject, number): (kind, section name)}
+SectionIndex = namedtuple("SectionIndex", ["sections", "courses"])
+
+
+def get_plan_concentration(plan_id):
+    con = get_db_connection()
+    try:
+        plan = con.execute("SELECT concentration_id FROM Plans WHERE id = ?", (plan_id,)).fetchone()
+    finally:
+        con.close()
+    return plan['concentration_id'] if plan else None
+
+
+@cached
+def get_requirement_courses(major_id, concentration_id=None):
+    """
+    All courses required by a major, its concentration (if any) and gen eds,
+    as dictionaries shaped like get_available_courses() results.
+    Cached per catalog version.
+    """
+    con = get_db_connection()
+    try:
+        rows = con.execute(MAJOR_REQUIREMENTS_QUERY, (major_id,)).fetchall()
+        if concentration_id:
+            rows += con.execute(CONCENTRATION_REQUIREMENTS_QUERY, (concentration_id,)).fetchall()
+        rows += con.execute(GEN_ED_REQUIREMENTS_QUERY).fetchall()
+    finally:
+        con.close()
+    return [
+        {
+            'subject': row[0],
+            'number': row[1],
+            'name': row[2],
+            'credits': row[3],
+            'section': row[4]
+        }
+        for row in rows
+    ]
+
+
+@cached
+def get_section_index(major_id, concentration_id=None):
+    """
+    Which requirement section each course of a major/concentration belongs to.
+    A course listed under several kinds counts toward the first of
+    SECTION_KINDS, and within a kind toward its first section.
+    Cached per catalog version; treat the result as read-only.
+    """
+    con = get_db_connection()
+    try:
+        rows = {"major": con.execute(MAJOR_SECTIONS_QUERY, (major_id,)).fetchall(), "concentration": []}
+        if concentration_id:
+            rows["concentration"] = con.execute(CONCENTRATION_SECTIONS_QUERY, (concentration_id,)).fetchall()
+        rows["gen_ed"] = con.execute(GEN_ED_SECTIONS_QUERY).fetchall()
+    finally:
+        con.close()
+
+    sections = {}
+    courses = {}
+    for kind in SECTION_KINDS:
+        names = []
+        for section, subject, number in rows[kind]:
+            if section not in names:
+                names.append(section)
+            if subject is not None and number is not None:
+                courses.setdefault(prereq_graph.course_key(subject, number), (kind, section))
+        sections[kind] = tuple(names)
+    return SectionIndex(sections, courses)
+
+
+def group_by_section(courses, index):
+    """
+    Group course dicts by requirement section for the "Add Courses" tabs.
+    Returns {kind: {section name: [courses]}} with every section of the index
+    present (possibly empty). Courses outside the index go to the gen ed
+    OTHER_SECTION group.
+    """
+    grouped = {kind: {name: [] for name in index.sections[kind]} for kind in SECTION_KINDS}
+    for course in courses:
+        kind, section = index.courses.get(prereq_graph.course_key(course['subject'], course['number']),
+                                          ("gen_ed", OTHER_SECTION))
+        grouped[kind].setdefault(section, []).append(course)
+    return grouped
+
+
+def evaluate_candidates(candidates, planned, prior, graph):
+    """
+    Filter candidate courses in one pass.
+
+    planned: set of (subject, number) anywhere in the plan (skipped)
+    prior:   set of (subject, number) scheduled before the target semester,
+             or None if the target semester is not in the plan
+    """
+    available = []
+    for course in candidates:
+        key = prereq_graph.course_key(course['subject'], course['number'])
+        if key in planned:
+            continue
+        if graph.has_prereqs(*key):
+            if prior is None or not graph.is_satisfied(*key, prior):
+                continue
+        available.append(course)
+    return available
+
+
+def get_available_courses(plan_id, semester_id, major_id):
+    """
+    Courses required for the plan's major, concentration and gen eds whose
+    prerequisites are met by the semesters before `semester_id`.
+    Runs a fixed number of queries no matter how many candidates there are.
+    """
+    concentration_id = get_plan_concentration(plan_id)
+    history = c_plans.get_plan_history(plan_id)
+
+    planned = set()
+    prior = None
+    for history_semester_id, courses in history:
+        if history_semester_id == semester_id:
+            prior = set(planned)
+        planned |= courses
+
+    candidates = get_requirement_courses(major_id, concentration_id)
+    return evaluate_candidates(candidates, planned, prior, prereq_graph.get_graph())
+
+
+def get_eligibility_matrix(plan_id, major_id):
+    """
+    Available courses for every semester of a plan, computed in one pass.
+
+    Returns {semester_id: [course dicts]} where each list is exactly what
+    get_available_courses() returns for that semester. The plan history and
+    requirement rows are read once; each semester is checked against the
+    cumulative set of courses scheduled before it.
+    """
+    concentration_id = get_plan_concentration(plan_id)
+    history = c_plans.get_plan_history(plan_id)
+    graph = prereq_graph.get_graph()
+
+    planned = set()
+    for _, courses in history:
+        planned |= courses
+
+    # Courses already in the plan are never offered, whatever the semester
+    candidates = [
+        course for course in get_requirement_courses(major_id, concentration_id)
+        if prereq_graph.course_key(course['subject'], course['number']) not in planned
+    ]
+
+    matrix = {}
+    prior = set()
+    for semester_id, courses in history:
+        matrix[semester_id] = evaluate_candidates(candidates, set(), prior, graph)
+        prior = prior | courses
+    return matrix
+
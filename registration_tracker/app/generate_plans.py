@@ -0,0 +1,48 @@
+"""
+Generate starter plans for a cohort of incoming students.
+
+Reads a CSV with the columns student_id, major, concentration, start_term
+(majors and concentrations by id or name, concentration may be empty) and
+fills an 8-semester plan for each student from their degree requirements, on
+worker processes. Plans are written a chunk at a time; if a run is
+interrupted, run the same command again and students who already have a plan
+with that name are skipped. Run it from the app directory:
+
+    python generate_plans.py cohort.csv --name "Fall 2025 Starter Plan" --workers 8
+"""
+import argparse
+import cohort
+import scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("students", help="CSV file with student_id, major, concentration, start_term")
+    parser.add_argument("--name", default=cohort.DEFAULT_PLAN_NAME, help="name of the generated plans")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: cohort.COHORT_WORKERS)")
+    parser.add_argument("--chunk-size", type=int, default=cohort.CHUNK_SIZE,
+                        help="plans per worker task and per transaction")
+    parser.add_argument("--credit-cap", type=int, default=scheduler.MAX_CREDITS,
+                        help="maximum credits per semester")
+    args = parser.parse_args()
+
+    try:
+        students = cohort.read_students(args.students)
+    except (OSError, ValueError) as e:
+        raise SystemExit(str(e))
+
+    def progress(done, total, plans_per_second):
+        print(f"\r{done}/{total} plans ({plans_per_second:.0f} plans/s)", end="", flush=True)
+
+    result = cohort.generate_cohort(students, args.name, workers=args.workers, chunk_size=args.chunk_size,
+                                    credit_cap=args.credit_cap, progress=progress)
+    print(f"\n{result['plans']} plans created in {result['seconds']:.2f}s "
+          f"({result['plans_per_second']:.0f} plans/s), {result['skipped']} already had one, "
+          f"{result['unknown']} unknown students")
+    if result["incomplete"]:
+        print(f"{result['incomplete']} plans have requirements left for the student to choose")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+from collections import namedtuple
+import controllers.plans as c_plans
+import prereq_analysis
+import prereq_graph
+import requirements
+import scheduler
+
+# Soonest a plan can be finished, from the critical path through the
+# prerequisites of the requirement courses it still lacks.
+#
+# Courses already in the plan stay in their semesters. The remaining courses
+# are the ones the scheduler would add (requirement courses plus missing
+# prerequisites). Each one can go no earlier than one term after some
+# alternative of every prerequisite group, whether that alternative is already
+# planned or remaining. The longest such chain bounds the number of terms from
+# below, as does fitting the remaining credits under the per-term credit cap.
+#
+# Pages read it through reads.get_earliest_graduation, cached per plan and
+# catalog version.
+
+# terms: minimum number of terms counted from the plan's first semester
+# remaining_terms: of those, terms after the last semester that already has courses
+# graduation_term: (term, year) of the last of those terms
+# critical_path: remaining courses on the longest prerequisite chain, first to last
+# remaining: every remaining course; remaining_credits: their credits
+# blocked: remaining courses that can never be taken; unmet: as in scheduler.Schedule
+GraduationEstimate = namedtuple("GraduationEstimate", [
+    "terms", "remaining_terms", "graduation_term", "critical_path",
+    "remaining", "remaining_credits", "blocked", "unmet"
+])
+
+
+def next_term(term, year):
+    """The regular term after (term, year): Fall -> Spring of the next year, otherwise Fall."""
+    return ("Spring", year + 1) if term == "Fall" else ("Fall", year)
+
+
+def _earliest_terms(remaining, positions, graph, rank):
+    """
+    {course: (earliest term index, the remaining prerequisite that sets it or None)}
+    for each remaining course that can be taken at all.
+    """
+    earliest = {}
+    visiting = set()
+
+    def visit(course):
+        if course in earliest:
+            return earliest[course][0]
+        if course in visiting:
+            return None  # a cycle through alternatives; another alternative has to do
+        visiting.add(course)
+        start, through = 0, None
+        for group in graph.get_groups(*course):
+            best = None
+            for alternative in sorted(group, key=rank):
+                if alternative in positions:
+                    after, via = positions[alternative] + 1, None
+                elif alternative in remaining:
+                    before = visit(alternative)
+                    if before is None:
+                        continue
+                    after, via = before + 1, alternative
+                else:
+                    continue
+                if best is None or after < best[0]:
+                    best = (after, via)
+            if best is None:
+                visiting.discard(course)
+                return None
+            if best[0] > start:
+                start, through = best
+        visiting.discard(course)
+        earliest[course] = (start, through)
+        return start
+
+    for course in sorted(remaining, key=rank):
+        visit(course)
+    return earliest
+
+
+def estimate(history, sections, graph, analysis, credits, credit_cap=scheduler.MAX_CREDITS):
+    """
+    Estimate for a plan whose semesters are `history` ([(semester_id, courses)]
+    in order). Returns a GraduationEstimate without graduation_term, which
+    needs the semesters' names (see earliest_graduation).
+    """
+    def rank(course):
+        return (analysis.min_semesters_before(*course), course)
+
+    positions = {}
+    planned_credits = []
+    last_filled = 0
+    for index, (_, courses) in enumerate(history):
+        courses = {prereq_graph.course_key(*course) for course in courses}
+        for course in courses:
+            positions.setdefault(course, index)
+        planned_credits.append(sum(credits.get(course, 0) for course in courses))
+        if courses:
+            last_filled = index + 1
+
+    chosen, unmet = scheduler.choose_courses(sections, analysis, credits, positions)
+    remaining = set(scheduler.add_prerequisites(chosen, graph, analysis, positions))
+    earliest = _earliest_terms(remaining, positions, graph, rank)
+    blocked = sorted(remaining - set(earliest))
+
+    critical_path = []
+    if earliest:
+        course = max(sorted(earliest, key=rank), key=lambda course: earliest[course][0])
+        while course is not None:
+            critical_path.append(course)
+            course = earliest[course][1]
+        critical_path.reverse()
+    chain_terms = max((start + 1 for start, _ in earliest.values()), default=0)
+
+    # terms needed to fit the remaining credits into the room left under the cap
+    remaining_credits = sum(credits.get(course, 0) for course in earliest)
+    credit_terms, room = 0, 0
+    while room < remaining_credits and credit_cap > 0:
+        load = planned_credits[credit_terms] if credit_terms < len(planned_credits) else 0
+        room += max(0, credit_cap - load)
+        credit_terms += 1
+
+    terms = max(last_filled, chain_terms, credit_terms)
+    return GraduationEstimate(terms, terms - last_filled, None, tuple(critical_path),
+                              tuple(sorted(remaining)), remaining_credits, tuple(blocked), tuple(unmet))
+
+
+def earliest_graduation(plan_id, credit_cap=scheduler.MAX_CREDITS):
+    """GraduationEstimate for a stored plan, or None if it doesn't exist or has no semesters."""
+    snapshot = c_plans.load_plan_snapshot(plan_id)
+    if snapshot is None or not snapshot.semesters:
+        return None
+    history = [(semester.id, {(course.subject, course.number) for course in semester.courses})
+               for semester in snapshot.semesters]
+    analysis = prereq_analysis.get_analysis()
+    result = estimate(history, requirements.get_sections(snapshot.major_id, snapshot.concentration_id),
+                      analysis.graph, analysis, requirements.get_course_credits(), credit_cap)
+
+    if result.terms == 0:
+        return result
+    if result.terms <= len(snapshot.semesters):
+        last = snapshot.semesters[result.terms - 1]
+        term = (last.term, last.year)
+    else:
+        term = (snapshot.semesters[-1].term, snapshot.semesters[-1].year)
+        for _ in range(result.terms - len(snapshot.semesters)):
+            term = next_term(*term)
+    return result._replace(graduation_term=term)
@@ -1,29 +1,5 @@
 import streamlit as st
-from controllers.students import get_all_students
-from controllers.advisors import get_all_advisors
-from controllers.admins import get_all_admins
-
-# Fetch all users from the database
-s_usernames = []
-s_passwords = []
-students = get_all_students()
-for row in students:
-    s_usernames.append(row['username'])
-    s_passwords.append(row['password'])
-
-a_usernames = []
-a_passwords = []
-advisors = get_all_advisors()
-for row in advisors:
-    a_usernames.append(row['username'])
-    a_passwords.append(row['password'])
-
-admin_usernames = []
-admin_passwords = []
-admins = get_all_admins()
-for row in admins:
-    admin_usernames.append(row['username'])
-    admin_passwords.append(row['password'])
+from auth_service import authenticate, HOME_PAGES
 
 # Initialize session state variables
 if "username" not in st.session_state:
@@ -74,54 +50,16 @@ if not st.session_state.username or not st.session_state.user_role:
     st.session_state.username = username  # Update session state
     password = st.text_input("Password", type="password")
 
-    if st.button("Login"):
-        username_index = -1
-        user_defined = False
-        
-        # Check if username is in student list
-        try:
-            username_index = s_usernames.index(username)
-        except ValueError:
-            pass
-            
-        if username_index != -1:  # if username is in student username list
-            user_defined = True
-            if s_passwords[username_index] == password:
-                st.session_state.user_role = "student"  # Set the user role in session state
-                st.switch_page("pages/student.py")
-            else:
-                st.error("Credentials do not match. Please try again.")
-        
-        else:  # check username in advisor username list
-            try:
-                username_index = a_usernames.index(username)
-            except ValueError:
-                pass
-
-        if not user_defined and username_index != -1:  # if username is in advisor username list
-            user_defined = True
-            if a_passwords[username_index] == password:
-                st.session_state.user_role = "advisor"  # Set the user role in session state
-                st.switch_page("pages/advisor.py")
-            else:
-                st.error("Credentials do not match. Please try again.")
-        
-        else:  # check username in admin username list
-            try:
-                username_index = admin_usernames.index(username)
-            except ValueError:
-                pass
-
-        if not user_defined and username_index != -1:  # if username is in admin username list
-            if admin_passwords[username_index] == password:
-                st.session_state.user_role = "admin"  # Set the user role in session state
-                st.switch_page("pages/admin.py")
-            else:
-                st.error("Credentials do not match. Please try again.")
-        
-        # If we get here and user is still not defined, username doesn't exist
-        if not user_defined and username:
-            st.error("Username not found. Please try again.")
+    if st.button("Login") and username:
+        # One indexed lookup per attempt; nothing is loaded until the button is pressed
+        result = authenticate(username, password)
+        if result["success"]:
+            # Remember who logged in so pages don't have to look the user up again
+            st.session_state.user_role = result["identity"].role
+            st.session_state.user_id = result["identity"].id
+            st.switch_page(HOME_PAGES[result["identity"].role])
+        else:
+            st.error(result["message"])
 
 st.markdown("""
     <hr>
@@ -7,6 +7,8 @@ from controllers.semesters import add_semester, update_semester, delete_semester
 from controllers.plans import update_plan, delete_plan
 from controllers.prerequisites import add_prereq, update_prereq, delete_prereq
 from controllers.majors import add_major, update_major, delete_major
+import revalidation
+import prereq_analysis
 from auth_utils import protect_page
 
 # Hide the default page navigation
@@ -284,6 +286,16 @@ with tab_manage:
         result = config["functions"](**form_data)
         if result["success"]:
             st.success(result["message"])
+            if controller == "Prerequisites":
+                # Plans scheduling this course may no longer meet its prerequisites
+                revalidation.start_revalidation([(form_data["parent_subject"], form_data["parent_number"])])
+                st.info("Re-checking affected plans in the background.")
+                analysis = prereq_analysis.get_analysis()
+                for cycle in analysis.cycles:
+                    st.warning("Courses in a prerequisite cycle: " + ", ".join(f"{subject} {number}" for subject, number in cycle))
+                if analysis.untakeable:
+                    st.warning(f"{len(analysis.untakeable)} courses can never be taken: " +
+                               ", ".join(f"{subject} {number}" for subject, number in analysis.untakeable))
         else:
             st.error(result["message"])
 
@@ -341,6 +353,17 @@ with tab_view:
                 st.dataframe(prerequisites)
             else:
                 st.info("No prerequisites found in the database.")
+            status = revalidation.get_status()
+            if status["running"]:
+                st.progress(status["done"] / status["total"] if status["total"] else 0.0,
+                            text=f"Re-checking plans: {status['done']}/{status['total']} "
+                                 f"({status['plans_per_second']:.0f} plans/s)")
+            elif status["last"]:
+                last = status["last"]
+                st.caption(f"Last re-check: {last['plans']} plans, {last['violations']} violations, "
+                           f"{last['plans_per_second']:.0f} plans/s")
+            if status["error"]:
+                st.error(f"Re-check failed: {status['error']}")
         elif controller == "Majors":
             from controllers.majors import get_all_majors
             data = get_all_majors()
@@ -1,12 +1,12 @@
 import streamlit as st
-import controllers.students as c_student
-import controllers.advisors as c_advisor
+import pandas as pd
 import controllers.plans as c_plan
-import controllers.majors as c_major
-import controllers.semesters as c_semester
-import controllers.courses as c_course
+import catalog
+import reads
 import controllers.notes as c_notes
-from app_utils import display_plan, get_available_courses, add_course_to_semester, get_db_connection, remove_from_semester
+import requirements
+import whatif
+from app_utils import display_plan, get_eligibility_matrix, group_courses_by_section, add_course_to_semester, remove_from_semester
 from auth_utils import protect_page
 
 # Hide the default page navigation
@@ -60,9 +60,20 @@ st.markdown('</div>', unsafe_allow_html=True)
 # If we got past the protection, the user is an advisor and logged in
 username = st.session_state.username
 st.write(f"Welcome, {username}!\n")
-adv_id = c_advisor.get_advisor_user(st.session_state.username)['id']
-students = c_student.get_students(adv_id)
+adv_id = st.session_state.user_id  # set at login
+students = reads.get_students(adv_id)
 student_names = [f"{s['f_name']} {s['l_name']}" for s in students]
+
+# Plans broken by prerequisite changes, as found by the revalidation job
+violations = c_plan.get_advisor_violations(adv_id)
+if violations:
+    names_by_id = {s['ID']: f"{s['f_name']} {s['l_name']}" for s in students}
+    with st.expander(f"⚠️ {len(violations)} scheduled courses with unmet prerequisites"):
+        for v in violations:
+            st.write(f"• {names_by_id.get(v['student_id'], v['student_id'])} - {v['plan_name']}: "
+                     f"{v['course_subject']} {v['course_number']} ({v['term']} {v['year']}) needs {v['missing']}")
+        st.caption(f"Last checked {max(v['checked_at'] for v in violations)}")
+
 selected_student = st.selectbox("Select a student", student_names)
 
 # Initialize session state variables for suggestions
@@ -72,19 +83,19 @@ for key in ["suggesting_plan", "suggestion_name", "current_suggestion_id", "orig
 
 # Find selected student's data
 student = next((s for s in students if f"{s['f_name']} {s['l_name']}" == selected_student), None)
-advisor = c_advisor.get_advisor(adv_id)
+advisor = reads.get_advisor(adv_id)
 
 if student:
     st.markdown(f"### 📘 Student Profile: {student['f_name']} {student['l_name']}")
     st.write(f"**Student ID:** {student['ID']}")
-    st.write(f"**Major:** {c_major.get_major(student['major_id'])['name'] if student['major_id'] else 'Not set'}")
+    st.write(f"**Major:** {catalog.get_major(student['major_id'])['name'] if student['major_id'] else 'Not set'}")
     st.write(f"**Graduation Date:** {student['Graduation_Date'] or 'Not set'}")
 
     tab1, tab2, tab3 = st.tabs(["📑 View Plans", "🔄 Create Suggestion", "📝 Feedback"])
 
     with tab1:
         # Get all plans for the student
-        plans = c_plan.get_plans("student", student['ID'])
+        plans = reads.get_plans("student", student['ID'])
         
         if not plans:
             st.info(f"{student['f_name']} doesn't have any plans yet.")
@@ -93,19 +104,41 @@ if student:
             selected_plan = st.selectbox("Select a plan to view", options=plan_names)
             
             if selected_plan:
-                plan = c_plan.get_plan(selected_plan, "student", student['ID'])
+                plan = reads.get_plan(selected_plan, "student", student['ID'])
                 # Add button to create suggestion based on this plan
                 if st.button("Create Suggestion Based on This Plan"):
                     st.session_state.suggesting_plan = True
                     st.session_state.original_plan_id = plan['id']
                     st.rerun()
                 display_plan(plan['id'])
+
+                # How the plan's courses would count under other concentrations, without copying it
+                with st.expander("🔀 What if: compare concentrations"):
+                    majors = catalog.get_all_majors()
+                    major_names = [major['name'] for major in majors]
+                    major_ids = [major['id'] for major in majors]
+                    what_if_major = st.selectbox("Major", options=major_names, key=f"what_if_major_{plan['id']}",
+                                                 index=major_ids.index(plan['major_id']) if plan['major_id'] in major_ids else 0)
+                    comparison = whatif.compare_concentrations(plan['id'], catalog.get_major_id(what_if_major))
+                    if comparison:
+                        st.table(pd.DataFrame(
+                            [[name + (" (current)" if result.major_id == plan['major_id']
+                                      and result.concentration_id == plan['concentration_id'] else ""),
+                              f"{len(result.satisfied)}/{len(result.sections)}",
+                              f"{result.credits}/{result.credits_required}",
+                              ", ".join(f"{progress.section.name} ({requirements.describe_missing(progress)})"
+                                        for progress in result.outstanding) or "None"]
+                             for name, result in comparison],
+                            columns=["Concentration", "Sections Met", "Credits Counted", "Outstanding"]
+                        ))
+                    else:
+                        st.info("This major has no concentrations to compare.")
     
     with tab2:
         # Check if we are in suggestion mode
         if st.session_state.suggesting_plan and st.session_state.original_plan_id:
             # Get the original plan details
-            original_plan = c_plan.get_plan_from_id(st.session_state.original_plan_id)
+            original_plan = reads.get_plan_from_id(st.session_state.original_plan_id)
             
             if not original_plan:
                 st.error("Original plan not found. Please try again.")
@@ -124,55 +157,22 @@ if student:
             # Create the suggestion if not already created
             if "current_suggestion_id" not in st.session_state or not st.session_state.current_suggestion_id:
                 if st.button("Create Suggestion Copy"):
-                    semesters = c_semester.get_semesters(original_plan['id'])
-                    first_semester = semesters[0] if semesters else None
-                    first_semester = f"{first_semester['term']} {first_semester['year']}"
-                    # Create a new plan with the same properties but marked as a suggestion
-                    suggestion_created = c_plan.create_plan(
-                        student['ID'], 
-                        adv_id,
-                        suggestion_name, 
-                        original_plan['major_id'], 
-                        original_plan['concentration_id'], 
-                        first_semester,
-                        is_suggestion=1,
-                        original_plan_id=original_plan['id']
+                    # Copy the plan, its semesters and courses in one transaction
+                    suggestion_id = c_plan.clone_plan(
+                        original_plan['id'],
+                        as_suggestion_by=adv_id,
+                        name=suggestion_name
                     )
                     
-                    if suggestion_created:
-                        suggestion_plan = c_plan.get_plan(suggestion_name, "student", student['ID'])
-                        
-                        if suggestion_plan:
-                            st.session_state.current_suggestion_id = suggestion_plan['id']
-                            
-                            # Copy all semesters from original plan
-                            original_semesters = c_semester.get_semesters(original_plan['id'])
-                            
-                            for orig_semester in original_semesters:
-                                new_semester = c_semester.get_semester(orig_semester['term'], orig_semester['year'])
-                                
-                                # Link semester to suggestion plan
-                                c_semester.insert_to_plan(suggestion_plan['id'], new_semester['id'])
-                                
-                                # Copy courses from original semester to new semester
-                                courses = c_course.get_semester_courses(orig_semester['id'], original_plan['id'])
-                                for course in courses:
-                                    add_course_to_semester(
-                                        suggestion_plan['id'], 
-                                        new_semester['id'], 
-                                        course['subject'], 
-                                        course['number']
-                                    )
-                            
-                            st.success(f"Suggestion plan '{suggestion_name}' created successfully!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to retrieve the created suggestion.")
+                    if suggestion_id:
+                        st.session_state.current_suggestion_id = suggestion_id
+                        st.success(f"Suggestion plan '{suggestion_name}' created successfully!")
+                        st.rerun()
                     else:
                         st.error("Failed to create the suggestion plan. Please try again.")
             else:
                 # We're now editing an existing suggestion
-                suggestion_plan = c_plan.get_plan_from_id(st.session_state.current_suggestion_id)
+                suggestion_plan = reads.get_plan_from_id(st.session_state.current_suggestion_id)
                 
                 if not suggestion_plan:
                     st.error("Suggestion plan not found. Please try again.")
@@ -199,11 +199,14 @@ if student:
                         st.rerun()
 
                 # Get semesters in the suggestion plan
-                semesters = c_semester.get_semesters(suggestion_plan['id'])
+                semesters = reads.get_semesters(suggestion_plan['id'])
                 
                 if not semesters:
                     st.warning("No semesters in this suggestion plan.")
                 else:
+                    # Which courses can be added to each semester, computed once for the whole plan
+                    availability = get_eligibility_matrix(suggestion_plan['id'], suggestion_plan['major_id'])
+                    
                     # For each semester, allow adding/removing courses
                     for semester in semesters:
                         semester_id = semester['id']
@@ -211,7 +214,7 @@ if student:
                         
                         with st.expander(f"Edit {semester_name}"):
                             # Display current courses in this semester
-                            courses = c_course.get_semester_courses(semester_id, suggestion_plan['id'])
+                            courses = reads.get_semester_courses(semester_id, suggestion_plan['id'])
                             if courses:
                                 st.write("Current Courses:")
                                 for course in courses:
@@ -222,9 +225,12 @@ if student:
                                         # Add remove button for each course
                                         if st.button("Remove", key=f"remove_{semester_id}_{course['subject']}_{course['number']}"):
                                             # Remove the course from the semester
-                                            remove_from_semester(suggestion_plan['id'], semester_id, course['subject'], course['number'])
-                                            st.success(f"Removed {course['subject']} {course['number']} from {semester_name}")
-                                            st.rerun()
+                                            result = remove_from_semester(suggestion_plan['id'], semester_id, course['subject'], course['number'])
+                                            if result["success"]:
+                                                st.success(f"Removed {course['subject']} {course['number']} from {semester_name}")
+                                                st.rerun()
+                                            else:
+                                                st.error(result["message"])
                             else:
                                 st.write("No courses in this semester yet.")
                             
@@ -232,123 +238,20 @@ if student:
                             st.subheader("Add Courses")
                             
                             # Get all available courses for this semester
-                            all_available = get_available_courses(suggestion_plan['id'], semester_id, suggestion_plan['major_id'])
-                            
-                            # Create dictionaries to store section information
-                            major_sections_info = {}
-                            concentration_sections_info = {}
-                            gen_ed_sections_info = {}
-                            
-                            # Initialize dictionaries to hold courses by section
-                            major_courses = {}
-                            concentration_courses = {}
-                            gen_ed_courses = {}
+                            all_available = availability.get(semester_id, [])
                             
-                            # Get section information from the database
-                            con = get_db_connection()
-                            try:
-                                # Get major section information
-                                major_section_query = """
-                                    SELECT id, section FROM Major_Sections 
-                                    WHERE major_id = ?
-                                """
-                                for row in con.execute(major_section_query, (suggestion_plan['major_id'],)).fetchall():
-                                    section_id, section_name = row
-                                    major_sections_info[section_id] = section_name
-                                    major_courses[section_name] = []
-                                
-                                # Get concentration section information if this plan has a concentration
-                                if suggestion_plan['concentration_id']:
-                                    concentration_section_query = """
-                                        SELECT id, section FROM Concentration_Sections 
-                                        WHERE concentration_id = ?
-                                    """
-                                    for row in con.execute(concentration_section_query, (suggestion_plan['concentration_id'],)).fetchall():
-                                        section_id, section_name = row
-                                        concentration_sections_info[section_id] = section_name
-                                        concentration_courses[section_name] = []
-                                
-                                # Get gen ed section information
-                                gen_ed_section_query = """
-                                    SELECT id, section FROM Gen_Ed_Sections
-                                """
-                                for row in con.execute(gen_ed_section_query).fetchall():
-                                    section_id, section_name = row
-                                    gen_ed_sections_info[section_id] = section_name
-                                    gen_ed_courses[section_name] = []
-                                
-                                # Categorize all available courses
-                                for course in all_available:
-                                    course_subject = course['subject']
-                                    course_number = int(course['number'])
-                                    section_name = course['section']
-                                    
-                                    # Check if this is a major course requirement
-                                    major_section_query = """
-                                        SELECT ms.id, ms.section
-                                        FROM Major_Sections ms
-                                        JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
-                                        WHERE ms.major_id = ? AND msr.course_subject = ? AND msr.course_number = ?
-                                    """
-                                    major_section = con.execute(major_section_query, 
-                                                            (suggestion_plan['major_id'], course_subject, course_number)).fetchone()
-                                    
-                                    if major_section:
-                                        section_id, name = major_section
-                                        if name not in major_courses:
-                                            major_courses[name] = []
-                                        major_courses[name].append(course)
-                                        continue
-                                    
-                                    # Check if this is a concentration course requirement
-                                    if suggestion_plan['concentration_id']:
-                                        conc_section_query = """
-                                            SELECT cs.id, cs.section
-                                            FROM Concentration_Sections cs
-                                            JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
-                                            WHERE cs.concentration_id = ? AND csr.course_subject = ? AND csr.course_number = ?
-                                        """
-                                        conc_section = con.execute(conc_section_query, 
-                                                                (suggestion_plan['concentration_id'], course_subject, course_number)).fetchone()
-                                        
-                                        if conc_section:
-                                            section_id, name = conc_section
-                                            if name not in concentration_courses:
-                                                concentration_courses[name] = []
-                                            concentration_courses[name].append(course)
-                                            continue
-                                    
-                                    # Check if this is a gen ed course requirement
-                                    gen_ed_query = """
-                                        SELECT ges.id, ges.section
-                                        FROM Gen_Ed_Sections ges
-                                        JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
-                                        WHERE ger.course_subject = ? AND ger.course_number = ?
-                                    """
-                                    gen_ed_section = con.execute(gen_ed_query, 
-                                                            (course_subject, course_number)).fetchone()
-                                    
-                                    if gen_ed_section:
-                                        section_id, name = gen_ed_section
-                                        if name not in gen_ed_courses:
-                                            gen_ed_courses[name] = []
-                                        gen_ed_courses[name].append(course)
-                                        continue
-                                    
-                                    # If we can't categorize the course, add to "Other Courses"
-                                    if "Other Courses" not in gen_ed_courses:
-                                        gen_ed_courses["Other Courses"] = []
-                                    gen_ed_courses["Other Courses"].append(course)
-                                    
-                            finally:
-                                con.close()
+                            # Group them by requirement section (a cached course-to-section lookup)
+                            grouped = group_courses_by_section(all_available, suggestion_plan['major_id'], suggestion_plan['concentration_id'])
+                            major_courses = grouped['major']
+                            concentration_courses = grouped['concentration']
+                            gen_ed_courses = grouped['gen_ed']
                             
                             # Create tabs for different course types
                             course_tabs = st.tabs(["Major Courses", "Concentration Courses", "Gen Ed Courses"])
                             
                             with course_tabs[0]:  # Major Courses
-                                for section_name in major_sections_info.values():
-                                    courses = major_courses.get(section_name, [])
+                                for section_name in major_courses:
+                                    courses = major_courses[section_name]
                                     
                                     # Display section header
                                     st.subheader(section_name)
@@ -383,8 +286,8 @@ if student:
                                 if not suggestion_plan['concentration_id']:
                                     st.info("This plan does not have a concentration")
                                 else:
-                                    for section_name in concentration_sections_info.values():
-                                        courses = concentration_courses.get(section_name, [])
+                                    for section_name in concentration_courses:
+                                        courses = concentration_courses[section_name]
                                         st.subheader(section_name)
                         
                                         if not courses:
@@ -413,8 +316,8 @@ if student:
                                                 st.error(result["message"])
                             
                             with course_tabs[2]:  # Gen Ed Courses
-                                for section_name in gen_ed_sections_info.values():
-                                    courses = gen_ed_courses.get(section_name, [])
+                                for section_name in gen_ed_courses:
+                                    courses = gen_ed_courses[section_name]
                                     st.subheader(section_name)
                                     
                                     if not courses:
@@ -471,7 +374,7 @@ if student:
         st.subheader("Student Communication")
         
         # First, get all plans for the selected student
-        plans = c_plan.get_plans("student", student['ID'])
+        plans = reads.get_plans("student", student['ID'])
         
         if not plans:
             st.info(f"{student['f_name']} doesn't have any plans yet.")
@@ -481,14 +384,14 @@ if student:
             selected_plan_name = st.selectbox("Select a plan for communication", options=plan_names)
             
             if selected_plan_name:
-                selected_plan = c_plan.get_plan(selected_plan_name, "student", student['ID'])
+                selected_plan = reads.get_plan(selected_plan_name, "student", student['ID'])
                 
                 # Display existing notes/feedback for this plan
                 st.subheader(f"Communication History for '{selected_plan_name}'")
                 
                 # Get both advisor and student notes for this plan
-                advisor_notes = c_notes.get_advisor_notes(adv_id, selected_plan['id'])
-                student_notes = c_notes.get_student_notes(student['ID'], selected_plan['id'])
+                advisor_notes = reads.get_advisor_notes(adv_id, selected_plan['id'])
+                student_notes = reads.get_student_notes(student['ID'], selected_plan['id'])
                 
                 # Combine notes and sort by timestamp (most recent first)
                 all_notes = []
@@ -1,12 +1,10 @@
 import streamlit as st
-import controllers.students as c_student
-import controllers.majors as c_major
-import controllers.concentration as c_concentration
-import controllers.advisors as c_advisor
+import catalog
+import reads
 import controllers.plans as c_plan
 import controllers.semesters as c_semester
-import controllers.courses as c_course
 import controllers.notes as c_notes
+import scheduler
 from app_utils import *
 from auth_utils import protect_page
 
@@ -69,27 +67,32 @@ for key in ["plan_name", "major", "start_term", "current_plan_id", "editing_plan
     if key not in st.session_state:
         st.session_state[key] = "" if key != "editing_plan" else False
 
-student = c_student.get_student("username", username)
+# Look the student up by the id stored at login on every rerun (a cached read
+# that student writes invalidate), so profile changes show up without logging out
+student = reads.get_student("id", st.session_state.user_id)
 
 # Create tabs for different functionalities
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["Create New Plan", "View Existing Plans", "Edit Plan", "Review Suggestions", "Communicate with Advisor"])
 
 with tab1:
+    # Result of filling the last created plan, kept across the rerun below
+    if "generated_plan_message" in st.session_state:
+        st.info(st.session_state.pop("generated_plan_message"))
     st.write("Let's create a new plan!")
     st.session_state.plan_name = st.text_input("Plan Name", value=st.session_state.plan_name)
     
-    majors = c_major.get_all_majors()
+    majors = catalog.get_all_majors()
     major_options = [major['name'] for major in majors]
     selected_major = st.selectbox("Select Major", options=major_options)
-    major_id = c_major.get_major_id(selected_major)
+    major_id = catalog.get_major_id(selected_major)
     st.session_state.major = selected_major
 
     # Handle concentration selection
-    concentrations = c_concentration.get_concentrations_by_major(major_id)
+    concentrations = catalog.get_concentrations_by_major(major_id)
     if concentrations:
         concentration_options = [concentration['name'] for concentration in concentrations]
         selected_concentration = st.selectbox("Select Concentration", options=concentration_options)
-        concentration_id = c_concentration.get_concentration_id(selected_concentration)
+        concentration_id = catalog.get_concentration_id(selected_concentration)
         st.session_state.concentration = selected_concentration
     else:
         st.session_state.concentration = None
@@ -106,18 +109,19 @@ with tab1:
 
     # Number of semesters
     num_semesters = st.slider("Number of Semesters", min_value=1, max_value=12, value=8)
+    fill_plan = st.checkbox("Fill the semesters from my degree requirements")
 
     if st.button('Create Plan'):
         if st.session_state.plan_name and st.session_state.major and st.session_state.start_term:
             # Check if student already has plan with said name
-            existing_plan = c_plan.get_plan(st.session_state.plan_name, "student", student['ID'])
+            existing_plan = reads.get_plan(st.session_state.plan_name, "student", student['ID'])
             if existing_plan:
                 st.error("A plan with this name already exists. Please choose a different name.")
             else:
                 plan_created = c_plan.create_plan(student['ID'], student['advisor_ID'], st.session_state.plan_name, major_id, concentration_id, st.session_state.start_term)
                 if plan_created:
                     st.success(f"Plan '{st.session_state.plan_name}' created successfully!")
-                    plan = c_plan.get_plan(st.session_state.plan_name, "student", student['ID'])
+                    plan = reads.get_plan(st.session_state.plan_name, "student", student['ID'])
                     
                     # Generate semesters automatically
                     if plan:
@@ -137,6 +141,10 @@ with tab1:
                                 current_year += 1
                             else:
                                 current_term = "Fall"
+
+                        if fill_plan:
+                            result = scheduler.generate_plan(plan['id'])
+                            st.session_state.generated_plan_message = result["message"]
                         
                         # Set this as the current plan for editing
                         st.session_state.current_plan_id = plan['id']
@@ -148,7 +156,7 @@ with tab1:
             st.error(f"Please fill in all fields.")
             
 with tab2:
-    plans = c_plan.get_plans("student", student['ID'])
+    plans = reads.get_plans("student", student['ID'])
     
     if not plans:
         st.info("You don't have any plans yet. Create one in the 'Create New Plan' tab.")
@@ -158,12 +166,12 @@ with tab2:
         selected_plan = st.selectbox("Select a plan to view", options=plan_names, index=0)
         
         if selected_plan != 'Select a plan...':
-            plan = c_plan.get_plan(selected_plan, "student", student['ID'])
+            plan = reads.get_plan(selected_plan, "student", student['ID'])
             # Display the plan details
             display_plan(plan['id'])
 
 with tab3:
-    plans = c_plan.get_plans("student", student['ID'])
+    plans = reads.get_plans("student", student['ID'])
     
     if not plans:
         st.info("You don't have any plans yet. Create one in the 'Create New Plan' tab.")
@@ -173,23 +181,26 @@ with tab3:
         selected_plan = st.selectbox("Select a plan to edit", options=plan_names, index=0)
         
         if selected_plan != 'Select a plan...':
-            plan = c_plan.get_plan(selected_plan, "student", student['ID'])
+            plan = reads.get_plan(selected_plan, "student", student['ID'])
             st.subheader(f"Editing Plan: {plan['name']}")
             
             # Get plan details
-            major = c_major.get_major(plan['major_id'])
+            major = catalog.get_major(plan['major_id'])
             st.write(f"Major: {major['name']}")
             
             if plan['concentration_id']:
-                concentration = c_concentration.get_concentration(plan['concentration_id'])
+                concentration = catalog.get_concentration(plan['concentration_id'])
                 st.write(f"Concentration: {concentration['name']}")
             
             # Get semesters in the plan
-            semesters = c_semester.get_semesters(plan['id'])
+            semesters = reads.get_semesters(plan['id'])
             
             if not semesters:
                 st.warning("No semesters in this plan. You may need to recreate the plan.")
             else:
+                # Which courses can be added to each semester, computed once for the whole plan
+                availability = get_eligibility_matrix(plan['id'], plan['major_id'])
+                
                 # For each semester, allow adding courses
                 for semester in semesters:
                     semester_id = semester['id']
@@ -197,7 +208,7 @@ with tab3:
                     
                     with st.expander(f"Edit {semester_name}"):
                         # Display current courses in this semester
-                        courses = c_course.get_semester_courses(semester_id, plan['id'])
+                        courses = reads.get_semester_courses(semester_id, plan['id'])
                         if courses:
                             st.write("Current Courses:")
                             for course in courses:
@@ -208,9 +219,12 @@ with tab3:
                                     # Add remove button for each course
                                     if st.button("Remove", key=f"remove_{semester_id}_{course['subject']}_{course['number']}"):
                                         # Remove the course from the semester
-                                        remove_from_semester(plan['id'], semester_id, course['subject'], course['number'])
-                                        st.success(f"Removed {course['subject']} {course['number']} from {semester_name}")
-                                        st.rerun()
+                                        result = remove_from_semester(plan['id'], semester_id, course['subject'], course['number'])
+                                        if result["success"]:
+                                            st.success(f"Removed {course['subject']} {course['number']} from {semester_name}")
+                                            st.rerun()
+                                        else:
+                                            st.error(result["message"])
                         else:
                             st.write("No courses in this semester yet.")
                         
@@ -218,123 +232,20 @@ with tab3:
                         st.subheader("Add Courses")
                         
                         # Get all available courses for this semester
-                        all_available = get_available_courses(plan['id'], semester_id, plan['major_id'])
-                        
-                        # Create dictionaries to store section information
-                        major_sections_info = {}
-                        concentration_sections_info = {}
-                        gen_ed_sections_info = {}
-                        
-                        # Initialize dictionaries to hold courses by section
-                        major_courses = {}
-                        concentration_courses = {}
-                        gen_ed_courses = {}
+                        all_available = availability.get(semester_id, [])
                         
-                        # Get section information from the database
-                        con = get_db_connection()
-                        try:
-                            # Get major section information
-                            major_section_query = """
-                                SELECT id, section FROM Major_Sections 
-                                WHERE major_id = ?
-                            """
-                            for row in con.execute(major_section_query, (plan['major_id'],)).fetchall():
-                                section_id, section_name = row
-                                major_sections_info[section_id] = section_name
-                                major_courses[section_name] = []
-                            
-                            # Get concentration section information if this plan has a concentration
-                            if plan['concentration_id']:
-                                concentration_section_query = """
-                                    SELECT id, section FROM Concentration_Sections 
-                                    WHERE concentration_id = ?
-                                """
-                                for row in con.execute(concentration_section_query, (plan['concentration_id'],)).fetchall():
-                                    section_id, section_name = row
-                                    concentration_sections_info[section_id] = section_name
-                                    concentration_courses[section_name] = []
-                            
-                            # Get gen ed section information
-                            gen_ed_section_query = """
-                                SELECT id, section FROM Gen_Ed_Sections
-                            """
-                            for row in con.execute(gen_ed_section_query).fetchall():
-                                section_id, section_name = row
-                                gen_ed_sections_info[section_id] = section_name
-                                gen_ed_courses[section_name] = []
-                            
-                            # Categorize all available courses
-                            for course in all_available:
-                                course_subject = course['subject']
-                                course_number = int(course['number'])
-                                section_name = course['section']
-                                
-                                # Check if this is a major course requirement
-                                major_section_query = """
-                                    SELECT ms.id, ms.section
-                                    FROM Major_Sections ms
-                                    JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
-                                    WHERE ms.major_id = ? AND msr.course_subject = ? AND msr.course_number = ?
-                                """
-                                major_section = con.execute(major_section_query, 
-                                                        (plan['major_id'], course_subject, course_number)).fetchone()
-                                
-                                if major_section:
-                                    section_id, name = major_section
-                                    if name not in major_courses:
-                                        major_courses[name] = []
-                                    major_courses[name].append(course)
-                                    continue
-                                
-                                # Check if this is a concentration course requirement
-                                if plan['concentration_id']:
-                                    conc_section_query = """
-                                        SELECT cs.id, cs.section
-                                        FROM Concentration_Sections cs
-                                        JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
-                                        WHERE cs.concentration_id = ? AND csr.course_subject = ? AND csr.course_number = ?
-                                    """
-                                    conc_section = con.execute(conc_section_query, 
-                                                            (plan['concentration_id'], course_subject, course_number)).fetchone()
-                                    
-                                    if conc_section:
-                                        section_id, name = conc_section
-                                        if name not in concentration_courses:
-                                            concentration_courses[name] = []
-                                        concentration_courses[name].append(course)
-                                        continue
-                                
-                                # Check if this is a gen ed course requirement
-                                gen_ed_query = """
-                                    SELECT ges.id, ges.section
-                                    FROM Gen_Ed_Sections ges
-                                    JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
-                                    WHERE ger.course_subject = ? AND ger.course_number = ?
-                                """
-                                gen_ed_section = con.execute(gen_ed_query, 
-                                                        (course_subject, course_number)).fetchone()
-                                
-                                if gen_ed_section:
-                                    section_id, name = gen_ed_section
-                                    if name not in gen_ed_courses:
-                                        gen_ed_courses[name] = []
-                                    gen_ed_courses[name].append(course)
-                                    continue
-                                
-                                # If we can't categorize the course, add to "Other Courses"
-                                if "Other Courses" not in gen_ed_courses:
-                                    gen_ed_courses["Other Courses"] = []
-                                gen_ed_courses["Other Courses"].append(course)
-                                
-                        finally:
-                            con.close()
+                        # Group them by requirement section (a cached course-to-section lookup)
+                        grouped = group_courses_by_section(all_available, plan['major_id'], plan['concentration_id'])
+                        major_courses = grouped['major']
+                        concentration_courses = grouped['concentration']
+                        gen_ed_courses = grouped['gen_ed']
                         
                         # Create tabs for different course types
                         course_tabs = st.tabs(["Major Courses", "Concentration Courses", "Gen Ed Courses"])
                         
                         with course_tabs[0]:  # Major Courses
-                            for section_name in major_sections_info.values():
-                                courses = major_courses.get(section_name, [])
+                            for section_name in major_courses:
+                                courses = major_courses[section_name]
                                 
                                 # Display section header
                                 st.subheader(section_name)
@@ -370,8 +281,8 @@ with tab3:
                                 st.info("This plan does not have a concentration")
                             else:
                                 # Force display of all concentration sections
-                                for section_name in concentration_sections_info.values():
-                                    courses = concentration_courses.get(section_name, [])
+                                for section_name in concentration_courses:
+                                    courses = concentration_courses[section_name]
                                     
                                     # Display section header
                                     st.subheader(section_name)
@@ -404,8 +315,8 @@ with tab3:
                         
                         with course_tabs[2]:  # Gen Ed Courses
                             # Force display of all gen ed sections
-                            for section_name in gen_ed_sections_info.values():
-                                courses = gen_ed_courses.get(section_name, [])
+                            for section_name in gen_ed_courses:
+                                courses = gen_ed_courses[section_name]
                                 
                                 # Display section header
                                 st.subheader(section_name)
@@ -469,7 +380,7 @@ with tab4:
     st.subheader("Review Plan Suggestions")
     
     # Get all plans for this student
-    all_plans = c_plan.get_plans("student", student['ID'])
+    all_plans = reads.get_plans("student", student['ID'])
     
     # Filter out the original plans (not suggestions)
     original_plans = [p for p in all_plans if not p['is_suggestion']]
@@ -506,7 +417,7 @@ with tab4:
                 display_plan_comparison(selected_plan['id'], suggestion['id'])
             else:
                 # Let user select which suggestion to view
-                suggestion_names = [f"{s['name']} (by {c_advisor.get_advisor(s['advisor_id'])['f_name']} {c_advisor.get_advisor(s['advisor_id'])['l_name']})" for s in suggestions]
+                suggestion_names = [f"{s['name']} (by {reads.get_advisor(s['advisor_id'])['f_name']} {reads.get_advisor(s['advisor_id'])['l_name']})" for s in suggestions]
                 selected_suggestion_idx = st.selectbox(
                     "Select a suggestion to review", 
                     options=range(len(suggestion_names)),
@@ -519,7 +430,7 @@ with tab5:
     st.subheader("Communication with Advisor")
     
     # First, get all plans for the current student
-    plans = c_plan.get_plans("student", student['ID'])
+    plans = reads.get_plans("student", student['ID'])
     
     if not plans:
         st.info("You don't have any plans yet. Create one in the 'Create New Plan' tab.")
@@ -529,18 +440,18 @@ with tab5:
         selected_plan_name = st.selectbox("Select a plan to view communications", options=plan_names, key="comm_plan_select")
         
         if selected_plan_name:
-            selected_plan = c_plan.get_plan(selected_plan_name, "student", student['ID'])
+            selected_plan = reads.get_plan(selected_plan_name, "student", student['ID'])
             
             # Display existing notes/feedback for this plan
             st.subheader(f"Communication History for '{selected_plan_name}'")
             
             # Get both student and advisor notes for this plan
-            student_notes = c_notes.get_student_notes(student['ID'], selected_plan['id'])
+            student_notes = reads.get_student_notes(student['ID'], selected_plan['id'])
             
             # Get advisor ID from the plan
             advisor_id = selected_plan['advisor_id']
-            advisor = c_advisor.get_advisor(advisor_id)
-            advisor_notes = c_notes.get_advisor_notes(advisor_id, selected_plan['id'])
+            advisor = reads.get_advisor(advisor_id)
+            advisor_notes = reads.get_advisor_notes(advisor_id, selected_plan['id'])
             
             # Combine notes and sort by timestamp (most recent first)
             all_notes = []
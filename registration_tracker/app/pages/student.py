@@ -1,11 +1,7 @@
 import streamlit as st
 import pandas as pd
-import controllers.students as c_student
-import controllers.advisors as c_advisor
-import controllers.majors as c_major
-import controllers.plans as c_plan
-import controllers.semesters as c_semester
-import controllers.courses as c_course
+import catalog
+import reads
 from auth_utils import protect_page
 
 # Hide the default page navigation
@@ -59,7 +55,9 @@ with st.sidebar:
 
 # If we got past the protection, the user is a student and logged in
 username = st.session_state.username
-student = c_student.get_student("username", username)
+# Look the student up by the id stored at login on every rerun (a cached read
+# that student writes invalidate), so profile changes show up without logging out
+student = reads.get_student("id", st.session_state.user_id)
 st.title("Student Dashboard")
 st.write(f"Welcome, {student['f_name']} {student['l_name']}!\n")
 
@@ -69,7 +67,7 @@ if student:
         st.subheader("Student Profile")
         st.write(f"**Student ID:** {student['ID']}")
         st.write(f"**Username:** {student['Username']}")
-        major = c_major.get_major(student['major_id'])
+        major = catalog.get_major(student['major_id'])
         st.write(f"**Major:** {major['name']}")
         st.write(f"**Graduation Date:** {student['Graduation_Date'] or 'Not set'}")
         st.write(f"**Advisor ID:** {student['advisor_id']}")
@@ -77,32 +75,24 @@ if student:
     with col2:
         # Get and display the student's plan
         st.write("Default Academic Plan")
-        plan = c_plan.get_first_plan(student['id'])
+        plan = reads.get_first_plan(student['id'])
         
         if plan:
-            st.write(f"**Plan Name:** {plan['name']}")
-            st.write(f"**Advisor:** {c_advisor.get_advisor(plan['advisor_id'])['f_name']} {c_advisor.get_advisor(plan['advisor_id'])['l_name']}")
-
-            # Get all semesters associated with plan
-            semesters = c_semester.get_semesters(plan['id'])
-            
-            # Calculate total credits
-            total_credits = 0
+            # Plan, advisor, semesters and courses in one snapshot
+            snapshot = reads.load_plan_snapshot(plan['id'])
+            st.write(f"**Plan Name:** {snapshot.name}")
+            st.write(f"**Advisor:** {snapshot.advisor_name}")
             
             # Display each semester with its courses
-            for semester in semesters:
-                semester_courses = c_course.get_semester_courses(semester['id'], plan['id'])
-                semester_credits = sum(course['credits'] for course in semester_courses)
-                total_credits += semester_credits
-                
-                with st.expander(f"{semester['term']} {semester['year']} ({semester_credits} credits)", expanded=True):
+            for semester in snapshot.semesters:
+                with st.expander(f"{semester.term} {semester.year} ({semester.credits} credits)", expanded=True):
                     # Create a table for courses
                     course_data = []
-                    for course in semester_courses:
+                    for course in semester.courses:
                         course_data.append([
-                            f"{course['subject']} {course['number']}",
-                            course['name'],
-                            course['credits']
+                            f"{course.subject} {course.number}",
+                            course.name,
+                            course.credits
                         ])
                     
                     if course_data:
@@ -113,7 +103,24 @@ if student:
                     else:
                         st.info("No courses registered for this semester.")
             
-            st.metric("Total Credits", total_credits)
+            st.metric("Total Credits", snapshot.total_credits)
+
+            # Soonest finish allowed by the prerequisite chains of what the plan still lacks
+            estimate = reads.get_earliest_graduation(plan['id'])
+            if estimate and estimate.graduation_term:
+                term, year = estimate.graduation_term
+                st.metric("Earliest Graduation", f"{term} {year}",
+                          help="Counts the terms your remaining required courses and their prerequisites need, "
+                               "at most one prerequisite step per term.")
+                if estimate.remaining_terms:
+                    st.write(f"At least {estimate.remaining_terms} more term(s) after your last planned semester "
+                             f"for {estimate.remaining_credits} remaining credits.")
+                if estimate.critical_path:
+                    st.caption("Longest prerequisite chain: " +
+                               " → ".join(f"{subject} {number}" for subject, number in estimate.critical_path))
+                if estimate.unmet:
+                    st.caption("Not included, choose these with your advisor: " +
+                               ", ".join(f"{name} ({credits} credits)" for name, credits in estimate.unmet))
         else:
             st.warning(f"No academic plan found for student {student['ID']}.")
 else:
@@ -0,0 +1,79 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# PBKDF2-HMAC-SHA256 rounds for new hashes; raise it as hardware gets faster
+HASH_ITERATIONS = int(os.environ.get("REG_TRACKER_HASH_ITERATIONS", 240000))
+# Threads that run verifications; hashlib releases the GIL while deriving keys
+VERIFY_WORKERS = int(os.environ.get("REG_TRACKER_VERIFY_WORKERS", os.cpu_count() or 2))
+# Seconds a login waits for its verification before giving up
+VERIFY_TIMEOUT = 30.0
+
+ALGORITHM = "pbkdf2_sha256"
+SALT_BYTES = 16
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, iterations=None):
+    """Salted hash stored as 'pbkdf2_sha256$<iterations>$<salt>$<hash>'."""
+    iterations = iterations or HASH_ITERATIONS
+    salt = secrets.token_bytes(SALT_BYTES)
+    derived = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(derived)}"
+
+
+def is_hashed(stored):
+    return stored.startswith(ALGORITHM + "$")
+
+
+def verify_password(password, stored):
+    """
+    Check a password against a stored value. Values written before hashing was
+    introduced are plaintext and are compared in constant time.
+    """
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        _, iterations, salt, expected = stored.split("$")
+        derived = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"),
+                                      base64.b64decode(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(derived, base64.b64decode(expected))
+
+
+def needs_rehash(stored, iterations=None):
+    """True for plaintext values and hashes made with a different cost."""
+    if not is_hashed(stored):
+        return True
+    return stored.split("$")[1] != str(iterations or HASH_ITERATIONS)
+
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    """Shared worker pool for verifications, created on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="verify")
+        return _executor
+
+
+def verify_password_async(password, stored):
+    """Run verify_password() on the worker pool and return its Future."""
+    return get_executor().submit(verify_password, password, stored)
+
+
+def hash_passwords(passwords, iterations=None):
+    """Hash many passwords on the worker pool, keeping their order."""
+    return list(get_executor().map(lambda password: hash_password(password, iterations), passwords))
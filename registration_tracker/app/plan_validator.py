@@ -0,0 +1,167 @@
+import threading
+from collections import namedtuple
+import controllers.plans as c_plans
+import prereq_graph
+import read_cache
+from cache_utils import TTLCache
+
+# Prerequisite validation for whole plans, kept up to date edit by edit.
+#
+# A PlanValidator knows where every course of one plan is scheduled and which
+# of them currently violate their prerequisites. Adding, removing or moving a
+# course only re-checks that course and the scheduled courses that depend on
+# it (through the graph's reverse index); a prerequisite edit only re-checks
+# courses whose groups changed. validate_all_plans() is the batch version.
+
+# A scheduled course whose prerequisites are not met by earlier semesters.
+# missing: the unmet groups, each a frozenset of (subject, number) alternatives
+Violation = namedtuple("Violation", ["plan_id", "semester_id", "subject", "number", "missing"])
+
+
+def describe_missing(groups):
+    """Readable form of Violation.missing, e.g. 'ITSC 1212; MATH 1103 or MATH 1241'."""
+    return "; ".join(" or ".join(f"{subject} {number}" for subject, number in sorted(group))
+                     for group in groups)
+
+
+class PlanValidator:
+
+    def __init__(self, plan_id, history, graph):
+        """`history` is get_plan_history() output; `graph` a PrerequisiteGraph."""
+        self.plan_id = plan_id
+        self.graph = graph
+        self.order = {semester_id: index for index, (semester_id, _) in enumerate(history)}
+        # course -> {semester_id, ...} it is scheduled in
+        self.scheduled = {}
+        for semester_id, courses in history:
+            for course in courses:
+                self.scheduled.setdefault(prereq_graph.course_key(*course), set()).add(semester_id)
+        # (course, semester_id) -> Violation
+        self.violations = {}
+        self._check(list(self.scheduled))
+
+    def _earliest(self, course):
+        semesters = self.scheduled.get(course)
+        return min(self.order[semester_id] for semester_id in semesters) if semesters else None
+
+    def _check(self, courses):
+        """Re-evaluate every scheduled placement of `courses`."""
+        for course in courses:
+            for key in [key for key in self.violations if key[0] == course]:
+                del self.violations[key]
+            for semester_id in self.scheduled.get(course, ()):
+                position = self.order[semester_id]
+                missing = []
+                for group in self.graph.groups.get(course, ()):
+                    earliest = [self._earliest(alternative) for alternative in group]
+                    if not any(index is not None and index < position for index in earliest):
+                        missing.append(group)
+                if missing:
+                    self.violations[(course, semester_id)] = Violation(
+                        self.plan_id, semester_id, course[0], course[1], tuple(missing))
+
+    def _affected(self, course):
+        # the course itself plus whatever in the plan lists it as a prerequisite
+        return [course] + [dependent for dependent in self.graph.dependents.get(course, ())
+                           if dependent in self.scheduled]
+
+    def add(self, subject, number, semester_id):
+        course = prereq_graph.course_key(subject, number)
+        self.scheduled.setdefault(course, set()).add(semester_id)
+        self._check(self._affected(course))
+        return self.get_violations()
+
+    def remove(self, subject, number, semester_id):
+        course = prereq_graph.course_key(subject, number)
+        semesters = self.scheduled.get(course, set())
+        semesters.discard(semester_id)
+        if not semesters:
+            self.scheduled.pop(course, None)
+        self._check(self._affected(course))
+        return self.get_violations()
+
+    def move(self, subject, number, from_semester_id, to_semester_id):
+        course = prereq_graph.course_key(subject, number)
+        semesters = self.scheduled.setdefault(course, set())
+        semesters.discard(from_semester_id)
+        semesters.add(to_semester_id)
+        self._check(self._affected(course))
+        return self.get_violations()
+
+    def set_graph(self, graph):
+        """Switch to a new prerequisite graph, re-checking only courses whose groups changed."""
+        changed = [course for course in self.scheduled
+                   if graph.groups.get(course, ()) != self.graph.groups.get(course, ())]
+        self.graph = graph
+        self._check(changed)
+        return self.get_violations()
+
+    def validate(self):
+        """Full re-check of every scheduled course."""
+        self.violations = {}
+        self._check(list(self.scheduled))
+        return self.get_violations()
+
+    def get_violations(self):
+        """Violations in plan order."""
+        return sorted(self.violations.values(),
+                      key=lambda violation: (self.order[violation.semester_id], violation.subject, violation.number))
+
+
+# Validators for plans being edited, so consecutive edits stay incremental.
+# Each entry is stamped with the read cache generation of its plan; any other
+# write to the plan (clone, accept, semester changes) makes it reload.
+VALIDATOR_CACHE_SIZE = 256
+
+_validators = TTLCache(maxsize=VALIDATOR_CACHE_SIZE, ttl=read_cache.READ_CACHE_TTL)
+_lock = threading.Lock()
+
+
+def load_validator(plan_id):
+    return PlanValidator(plan_id, c_plans.get_plan_history(plan_id), prereq_graph.get_graph())
+
+
+def get_validator(plan_id):
+    """
+    The validator for a plan's current state. A cached one is reused while the
+    plan is unchanged; after a prerequisite edit only the courses whose
+    prerequisites changed are re-checked.
+    """
+    stamp = read_cache.generation("plan", plan_id)
+    entry = _validators.get(plan_id)
+    if entry is None or entry[0] != stamp:
+        validator = load_validator(plan_id)
+        _validators.set(plan_id, (stamp, validator))
+        return validator
+
+    validator = entry[1]
+    graph = prereq_graph.get_graph()
+    if validator.graph is not graph:
+        with _lock:
+            if validator.graph is not graph:
+                validator.set_graph(graph)
+    return validator
+
+
+def record_edit(plan_id, validator):
+    """
+    Keep a validator that was updated in step with a write to its plan. Call it
+    after the write's read_cache.invalidate() so the entry matches the new state.
+    """
+    _validators.set(plan_id, (read_cache.generation("plan", plan_id), validator))
+
+
+def forget():
+    _validators.clear()
+
+
+def validate_all_plans(plan_ids=None):
+    """
+    Batch check: {plan_id: [Violation]} for the given plans (default: all plans
+    with semesters). Histories are loaded with one query and share one graph.
+    """
+    graph = prereq_graph.get_graph()
+    return {
+        plan_id: PlanValidator(plan_id, history, graph).get_violations()
+        for plan_id, history in c_plans.get_plan_histories(plan_ids).items()
+    }
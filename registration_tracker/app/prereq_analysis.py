@@ -0,0 +1,214 @@
+import threading
+from array import array
+from collections import deque
+import catalog
+import catalog_cache
+import prereq_graph
+
+# Whole-catalog analysis of the prerequisite graph: cycles, courses that can
+# never be taken, transitive closure and depth.
+#
+# Every course gets a bit position; the closure of a course is an int bitset
+# of all its eventual prerequisites (any alternative, any distance), so
+# "is A an eventual prerequisite of B" is a single bit test. Depth is the
+# minimum number of semesters that must come before a course, following the
+# cheapest alternative of each group.
+
+UNREACHABLE = 0xFFFF  # depth of a course that can never be taken
+
+
+class PrerequisiteAnalysis:
+
+    def __init__(self, graph, catalog_courses=None):
+        """
+        `graph` is a PrerequisiteGraph. `catalog_courses`, if given, is the set
+        of (subject, number) in the Courses table; prerequisites outside it are
+        reported in `missing` and can never be satisfied.
+        """
+        self.graph = graph
+        referenced = set(graph.groups) | set(graph.dependents)
+        if catalog_courses is None:
+            self.missing = ()
+            known = referenced
+        else:
+            known = {prereq_graph.course_key(*course) for course in catalog_courses}
+            self.missing = tuple(sorted(referenced - known))
+        self.courses = tuple(sorted(known | referenced))
+        self.index = {course: position for position, course in enumerate(self.courses)}
+
+        # direct[i]: bitset of every alternative in every group of course i
+        self.direct = [0] * len(self.courses)
+        for course, groups in graph.groups.items():
+            mask = 0
+            for group in groups:
+                for alternative in group:
+                    mask |= 1 << self.index[alternative]
+            self.direct[self.index[course]] = mask
+
+        self.closure = [0] * len(self.courses)
+        self.cycles = self._compute_closure()
+        self.depth = self._compute_depth(set(self.missing))
+        self.untakeable = tuple(course for course in self.courses
+                                if self.depth[self.index[course]] == UNREACHABLE)
+
+    def _edges(self, position):
+        mask = self.direct[position]
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _compute_closure(self):
+        """
+        Tarjan's strongly connected components (iterative), which emits each
+        component after every component it depends on, so closures can be built
+        in the same pass. Returns the cycles as tuples of courses.
+        """
+        count = len(self.courses)
+        order = [None] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack = []
+        cycles = []
+        counter = 0
+
+        for root in range(count):
+            if order[root] is not None:
+                continue
+            work = [(root, self._edges(root))]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                node, edges = work[-1]
+                for target in edges:
+                    if order[target] is None:
+                        order[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, self._edges(target)))
+                        break
+                    if on_stack[target]:
+                        low[node] = min(low[node], order[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == order[node]:
+                        members = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            members.append(member)
+                            if member == node:
+                                break
+                        self._close_component(members, cycles)
+        return tuple(cycles)
+
+    def _close_component(self, members, cycles):
+        component = 0
+        for member in members:
+            component |= 1 << member
+        reach = 0
+        for member in members:
+            for target in self._edges(member):
+                reach |= (1 << target) | self.closure[target]
+        cyclic = len(members) > 1 or self.direct[members[0]] & component
+        if cyclic:
+            # every member is an eventual prerequisite of every member, itself included
+            reach |= component
+            cycles.append(tuple(sorted(self.courses[member] for member in members)))
+        else:
+            reach &= ~component
+        for member in members:
+            self.closure[member] = reach
+
+    def _compute_depth(self, missing):
+        """
+        depth(c) = 0 without prerequisites, else 1 + max over groups of the
+        smallest depth among the group's alternatives. Courses are settled in
+        non-decreasing depth order, so a group's first settled alternative is its
+        cheapest and a course's last satisfied group is its deepest.
+        """
+        depth = array("H", [UNREACHABLE] * len(self.courses))
+        remaining = [0] * len(self.courses)
+        # alternative -> [(course, group number)]
+        occurrences = {}
+        for course, groups in self.graph.groups.items():
+            position = self.index[course]
+            remaining[position] = len(groups)
+            for number, group in enumerate(groups):
+                for alternative in group:
+                    occurrences.setdefault(self.index[alternative], []).append((position, number))
+
+        satisfied = set()
+        queue = deque()
+        for position, course in enumerate(self.courses):
+            if remaining[position] == 0 and course not in missing:
+                depth[position] = 0
+                queue.append(position)
+        while queue:
+            position = queue.popleft()
+            for course, number in occurrences.get(position, ()):
+                if (course, number) in satisfied:
+                    continue
+                satisfied.add((course, number))
+                remaining[course] -= 1
+                if remaining[course] == 0 and depth[course] == UNREACHABLE:
+                    depth[course] = min(depth[position] + 1, UNREACHABLE - 1)
+                    queue.append(course)
+        return depth
+
+    def is_prerequisite(self, subject, number, of_subject, of_number):
+        """True if (subject, number) is an eventual prerequisite of (of_subject, of_number)."""
+        position = self.index.get(prereq_graph.course_key(subject, number))
+        of_position = self.index.get(prereq_graph.course_key(of_subject, of_number))
+        if position is None or of_position is None:
+            return False
+        return bool(self.closure[of_position] >> position & 1)
+
+    def prerequisites_of(self, subject, number):
+        """Every eventual prerequisite of a course, sorted."""
+        position = self.index.get(prereq_graph.course_key(subject, number))
+        if position is None:
+            return ()
+        return tuple(self.courses[target] for target in range(len(self.courses))
+                     if self.closure[position] >> target & 1)
+
+    def min_semesters_before(self, subject, number):
+        """Semesters that must come before a course, or None if it can never be taken."""
+        position = self.index.get(prereq_graph.course_key(subject, number))
+        if position is None:
+            return 0
+        value = self.depth[position]
+        return None if value == UNREACHABLE else value
+
+    def is_takeable(self, subject, number):
+        return self.min_semesters_before(subject, number) is not None
+
+
+_analysis = None
+_lock = threading.Lock()
+
+
+def analyze(graph=None):
+    """Analyze a prerequisite graph (default: the current one) against the course catalog."""
+    courses = {(course['subject'], course['number']) for course in catalog.get_all_courses()}
+    return PrerequisiteAnalysis(graph or prereq_graph.get_graph(), courses)
+
+
+def get_analysis():
+    """
+    Process-wide analysis, recomputed when the prerequisite graph is reloaded
+    (after prerequisite edits) or the catalog version changes.
+    """
+    global _analysis
+    graph = prereq_graph.get_graph()
+    version = catalog_cache.version()
+    with _lock:
+        if _analysis is None or _analysis[0] is not graph or _analysis[1] != version:
+            _analysis = (graph, version, analyze(graph))
+        return _analysis[2]
@@ -0,0 +1,119 @@
+import threading
+from db_utils import get_db_connection
+
+
+def course_key(subject, number):
+    """Normalize a course to (subject, number); pages pass numbers around as strings."""
+    return (str(subject), int(number))
+
+
+class PrerequisiteGraph:
+    """
+    Compiled, read-only view of the Prerequisites table.
+
+    Each course maps to a tuple of groups. A course's prerequisites are met when
+    every group (AND) has at least one of its alternatives (OR) already taken.
+    `dependents` is the reverse index: course -> courses that list it in a group.
+    """
+
+    def __init__(self, rows):
+        grouped = {}
+        for parent_subject, parent_number, group_id, course_subject, course_number in rows:
+            if course_subject is None or course_number is None:
+                continue
+            parent = course_key(parent_subject, parent_number)
+            grouped.setdefault(parent, {}).setdefault(group_id, set()).add(
+                course_key(course_subject, course_number)
+            )
+        self.groups = {
+            parent: tuple(frozenset(groups[group_id]) for group_id in sorted(groups))
+            for parent, groups in grouped.items()
+        }
+        dependents = {}
+        for parent, groups in self.groups.items():
+            for group in groups:
+                for course in group:
+                    dependents.setdefault(course, set()).add(parent)
+        self.dependents = {course: frozenset(parents) for course, parents in dependents.items()}
+
+    def get_groups(self, subject, number):
+        return self.groups.get(course_key(subject, number), ())
+
+    def has_prereqs(self, subject, number):
+        return course_key(subject, number) in self.groups
+
+    def missing_groups(self, subject, number, taken):
+        """Groups with no alternative in `taken` (a set of (subject, number))."""
+        return [group for group in self.get_groups(subject, number) if taken.isdisjoint(group)]
+
+    def is_satisfied(self, subject, number, taken):
+        return all(not taken.isdisjoint(group) for group in self.get_groups(subject, number))
+
+    def get_dependents(self, subject, number):
+        return self.dependents.get(course_key(subject, number), frozenset())
+
+    def broken_by_removal(self, subject, number, semester_id, history):
+        """
+        Courses scheduled after `semester_id` that would lose a prerequisite if
+        (subject, number) were removed from that semester. `history` is
+        get_plan_history() output. A course only breaks when a group containing
+        the removed course has no other alternative scheduled before it, so
+        removing one of several OR-alternatives is fine.
+
+        Returns [(semester_id, (subject, number))] in plan order, or None if
+        `semester_id` is not in the history.
+        """
+        removed = course_key(subject, number)
+        dependents = self.dependents.get(removed, frozenset())
+        broken = []
+        prior = set()
+        found = False
+        for history_semester_id, courses in history:
+            if found:
+                for dependent in sorted(dependents & courses):
+                    if any(removed in group and prior.isdisjoint(group) for group in self.groups[dependent]):
+                        broken.append((history_semester_id, dependent))
+            if history_semester_id == semester_id:
+                found = True
+                courses = courses - {removed}
+            prior |= courses
+        return broken if found else None
+
+
+_graph = None
+_lock = threading.Lock()
+
+
+def load_rows():
+    """The whole Prerequisites table as plain tuples (picklable, for worker processes)."""
+    con = get_db_connection()
+    try:
+        rows = con.execute(""" SELECT parent_subject, parent_number, group_id, course_subject, course_number
+                               FROM Prerequisites """).fetchall()
+    finally:
+        con.close()
+    return [tuple(row) for row in rows]
+
+
+def load_graph():
+    """Read the whole Prerequisites table once and compile it."""
+    return PrerequisiteGraph(load_rows())
+
+
+def get_graph():
+    """Process-wide prerequisite graph, loaded on first use."""
+    global _graph
+    graph = _graph
+    if graph is None:
+        with _lock:
+            if _graph is None:
+                _graph = load_graph()
+            graph = _graph
+    return graph
+
+
+def invalidate():
+    """Drop the compiled graph; the next get_graph() reloads it. Called after prerequisite edits."""
+    global _graph
+    with _lock:
+        _graph = None
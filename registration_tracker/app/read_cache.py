@@ -0,0 +1,125 @@
+import functools
+import inspect
+import os
+import threading
+import catalog_cache
+from cache_utils import TTLCache
+
+# Memoization for controller reads across Streamlit reruns.
+#
+# Every widget interaction re-runs the page script, so the same reads repeat
+# with the same arguments. Results are kept in a process-wide LRU/TTL cache and
+# tagged with the entities they depend on (plan, student, advisor, catalog).
+# Controller writes call invalidate() for what they touched before returning,
+# so the rerun that follows a write reloads exactly the reads that changed.
+
+READ_CACHE_SIZE = int(os.environ.get("REG_TRACKER_READ_CACHE_SIZE", 4096))
+READ_CACHE_TTL = float(os.environ.get("REG_TRACKER_READ_CACHE_TTL", 600))
+
+TAGS = ("plan", "student", "advisor", "catalog")
+
+# Generation keys: (tag, ALL) changes when the whole tag is invalidated,
+# (tag, ANY) whenever any single entity of the tag changes.
+ALL = "*"
+ANY = "?"
+
+_entries = TTLCache(maxsize=READ_CACHE_SIZE, ttl=READ_CACHE_TTL)
+_generations = {}
+_hits = 0
+_misses = 0
+_lock = threading.Lock()
+
+
+def _generation(tag, key):
+    if tag == "catalog":
+        return catalog_cache.version()
+    return _generations.get((tag, key), 0)
+
+
+def _snapshot(dependencies):
+    with _lock:
+        return tuple((_generation(tag, ALL), _generation(tag, key)) for tag, key in dependencies)
+
+
+def generation(tag, key):
+    """Opaque stamp for one entity; it changes whenever invalidate() would make reads of it stale."""
+    return _snapshot([(tag, str(key))])
+
+
+def invalidate(tag, key=None):
+    """
+    Mark cached reads stale. With a key only reads of that entity (and reads
+    that list the whole tag) are affected; without one every read with the tag is.
+    """
+    if tag not in TAGS:
+        raise ValueError(f"Unknown cache tag '{tag}'")
+    if tag == "catalog":
+        catalog_cache.bump()
+        return
+    with _lock:
+        targets = [(tag, ALL)] if key is None else [(tag, str(key)), (tag, ANY)]
+        for target in targets:
+            _generations[target] = _generations.get(target, 0) + 1
+
+
+def clear():
+    global _hits, _misses
+    _entries.clear()
+    with _lock:
+        _hits = _misses = 0
+
+
+def stats():
+    with _lock:
+        return {"hits": _hits, "misses": _misses, "entries": len(_entries)}
+
+
+def cached_read(**tags):
+    """
+    Decorator for controller reads. Each keyword names a tag and the argument
+    holding that entity's id, or None when the read depends on every entity of
+    the tag (lists, lookups by name):
+
+        get_semesters = cached_read(plan="plan_id")(semesters.get_semesters)
+        get_plans = cached_read(plan=None)(plans.get_plans)
+
+    Lists are returned as tuples so callers can't change shared entries.
+    """
+    for tag in tags:
+        if tag not in TAGS:
+            raise ValueError(f"Unknown cache tag '{tag}'")
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _hits, _misses
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            dependencies = [
+                (tag, ANY if argument is None else str(bound.arguments[argument]))
+                for tag, argument in tags.items()
+            ]
+            key = (func.__module__, func.__qualname__, tuple(bound.arguments.values()))
+            snapshot = _snapshot(dependencies)
+
+            entry = _entries.get(key)
+            if entry is not None and entry[0] == snapshot:
+                with _lock:
+                    _hits += 1
+                return entry[1]
+            with _lock:
+                _misses += 1
+
+            value = func(*args, **kwargs)
+            if isinstance(value, list):
+                value = tuple(value)
+            # stored with the generations seen before loading, so a write that
+            # lands while loading leaves this entry stale rather than wrong
+            _entries.set(key, (snapshot, value))
+            return value
+
+        return wrapper
+
+    return decorator
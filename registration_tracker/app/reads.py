@@ -0,0 +1,33 @@
+import controllers.plans as c_plans
+import controllers.semesters as c_semesters
+import controllers.courses as c_courses
+import controllers.students as c_students
+import controllers.advisors as c_advisors
+import controllers.notes as c_notes
+import degree_audit
+import graduation
+from read_cache import cached_read
+
+# Cached versions of the per-user reads pages repeat on every rerun.
+# Controller writes invalidate the matching tags (see read_cache.invalidate).
+
+get_plan = cached_read(plan=None)(c_plans.get_plan)
+get_plan_from_id = cached_read(plan="plan_id")(c_plans.get_plan_from_id)
+get_first_plan = cached_read(plan=None)(c_plans.get_first_plan)
+get_plans = cached_read(plan=None)(c_plans.get_plans)
+load_plan_snapshot = cached_read(plan="plan_id", advisor=None, catalog=None)(c_plans.load_plan_snapshot)
+
+get_semesters = cached_read(plan="plan_id")(c_semesters.get_semesters)
+get_semester_courses = cached_read(plan="plan_id", catalog=None)(c_courses.get_semester_courses)
+
+get_student = cached_read(student=None)(c_students.get_student)
+get_students = cached_read(student=None)(c_students.get_students)
+
+get_advisor = cached_read(advisor="id")(c_advisors.get_advisor)
+
+get_advisor_notes = cached_read(plan="plan_id")(c_notes.get_advisor_notes)
+get_student_notes = cached_read(plan="plan_id")(c_notes.get_student_notes)
+
+# Recomputed when the plan changes or the catalog version moves (prerequisite edits bump it)
+get_earliest_graduation = cached_read(plan="plan_id", catalog=None)(graduation.earliest_graduation)
+get_degree_audit = cached_read(plan="plan_id", catalog=None)(degree_audit.audit_plan)
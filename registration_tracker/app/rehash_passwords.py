@@ -0,0 +1,26 @@
+"""
+Hash the plaintext passwords left in reg_tracker.db.
+
+Students, advisors and admins created before password hashing still have their
+password stored as plain text. Logging in upgrades a single account; this does
+all of them at once, at the cost set by REG_TRACKER_HASH_ITERATIONS (the one
+logins check against). Run it from the app directory:
+
+    python rehash_passwords.py --batch-size 500
+"""
+import argparse
+import auth_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="rows hashed and committed together")
+    args = parser.parse_args()
+
+    counts = auth_service.rehash_stored_passwords(batch_size=args.batch_size)
+    for table, count in counts.items():
+        print(f"{table:<10} hashed {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from collections import namedtuple
+from catalog_cache import cached
+from db_utils import get_db_connection
+import prereq_graph
+
+# Degree requirements as data: the sections of a major, its concentration and
+# the gen eds, each with its credit requirement and course groups.
+#
+# Requirement rows that share a group_id within a section are alternatives
+# (choose one). A section is complete once every group has one course and the
+# section's credit_requirement is reached; a section with a single large group
+# ("choose 6 credits from ...") is completed by taking several of its courses.
+
+# kind: "major" | "concentration" | "gen_ed"
+# groups: tuple of tuples of (subject, number), in group_id order
+Section = namedtuple("Section", ["kind", "id", "name", "credits_required", "groups"])
+
+# How a set of courses meets one Section (see evaluate)
+# courses: the courses whose credits count toward it; credits: their total
+# missing_groups: groups with none of their options taken
+# missing_credits: credits still short of credits_required
+SectionProgress = namedtuple("SectionProgress", ["section", "courses", "credits", "missing_groups", "missing_credits"])
+
+# Order sections are filled in; a course counts toward the first section that uses it
+SECTION_KINDS = ("major", "concentration", "gen_ed")
+
+# Every section of a major, a concentration and the gen eds in one query;
+# the first column orders them like SECTION_KINDS
+SECTIONS_QUERY = """
+    SELECT 0, ms.id, ms.section, ms.credit_requirement, msr.group_id, msr.course_subject, msr.course_number
+    FROM Major_Sections ms
+    LEFT JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
+    WHERE ms.major_id = ?
+    UNION ALL
+    SELECT 1, cs.id, cs.section, cs.credit_requirement, csr.group_id, csr.course_subject, csr.course_number
+    FROM Concentration_Sections cs
+    LEFT JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
+    WHERE cs.concentration_id = ?
+    UNION ALL
+    SELECT 2, ges.id, ges.section, ges.credit_requirement, ger.group_id, ger.course_subject, ger.course_number
+    FROM Gen_Ed_Sections ges
+    LEFT JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
+    ORDER BY 1, 2, 5, 6, 7
+"""
+
+COURSE_CREDITS_QUERY = """ SELECT subject, number, credits FROM Courses """
+
+
+def _sections(rows):
+    sections = []
+    groups = {}
+    for kind, section_id, name, credits_required, group_id, subject, number in rows:
+        if not sections or sections[-1][:2] != (kind, section_id):
+            groups = {}
+            sections.append((kind, section_id, name, credits_required or 0, groups))
+        if subject is not None and number is not None:
+            groups.setdefault(group_id, []).append(prereq_graph.course_key(subject, number))
+    return [Section(SECTION_KINDS[kind], section_id, name, credits_required,
+                    tuple(tuple(groups[group_id]) for group_id in sorted(groups)))
+            for kind, section_id, name, credits_required, groups in sections]
+
+
+@cached
+def get_sections(major_id, concentration_id=None):
+    """
+    Every requirement section of a major, its concentration (if any) and the gen
+    eds, in SECTION_KINDS order. One query, cached per catalog version.
+    """
+    con = get_db_connection()
+    try:
+        rows = con.execute(SECTIONS_QUERY, (major_id, concentration_id)).fetchall()
+    finally:
+        con.close()
+    return _sections(rows)
+
+
+@cached
+def get_course_credits():
+    """{(subject, number): credits} for the whole catalog. Cached per catalog version."""
+    con = get_db_connection()
+    try:
+        rows = con.execute(COURSE_CREDITS_QUERY).fetchall()
+    finally:
+        con.close()
+    return {prereq_graph.course_key(row[0], row[1]): row[2] for row in rows}
+
+
+def is_complete(progress):
+    return not progress.missing_groups and not progress.missing_credits
+
+
+def describe_missing(progress):
+    """What a section still needs, e.g. "6 credits; ITSC 1212; one of MATH 1120 / MATH 1241"."""
+    parts = [f"{progress.missing_credits} credits"] if progress.missing_credits else []
+    for group in progress.missing_groups:
+        if len(group) == 1:
+            parts.append("{} {}".format(*group[0]))
+        elif len(group) <= 4:
+            parts.append("one of " + " / ".join(f"{subject} {number}" for subject, number in group))
+        else:
+            parts.append(f"one of {len(group)} courses")
+    return "; ".join(parts)
+
+
+def evaluate(sections, courses, credits):
+    """
+    Match `courses` ((subject, number) pairs) against `sections` in order and
+    return a SectionProgress for each. A group is met by any of its options;
+    a course's credits count toward the first section that uses it only, and a
+    section's remaining options top up its credits. Reads nothing from the
+    database, so callers can try any requirement set against the same courses.
+    """
+    courses = {prereq_graph.course_key(*course) for course in courses}
+    counted = set()
+    progress = []
+    for section in sections:
+        used = []
+        earned = 0
+        missing = []
+        for group in section.groups:
+            present = sorted(course for course in group if course in courses)
+            if not present:
+                missing.append(group)
+                continue
+            course = next((course for course in present if course not in counted), None)
+            if course is not None:
+                counted.add(course)
+                used.append(course)
+                earned += credits.get(course, 0)
+        options = {course for group in section.groups for course in group if course in courses}
+        for course in sorted(options - counted):
+            if earned >= section.credits_required:
+                break
+            counted.add(course)
+            used.append(course)
+            earned += credits.get(course, 0)
+        progress.append(SectionProgress(section, tuple(used), earned, tuple(missing),
+                                        max(0, section.credits_required - earned)))
+    return progress
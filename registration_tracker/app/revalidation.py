@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import controllers.plans as c_plans
+import plan_validator
+import prereq_graph
+from db_utils import get_db_connection, apply_violations_table
+
+# Re-checks stored plans after prerequisite edits and records what broke in
+# Plan_Violations, where the advisor dashboard reads it.
+#
+# Only plans that schedule an edited course can change, and those are found
+# through idx_plan_courses_course. The parent process loads the prerequisite
+# rows and the plans' histories; worker processes only run the checks, so
+# they never open the database.
+
+# Worker processes for a job; 0 runs the checks in the calling process
+REVALIDATION_WORKERS = int(os.environ.get("REG_TRACKER_REVALIDATION_WORKERS", os.cpu_count() or 2))
+# Plans handed to a worker at a time
+CHUNK_SIZE = 200
+# Jobs start from the Streamlit server, which runs threads: forking it could
+# copy a lock some other thread holds, so workers come from a clean process
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def find_affected_plans(courses):
+    """Ids of the plans that schedule any of `courses` ((subject, number) pairs)."""
+    courses = [prereq_graph.course_key(subject, number) for subject, number in courses]
+    if not courses:
+        return []
+    where = " OR ".join(["(course_subject = ? AND course_number = ?)"] * len(courses))
+    query = f""" SELECT DISTINCT plan_id FROM Plan_Semester_Courses
+                 WHERE {where} """
+    con = get_db_connection()
+    try:
+        rows = con.execute(query, [value for course in courses for value in course]).fetchall()
+    finally:
+        con.close()
+    return sorted(row[0] for row in rows)
+
+
+_worker_graph = None
+
+
+def _init_worker(rows):
+    global _worker_graph
+    _worker_graph = prereq_graph.PrerequisiteGraph(rows)
+
+
+def _validate_chunk(histories):
+    """[(plan_id, history)] -> [(plan_id, [Violation])], run in a worker process."""
+    return [(plan_id, plan_validator.PlanValidator(plan_id, history, _worker_graph).get_violations())
+            for plan_id, history in histories]
+
+
+def write_violations(results):
+    """
+    Replace the stored violations of every plan in `results` ({plan_id: [Violation]})
+    in one transaction, dropping rows of plans that no longer exist.
+    """
+    checked_at = datetime.now().isoformat(timespec="seconds")
+    rows = [(violation.plan_id, violation.semester_id, violation.subject, violation.number,
+             plan_validator.describe_missing(violation.missing), checked_at)
+            for violations in results.values() for violation in violations]
+    con = get_db_connection()
+    try:
+        apply_violations_table(con)
+        con.executemany("DELETE FROM Plan_Violations WHERE plan_id = ?", [(plan_id,) for plan_id in results])
+        con.execute("DELETE FROM Plan_Violations WHERE plan_id NOT IN (SELECT id FROM Plans)")
+        con.executemany(""" INSERT INTO Plan_Violations
+                            (plan_id, semester_id, course_subject, course_number, missing, checked_at)
+                            VALUES (?, ?, ?, ?, ?, ?) """, rows)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.close()
+    return len(rows)
+
+
+def revalidate(plan_ids=None, workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Re-check plans (default: all of them) against the current prerequisites and
+    store the results in Plan_Violations.
+
+    progress, if given, is called as progress(done, total, plans_per_second)
+    after every chunk. Returns {"plans", "violations", "seconds", "plans_per_second"}.
+    """
+    started = time.perf_counter()
+    workers = REVALIDATION_WORKERS if workers is None else workers
+    rows = prereq_graph.load_rows()
+    histories = list(c_plans.get_plan_histories(plan_ids).items())
+    chunks = [histories[start:start + chunk_size] for start in range(0, len(histories), chunk_size)]
+
+    results = {}
+
+    def collect(chunk_results):
+        results.update(chunk_results)
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress(len(results), len(histories), len(results) / elapsed if elapsed else 0.0)
+
+    if workers and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context(START_METHOD),
+                                 initializer=_init_worker, initargs=(rows,)) as pool:
+            for future in as_completed([pool.submit(_validate_chunk, chunk) for chunk in chunks]):
+                collect(future.result())
+    else:
+        _init_worker(rows)
+        for chunk in chunks:
+            collect(_validate_chunk(chunk))
+
+    violations = write_violations(results)
+    seconds = time.perf_counter() - started
+    return {
+        "plans": len(results),
+        "violations": violations,
+        "seconds": seconds,
+        "plans_per_second": len(results) / seconds if seconds else 0.0,
+    }
+
+
+def revalidate_courses(courses, **kwargs):
+    """Re-check only the plans that schedule one of `courses` (the parents of edited prerequisites)."""
+    plan_ids = find_affected_plans(courses)
+    if not plan_ids:
+        return {"plans": 0, "violations": 0, "seconds": 0.0, "plans_per_second": 0.0}
+    return revalidate(plan_ids, **kwargs)
+
+
+# Background jobs started from the admin page. One job runs at a time; courses
+# edited while it runs are queued and handled by the same thread afterwards.
+_status = {"running": False, "done": 0, "total": 0, "plans_per_second": 0.0, "last": None, "error": None}
+_pending = set()
+_thread = None
+_lock = threading.Lock()
+
+
+def get_status():
+    """Snapshot of the background job: running, done/total plans, throughput, last result, error."""
+    with _lock:
+        return dict(_status)
+
+
+def _report(done, total, plans_per_second):
+    with _lock:
+        _status.update(done=done, total=total, plans_per_second=plans_per_second)
+
+
+def _run_pending():
+    while True:
+        with _lock:
+            if not _pending:
+                _status["running"] = False
+                return
+            courses = list(_pending)
+            _pending.clear()
+            _status.update(done=0, total=0, plans_per_second=0.0, error=None)
+        try:
+            result = revalidate_courses(courses, progress=_report)
+            with _lock:
+                _status["last"] = result
+        except Exception as e:
+            print(f"Error revalidating plans: {e}")
+            with _lock:
+                _status["error"] = str(e)
+
+
+def start_revalidation(courses):
+    """
+    Queue a background re-check of the plans scheduling `courses` and return
+    immediately. Returns the thread running the job (an already running one if
+    a job was in progress).
+    """
+    global _thread
+    with _lock:
+        _pending.update(prereq_graph.course_key(subject, number) for subject, number in courses)
+        if _status["running"]:
+            return _thread
+        _status["running"] = True
+        _thread = threading.Thread(target=_run_pending, name="revalidation", daemon=True)
+        _thread.start()
+        return _thread
@@ -0,0 +1,192 @@
+import os
+from collections import namedtuple
+import controllers.plans as c_plans
+import prereq_analysis
+import prereq_graph
+import requirements
+
+# Builds a whole degree plan in one pass from the requirement tables and the
+# prerequisite graph, instead of adding courses one click at a time.
+#
+# 1. Choose courses: one course per requirement group, then more courses from
+#    a section's options until its credit requirement is met. Options that
+#    need the fewest semesters of prerequisites are preferred, courses the plan
+#    already has are reused, and a course counts toward one section only.
+# 2. Close over prerequisites: every chosen course gets one alternative of each
+#    of its prerequisite groups, preferring courses already chosen.
+# 3. List-schedule the semesters in order: a course is ready once all of its
+#    prerequisite groups are met by earlier semesters, and ready courses that
+#    unlock the longest chains go first until the semester's credit cap.
+#
+# Courses already in the plan stay where they are.
+
+# Credits allowed in one semester
+MAX_CREDITS = int(os.environ.get("REG_TRACKER_MAX_CREDITS", 18))
+
+# placements: [(semester_id, (subject, number))] of the courses to add
+# credits: {semester_id: total credits including the plan's existing courses}
+# unscheduled: chosen courses that did not fit in any semester
+# unmet: [(section name, credits still missing)] for sections the catalog can't fill
+Schedule = namedtuple("Schedule", ["placements", "credits", "unscheduled", "unmet"])
+
+
+def _rank(analysis):
+    def key(course):
+        return (analysis.min_semesters_before(*course), course)
+    return key
+
+
+def choose_courses(sections, analysis, credits, taken=()):
+    """
+    Pick the courses that complete `sections` (see requirements.get_sections),
+    counting `taken` courses first. Options missing from the catalog (`credits`)
+    or that can never be taken are skipped. Returns (chosen courses in pick order, unmet).
+    """
+    rank = _rank(analysis)
+    have = set(taken)
+    chosen = []
+    counted = set()
+    unmet = []
+
+    def pick(course):
+        if course not in have:
+            have.add(course)
+            chosen.append(course)
+
+    for section in sections:
+        earned = 0
+        pool = set()
+        for group in section.groups:
+            options = sorted((course for course in group
+                              if course in credits and analysis.is_takeable(*course)), key=rank)
+            if not options:
+                continue
+            pool.update(options)
+            fresh = [course for course in options if course not in counted]
+            course = (next((course for course in fresh if course in have), None)
+                      or next(iter(fresh), None)
+                      or next((course for course in options if course in have), options[0]))
+            pick(course)
+            if course not in counted:
+                counted.add(course)
+                earned += credits.get(course, 0)
+        # "choose N credits from ..." sections: keep taking options, reusing planned courses first
+        for course in sorted(pool - counted, key=lambda course: (course not in have, rank(course))):
+            if earned >= section.credits_required:
+                break
+            pick(course)
+            counted.add(course)
+            earned += credits.get(course, 0)
+        if earned < section.credits_required:
+            unmet.append((section.name, section.credits_required - earned))
+    return chosen, unmet
+
+
+def add_prerequisites(chosen, graph, analysis, taken=()):
+    """Extend `chosen` with one alternative of every prerequisite group it does not yet cover."""
+    rank = _rank(analysis)
+    have = set(taken) | set(chosen)
+    result = list(chosen)
+    stack = list(chosen)
+    while stack:
+        course = stack.pop()
+        for group in graph.get_groups(*course):
+            if have.intersection(group):
+                continue
+            options = sorted((alternative for alternative in group if analysis.is_takeable(*alternative)), key=rank)
+            if options:
+                have.add(options[0])
+                result.append(options[0])
+                stack.append(options[0])
+    return result
+
+
+def _chain_lengths(courses, graph):
+    """Longest chain of dependents within `courses` that each course unlocks."""
+    courses = set(courses)
+    lengths = {}
+    for root in courses:
+        if root in lengths:
+            continue
+        lengths[root] = 0  # provisional, so a cycle can't recurse forever
+        work = [(root, iter(graph.get_dependents(*root)))]
+        while work:
+            course, dependents = work[-1]
+            for dependent in dependents:
+                if dependent in courses and dependent not in lengths:
+                    lengths[dependent] = 0
+                    work.append((dependent, iter(graph.get_dependents(*dependent))))
+                    break
+            else:
+                work.pop()
+                lengths[course] = 1 + max((lengths[dependent] for dependent in graph.get_dependents(*course)
+                                           if dependent in courses), default=0)
+    return lengths
+
+
+def place_courses(courses, history, graph, analysis, credits, credit_cap=MAX_CREDITS):
+    """
+    Spread `courses` over the semesters of `history` ([(semester_id, existing courses)],
+    in order) within `credit_cap`. Returns (placements, semester credits, unscheduled).
+    """
+    rank = _rank(analysis)
+    chains = _chain_lengths(courses, graph)
+    remaining = set(courses)
+    before = set()
+    placements = []
+    semester_credits = {}
+    for semester_id, existing in history:
+        existing = {prereq_graph.course_key(*course) for course in existing}
+        remaining -= existing
+        load = sum(credits.get(course, 0) for course in existing)
+        ready = sorted((course for course in remaining if graph.is_satisfied(*course, before)),
+                       key=lambda course: (-chains[course], rank(course)))
+        for course in ready:
+            if load + credits.get(course, 0) <= credit_cap:
+                placements.append((semester_id, course))
+                remaining.discard(course)
+                existing.add(course)
+                load += credits.get(course, 0)
+        semester_credits[semester_id] = load
+        before |= existing
+    return placements, semester_credits, sorted(remaining)
+
+
+def build_schedule(sections, history, graph, analysis, credits, credit_cap=MAX_CREDITS):
+    """Choose and place every course a plan still needs. Returns a Schedule."""
+    taken = {prereq_graph.course_key(*course) for _, courses in history for course in courses}
+    chosen, unmet = choose_courses(sections, analysis, credits, taken)
+    chosen = add_prerequisites(chosen, graph, analysis, taken)
+    placements, semester_credits, unscheduled = place_courses(chosen, history, graph, analysis,
+                                                              credits, credit_cap)
+    return Schedule(placements, semester_credits, unscheduled, unmet)
+
+
+def generate_plan(plan_id, credit_cap=MAX_CREDITS):
+    """
+    Fill a plan's semesters from its major's and concentration's requirements
+    and write the new courses in one transaction.
+    Returns {"success", "message", "schedule"}.
+    """
+    plan = c_plans.get_plan_from_id(plan_id)
+    if not plan:
+        return {"success": False, "message": "Plan not found.", "schedule": None}
+    history = c_plans.get_plan_history(plan_id)
+    if not history:
+        return {"success": False, "message": "The plan has no semesters to fill.", "schedule": None}
+
+    analysis = prereq_analysis.get_analysis()
+    schedule = build_schedule(requirements.get_sections(plan['major_id'], plan['concentration_id']),
+                              history, analysis.graph, analysis, requirements.get_course_credits(),
+                              credit_cap)
+    result = c_plans.add_plan_courses(plan_id, schedule.placements)
+    if not result["success"]:
+        return {**result, "schedule": schedule}
+
+    message = f"Added {len(schedule.placements)} courses to the plan."
+    if schedule.unscheduled:
+        message += " Did not fit: " + ", ".join(f"{s} {n}" for s, n in schedule.unscheduled) + "."
+    if schedule.unmet:
+        message += " Still to choose: " + ", ".join(f"{name} ({missing} credits)"
+                                                    for name, missing in schedule.unmet) + "."
+    return {"success": True, "message": message, "schedule": schedule}
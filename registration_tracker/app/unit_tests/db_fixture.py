@@ -0,0 +1,82 @@
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(APP_DIR)
+import db_utils
+import catalog_cache
+import plan_validator
+import prereq_graph
+import read_cache
+
+
+def build_test_database(directory):
+    """Run database_creation.py in `directory` and return the path of the seeded database."""
+    subprocess.run(
+        [sys.executable, os.path.join(APP_DIR, "database_creation.py")],
+        cwd=directory, check=True, capture_output=True
+    )
+    return os.path.join(directory, db_utils.DB_NAME)
+
+
+def use_test_database(db_path):
+    """Point the shared connection pool at a test database."""
+    return db_utils.set_connection_factory(
+        lambda: sqlite3.connect(db_path, check_same_thread=False)
+    )
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Tests against a real database. database_creation.py and `seed_sql` run once
+    per class; every test gets its own copy (self.db_path) with the connection
+    pool pointed at it, and `reset_caches` run before and after each test.
+    """
+
+    # SQL script run on the class's template database after the seed data
+    seed_sql = ""
+    # Process-wide caches that would otherwise leak between test databases
+    reset_caches = (prereq_graph.invalidate, catalog_cache.bump, read_cache.clear, plan_validator.forget)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.template = build_test_database(cls.tmpdir.name)
+        if cls.seed_sql:
+            con = sqlite3.connect(cls.template)
+            con.executescript(cls.seed_sql)
+            con.commit()
+            con.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.db_path = os.path.join(self.tmpdir.name, f"{self._testMethodName}.db")
+        shutil.copy(self.template, self.db_path)
+        use_test_database(self.db_path)
+        for reset in self.reset_caches:
+            reset()
+
+    def tearDown(self):
+        db_utils.set_connection_factory(None)
+        for reset in self.reset_caches:
+            reset()
+
+    def trace_statements(self):
+        """Reconnect the pool with a trace callback; returns the list the statements are appended to."""
+        statements = []
+
+        def factory():
+            con = sqlite3.connect(self.db_path, check_same_thread=False)
+            con.set_trace_callback(statements.append)
+            return con
+
+        db_utils.set_connection_factory(factory)
+        return statements
@@ -10,6 +10,25 @@ declare -a controllers=(
 [5]=plans_cont
 [6]=majors_cont
 [7]=concentration_cont
+[8]=db_utils
+[9]=query_plans
+[10]=prereq_graph
+[11]=eligibility
+[12]=suggestions
+[13]=bulk_delete
+[14]=cache_utils
+[15]=auth_service
+[16]=passwords
+[17]=catalog_cache
+[18]=read_cache
+[19]=plan_validator
+[20]=revalidation
+[21]=prereq_analysis
+[22]=scheduler
+[23]=cohort
+[24]=graduation
+[25]=whatif
+[26]=degree_audit
 )
 
 for controller_idx in $(seq 0 $((${#controllers[@]}-1)));
@@ -7,22 +7,14 @@ import os
 # Add parent directory to path to import the controllers
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from controllers import advisors
+import db_utils
+import passwords
 
 class TestAdvisorsController(unittest.TestCase):
     
-    @patch('controllers.advisors.sqlite3.connect')
-    def test_get_db_connection(self, mock_connect):
-        # Set up the mock
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-        
-        # Call the function
-        conn = advisors.get_db_connection()
-        
-        # Assertions
-        mock_connect.assert_called_once_with(advisors.DB_NAME)
-        self.assertEqual(conn, mock_conn)
-        self.assertEqual(conn.row_factory, sqlite3.Row)
+    def test_get_db_connection(self):
+        # Controllers borrow connections from the shared pool
+        self.assertIs(advisors.get_db_connection, db_utils.get_db_connection)
     
     @patch('controllers.advisors.get_db_connection')
     def test_get_advisor(self, mock_get_conn):
@@ -140,10 +132,16 @@ class TestAdvisorsController(unittest.TestCase):
         
         # Assertions
         mock_get_conn.assert_called_once()
-        mock_conn.execute.assert_called_once_with(
-            " INSERT INTO Advisors (id, username, password, f_name, l_name)\n                VALUES (?, ?, ?, ?, ?) ", 
-            (3409245, 'new_advisor', 'secure_password', 'Jane', 'Smith')
+        mock_conn.execute.assert_called_once()
+        query, values = mock_conn.execute.call_args[0]
+        self.assertEqual(
+            query,
+            " INSERT INTO Advisors (id, username, password, f_name, l_name)\n                VALUES (?, ?, ?, ?, ?) "
         )
+        self.assertEqual(values[:2] + values[3:], (3409245, 'new_advisor', 'Jane', 'Smith'))
+        # The password is stored as a salted hash
+        self.assertNotEqual(values[2], 'secure_password')
+        self.assertTrue(passwords.verify_password('secure_password', values[2]))
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
         self.assertTrue(result['success'])
@@ -204,7 +202,7 @@ class TestAdvisorsController(unittest.TestCase):
         # Check values passed to the query
         values = call_args[1]
         self.assertEqual(values[0], 'updated_username')
-        self.assertEqual(values[1], 'new_password')
+        self.assertTrue(passwords.verify_password('new_password', values[1]))
         self.assertEqual(values[2], 'Updated')
         self.assertEqual(values[3], 'Name')
         self.assertEqual(values[4], 3409243)  # ID should be the last parameter
@@ -0,0 +1,177 @@
+import unittest
+import sqlite3
+import sys
+import os
+import tempfile
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_utils
+import auth_service
+import passwords
+from db_fixture import DatabaseTestCase
+from controllers import students, advisors
+
+class TestAuthService(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.statements = self.trace_statements()
+        auth_service.forget_identities()
+        self.iterations = passwords.HASH_ITERATIONS
+        passwords.HASH_ITERATIONS = 1000  # keep hashing cheap in tests
+
+    def tearDown(self):
+        super().tearDown()
+        auth_service.forget_identities()
+        passwords.HASH_ITERATIONS = self.iterations
+
+    def stored_password(self, table, username):
+        con = sqlite3.connect(self.db_path)
+        value = con.execute(f"SELECT password FROM {table} WHERE username = ?", (username,)).fetchone()[0]
+        con.close()
+        return value
+
+    def selects(self):
+        return [s for s in self.statements if s.lstrip().upper().startswith("SELECT")]
+
+    def test_each_role(self):
+        for username, password, role in [("uname", "pword", "student"),
+                                         ("adv_username", "adv_passw0rd", "advisor"),
+                                         ("ksotoenc", "pword", "admin")]:
+            with self.subTest(username=username):
+                result = auth_service.authenticate(username, password)
+                self.assertTrue(result["success"])
+                self.assertEqual(result["identity"].role, role)
+                self.assertEqual(result["identity"].username, username)
+                self.assertIn(role, auth_service.HOME_PAGES)
+
+    def test_student_id_returned(self):
+        self.assertEqual(auth_service.authenticate("uname", "pword")["identity"].id, 1600344)
+
+    def test_wrong_password(self):
+        result = auth_service.authenticate("uname", "wrong")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["message"], "Credentials do not match. Please try again.")
+
+    def test_unknown_username(self):
+        result = auth_service.authenticate("nobody", "pword")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["message"], "Username not found. Please try again.")
+
+    def test_one_query_per_attempt(self):
+        auth_service.authenticate("nobody", "pword")
+        self.assertEqual(len(self.selects()), 1)
+
+    def test_successful_login_cached(self):
+        auth_service.authenticate("uname", "pword")
+        auth_service.authenticate("uname", "pword")
+        self.assertEqual(len(self.selects()), 1)
+
+    def test_account_change_clears_cache(self):
+        auth_service.authenticate("tbone", "password")
+        students.update_student(1600343, password="changed")
+        try:
+            self.assertFalse(auth_service.authenticate("tbone", "password")["success"])
+            self.assertTrue(auth_service.authenticate("tbone", "changed")["success"])
+        finally:
+            students.update_student(1600343, password="password")
+
+    def test_plaintext_upgraded_on_login(self):
+        self.assertTrue(auth_service.authenticate("jgrand", "pword")["success"])
+        stored = self.stored_password("Admins", "jgrand")
+        self.assertTrue(passwords.is_hashed(stored))
+        auth_service.forget_identities()
+        self.assertTrue(auth_service.authenticate("jgrand", "pword")["success"])
+        self.assertFalse(auth_service.authenticate("jgrand", "wrong")["success"])
+
+    def test_cache_does_not_keep_password(self):
+        auth_service.authenticate("amoua", "pword")
+        cached = auth_service._identities.get("amoua")
+        self.assertNotIn("pword", [str(value) for value in cached])
+        self.assertFalse(auth_service.authenticate("amoua", "wrong")["success"])
+
+    def test_rehash_stored_passwords(self):
+        counts = auth_service.rehash_stored_passwords(batch_size=1)
+        self.assertGreater(sum(counts.values()), 0)
+        self.assertTrue(passwords.is_hashed(self.stored_password("Students", "tbone")))
+        self.assertTrue(passwords.is_hashed(self.stored_password("Advisors", "adv_username")))
+        self.assertTrue(auth_service.authenticate("tbone", "password")["success"])
+        # nothing left to do on a second run
+        self.assertEqual(sum(auth_service.rehash_stored_passwords().values()), 0)
+
+    def test_username_taken_by_another_role(self):
+        result = advisors.add_advisor(3409999, "uname", "pw", "Dup", "User")
+        self.assertFalse(result["success"])
+        self.assertEqual(auth_service.authenticate("uname", "pword")["identity"].role, "student")
+
+    def test_lookup_uses_indexes(self):
+        con = sqlite3.connect(self.db_path)
+        copy = db_utils.schema_copy(con)
+        con.close()
+        self.assertEqual(db_utils.find_table_scans(copy, auth_service.IDENTITY_QUERY, {"username": "uname"}), [])
+        copy.close()
+
+class TestUsersTable(unittest.TestCase):
+    """The Users login table stays in sync with Students, Advisors and Admins."""
+
+    def setUp(self):
+        self.con = sqlite3.connect(":memory:")
+        self.con.executescript("""
+            CREATE TABLE Students (id INTEGER PRIMARY KEY, username TEXT NOT NULL, password TEXT NOT NULL);
+            CREATE TABLE Advisors (id INTEGER PRIMARY KEY, username TEXT NOT NULL, password TEXT NOT NULL);
+            CREATE TABLE Admins (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, password TEXT NOT NULL);
+            INSERT INTO Students VALUES (1, 'shared', 'a');
+            INSERT INTO Advisors VALUES (2, 'shared', 'b'), (3, 'adv', 'c');
+        """)
+        db_utils.apply_users_table(self.con)
+
+    def tearDown(self):
+        self.con.close()
+
+    def users(self):
+        return self.con.execute("SELECT username, role, id, password FROM Users ORDER BY username").fetchall()
+
+    def test_backfill_keeps_first_role(self):
+        self.assertEqual(self.users(), [("adv", "advisor", 3, "c"), ("shared", "student", 1, "a")])
+
+    def test_migration_is_idempotent(self):
+        db_utils.apply_users_table(self.con)
+        self.assertEqual(len(self.users()), 2)
+
+    def test_triggers_follow_changes(self):
+        self.con.execute("INSERT INTO Admins (username, password) VALUES ('root', 'd')")
+        self.con.execute("UPDATE Advisors SET username = 'adv2', password = 'e' WHERE id = 3")
+        self.con.execute("DELETE FROM Students WHERE id = 1")
+        self.assertEqual(self.users(), [("adv2", "advisor", 3, "e"), ("root", "admin", 1, "d")])
+
+    def test_username_unique_across_roles(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.con.execute("INSERT INTO Admins (username, password) VALUES ('adv', 'x')")
+
+    def test_lookup_is_one_probe(self):
+        plan = self.con.execute("EXPLAIN QUERY PLAN " + auth_service.IDENTITY_QUERY, {"username": "adv"}).fetchall()
+        self.assertEqual(len(plan), 1)
+        self.assertIn("PRIMARY KEY", plan[0][3])
+
+    def test_lookup_migrates_database_without_users(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "old.db")
+            old = sqlite3.connect(db_path)
+            old.executescript("""
+                CREATE TABLE Students (id INTEGER PRIMARY KEY, username TEXT NOT NULL, password TEXT NOT NULL);
+                CREATE TABLE Advisors (id INTEGER PRIMARY KEY, username TEXT NOT NULL, password TEXT NOT NULL);
+                CREATE TABLE Admins (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, password TEXT NOT NULL);
+                INSERT INTO Advisors VALUES (3, 'adv', 'c');
+            """)
+            old.close()
+            db_utils.set_connection_factory(lambda: sqlite3.connect(db_path, check_same_thread=False))
+            try:
+                identity, stored_password = auth_service.lookup_identity("adv")
+                self.assertEqual((identity, stored_password), (auth_service.Identity("advisor", 3, "adv"), "c"))
+                self.assertIsNone(auth_service.lookup_identity("nobody"))
+            finally:
+                db_utils.set_connection_factory(None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_utils
+import plan_validator
+import reads
+from db_fixture import DatabaseTestCase
+from controllers import plans, semesters, courses, students
+
+class TestBulkDelete(DatabaseTestCase):
+    """
+    Runs the bulk delete APIs against a copy of the seeded database and checks
+    the reported counts and that no child row is left pointing at a deleted parent.
+    """
+
+    seed_sql = """
+        UPDATE Students SET graduation_date = 20240510 WHERE id = 1600343;
+        INSERT INTO Plan_Semester_Courses VALUES (1, 1, 'ITSC', 1212), (1, 2, 'ITSC', 1213);
+        INSERT INTO Plan_Violations VALUES (1, 1, 'ITSC', 1212, 'ITSC 1200', '2025-01-01T00:00:00'),
+                                           (1, 2, 'ITSC', 1213, 'ITSC 1212', '2025-01-01T00:00:00');
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.suggestion_id = plans.clone_plan(1, as_suggestion_by=3409243)
+
+    def query(self, query, params=()):
+        con = sqlite3.connect(self.db_path)
+        value = con.execute(query, params).fetchone()[0]
+        con.close()
+        return value
+
+    def violations(self, *tables):
+        con = sqlite3.connect(self.db_path)
+        rows = [row for table in tables for row in con.execute(f"PRAGMA foreign_key_check({table})")]
+        con.close()
+        return rows
+
+    def test_delete_plans(self):
+        result = plans.delete_plans([1])
+        self.assertTrue(result['success'])
+        self.assertEqual(result['counts'], {
+            "Plan_Violations": 2, "Notes": 2, "Plan_Semester_Courses": 4, "Plan_Semesters": 4, "Plans": 2
+        })
+        self.assertEqual(self.violations("Notes", "Plan_Semester_Courses", "Plan_Semesters", "Plans"), [])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM Plan_Violations"), 0)
+
+    def test_delete_graduated_students(self):
+        result = students.delete_graduated_students(20250101)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['counts']['Students'], 1)
+        self.assertEqual(result['counts']['Plans'], 2)
+        self.assertEqual(result['counts']['Plan_Violations'], 2)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM Students"), 1)
+        self.assertEqual(self.violations("Notes", "Plan_Semester_Courses", "Plan_Semesters", "Plans"), [])
+
+    def test_delete_students_keeps_others(self):
+        result = students.delete_students([1600344])
+        self.assertTrue(result['success'])
+        self.assertEqual(result['counts']['Students'], 1)
+        self.assertEqual(result['counts']['Plans'], 0)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM Plans"), 2)
+
+    def test_delete_semesters_before(self):
+        result = semesters.delete_semesters_before(2026)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['counts'], {
+            "Plan_Violations": 1, "Plan_Semester_Courses": 2, "Plan_Semesters": 2, "Semesters": 1
+        })
+        self.assertEqual(self.query("SELECT semester_id FROM Plan_Violations"), 2)
+        self.assertEqual(self.query("SELECT MIN(year) FROM Semesters"), 2026)
+        self.assertEqual(self.violations("Plan_Semester_Courses", "Plan_Semesters"), [])
+
+    def test_delete_courses(self):
+        result = courses.delete_courses([('ITSC', 1212), ('ITSC', 1213)])
+        self.assertTrue(result['success'])
+        self.assertEqual(result['counts']['Courses'], 2)
+        self.assertEqual(result['counts']['Plan_Semester_Courses'], 4)
+        self.assertEqual(result['counts']['Plan_Violations'], 2)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM Plan_Violations"), 0)
+        self.assertEqual(self.query("""SELECT COUNT(*) FROM Prerequisites
+                                       WHERE course_subject = 'ITSC' AND course_number IN (1212, 1213)"""), 0)
+
+    def test_delete_courses_drops_cached_plans(self):
+        validator = plan_validator.get_validator(1)
+        snapshot = reads.load_plan_snapshot(1)
+        self.assertIn(('ITSC', 1212), validator.scheduled)
+        self.assertIn('ITSC', [course.subject for semester in snapshot.semesters for course in semester.courses])
+
+        courses.delete_courses([('ITSC', 1212), ('ITSC', 1213)])
+        self.assertNotIn(('ITSC', 1212), plan_validator.get_validator(1).scheduled)
+        self.assertEqual([course for semester in reads.load_plan_snapshot(1).semesters
+                          for course in semester.courses if course.subject == 'ITSC'], [])
+
+    def test_statistics_refreshed(self):
+        semesters.delete_semesters_before(2027)
+        stat = self.query("SELECT stat FROM sqlite_stat1 WHERE tbl = 'Semesters' LIMIT 1")
+        self.assertEqual(stat.split()[0], "5")  # rows left after the delete
+
+    def test_foreign_keys_off_after_delete(self):
+        plans.delete_plans([1])
+        con = db_utils.get_db_connection()
+        self.assertEqual(con.execute("PRAGMA foreign_keys").fetchone()[0], 0)
+        con.close()
+
+if __name__ == '__main__':
+    unittest.main()
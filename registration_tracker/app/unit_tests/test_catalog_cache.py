@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import threading
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import catalog_cache
+import catalog
+from controllers import majors, courses, concentration, prerequisites
+
+class TestCatalogCache(unittest.TestCase):
+
+    def setUp(self):
+        catalog_cache.bump()
+        catalog_cache.reset_stats()
+        self.calls = []
+
+        @catalog_cache.cached
+        def lookup(*args):
+            self.calls.append(args)
+            return [args]
+
+        self.lookup = lookup
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.lookup(1), ((1,),))
+        self.assertEqual(self.lookup(1), ((1,),))
+        self.lookup(2)
+        self.assertEqual(self.calls, [(1,), (2,)])
+        stats = catalog_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 2))
+
+    def test_bump_invalidates_everything(self):
+        self.lookup(1)
+        version = catalog_cache.version()
+        catalog_cache.bump()
+        self.assertEqual(catalog_cache.version(), version + 1)
+        self.assertEqual(catalog_cache.stats()["entries"], 0)
+        self.lookup(1)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_value_loaded_across_bump_not_stored(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @catalog_cache.cached
+        def slow():
+            started.set()
+            release.wait()
+            return "old"
+
+        t = threading.Thread(target=slow)
+        t.start()
+        started.wait()
+        catalog_cache.bump()
+        release.set()
+        t.join()
+        self.assertEqual(catalog_cache.stats()["entries"], 0)
+
+    @patch('controllers.majors.get_db_connection')
+    def test_controller_lookup_cached(self, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchall.return_value = [{'id': 1, 'name': 'Computer Science'}]
+
+        first = catalog.get_all_majors()
+        second = catalog.get_all_majors()
+
+        self.assertIs(first, second)
+        mock_get_conn.assert_called_once()
+
+    @patch('controllers.prerequisites.get_db_connection')
+    @patch('controllers.concentration.get_db_connection')
+    @patch('controllers.courses.get_db_connection')
+    @patch('controllers.majors.get_db_connection')
+    def test_admin_writes_bump_version(self, *mock_get_conns):
+        for mock_get_conn in mock_get_conns:
+            mock_get_conn.return_value = MagicMock()
+        writes = [
+            lambda: majors.add_major("Math", "Science"),
+            lambda: majors.update_major(1, name="Maths"),
+            lambda: majors.delete_major(1),
+            lambda: concentration.add_concentration("AI", 1),
+            lambda: concentration.delete_concentration(1),
+            lambda: courses.add_course("ITSC", 9999, "Test", 3),
+            lambda: courses.update_course("ITSC", 9999, name="Test 2"),
+            lambda: courses.delete_course("ITSC", 9999),
+            lambda: prerequisites.add_prereq("ITSC", 9999, 0, "ITSC", 1212),
+        ]
+        for write in writes:
+            version = catalog_cache.version()
+            self.assertTrue(write()["success"])
+            self.assertEqual(catalog_cache.version(), version + 1)
+
+if __name__ == '__main__':
+    unittest.main()
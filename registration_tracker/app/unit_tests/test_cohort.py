@@ -0,0 +1,122 @@
+import unittest
+import sqlite3
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import cohort
+import plan_validator
+from cohort import Student
+from db_fixture import DatabaseTestCase
+
+# students added on top of the two seeded ones
+COHORT_IDS = range(1700000, 1700030)
+
+class TestTermSequence(unittest.TestCase):
+
+    def test_alternates_fall_and_spring(self):
+        self.assertEqual(cohort.term_sequence("Fall 2025", 4),
+                         [("Fall", 2025), ("Spring", 2026), ("Fall", 2026), ("Spring", 2027)])
+        self.assertEqual(cohort.term_sequence("Spring 2026", 2), [("Spring", 2026), ("Fall", 2026)])
+        self.assertEqual(len(cohort.term_sequence("Fall 2025")), cohort.NUM_SEMESTERS)
+
+    def test_invalid(self):
+        for start_term in ["Fall", "Summer 2025", "Fall twenty"]:
+            with self.assertRaises(ValueError):
+                cohort.term_sequence(start_term)
+
+class TestCohort(DatabaseTestCase):
+
+    seed_sql = """ INSERT INTO Students (id, f_name, l_name, username, password, major_id, advisor_id)
+                   VALUES {} """.format(", ".join(f"({student_id}, 'New', 'Student', 's{student_id}', 'x', 1, 3409243)"
+                                                  for student_id in COHORT_IDS))
+
+    def setUp(self):
+        super().setUp()
+        self.students = [Student(student_id, 1, 1 + n % 9, "Fall 2025" if n % 2 else "Spring 2027")
+                         for n, student_id in enumerate(COHORT_IDS)]
+
+    def query(self, sql, params=()):
+        con = sqlite3.connect(self.db_path)
+        rows = con.execute(sql, params).fetchall()
+        con.close()
+        return rows
+
+    def courses_by_student(self, name):
+        rows = self.query(""" SELECT p.student_id, psc.semester_id, psc.course_subject, psc.course_number
+                              FROM Plans p JOIN Plan_Semester_Courses psc ON psc.plan_id = p.id
+                              WHERE p.name = ? """, (name,))
+        courses = {}
+        for student_id, *course in rows:
+            courses.setdefault(student_id, set()).add(tuple(course))
+        return courses
+
+    def test_read_students(self):
+        path = os.path.join(self.tmpdir.name, "cohort.csv")
+        with open(path, "w") as f:
+            f.write("student_id,major,concentration,start_term\n"
+                    "1700000,Computer Science,\"Data Science, B.S.\",Fall 2025\n"
+                    "1700001,1,,Spring 2026\n")
+        self.assertEqual(cohort.read_students(path), [Student(1700000, 1, 2, "Fall 2025"),
+                                                      Student(1700001, 1, None, "Spring 2026")])
+        with open(path, "a") as f:
+            f.write("1700002,Basket Weaving,,Fall 2025\n")
+        with self.assertRaisesRegex(ValueError, "line 4: unknown major"):
+            cohort.read_students(path)
+
+    def test_generate_cohort(self):
+        result = cohort.generate_cohort(self.students + [Student(42, 1, 1, "Fall 2025"), self.students[0]],
+                                        workers=0, chunk_size=7)
+        self.assertEqual((result["plans"], result["skipped"], result["unknown"]), (30, 1, 1))
+        self.assertGreater(result["plans_per_second"], 0)
+
+        plans = self.query(""" SELECT id, student_id, advisor_id, major_id, concentration_id, num_semesters
+                               FROM Plans WHERE name = ? """, (cohort.DEFAULT_PLAN_NAME,))
+        self.assertEqual(sorted(row[1] for row in plans), list(COHORT_IDS))
+        self.assertTrue(all(row[2] == 3409243 and row[5] == cohort.NUM_SEMESTERS for row in plans))
+        # Spring 2027 starts run past the seeded semesters, which end in Spring 2029
+        self.assertEqual(self.query("SELECT COUNT(*) FROM Semesters WHERE year = 2030"), [(2,)])
+        self.assertTrue(all(self.query("SELECT COUNT(*) FROM Plan_Semesters WHERE plan_id = ?", (row[0],))[0][0] == 8
+                            for row in plans))
+
+        plan_ids = [row[0] for row in plans]
+        results = plan_validator.validate_all_plans(plan_ids)
+        self.assertEqual(results, {plan_id: [] for plan_id in plan_ids})
+        courses = self.courses_by_student(cohort.DEFAULT_PLAN_NAME)
+        self.assertTrue(all(len(courses[student_id]) >= 29 for student_id in COHORT_IDS))
+
+    def test_worker_processes_match_inline(self):
+        progress = []
+        cohort.generate_cohort(self.students, "Parallel", workers=2, chunk_size=8,
+                               progress=lambda done, total, rate: progress.append((done, total)))
+        cohort.generate_cohort(self.students, "Inline", workers=0)
+        self.assertEqual(self.courses_by_student("Parallel"), self.courses_by_student("Inline"))
+        # chunks of 8, 8, 8 and 6 finish in any order
+        self.assertEqual(len(progress), 4)
+        self.assertEqual(max(progress), (30, 30))
+
+    def test_resume_after_interruption(self):
+        write_plans = cohort.write_plans
+        calls = []
+
+        def interrupted(*args):
+            calls.append(1)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            write_plans(*args)
+
+        with patch('cohort.write_plans', side_effect=interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                cohort.generate_cohort(self.students, workers=0, chunk_size=10)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM Plans WHERE name = ?", (cohort.DEFAULT_PLAN_NAME,)), [(20,)])
+
+        result = cohort.generate_cohort(self.students, workers=0, chunk_size=10)
+        self.assertEqual((result["plans"], result["skipped"]), (10, 20))
+        rows = self.query(""" SELECT student_id, COUNT(*) FROM Plans WHERE name = ?
+                              GROUP BY student_id """, (cohort.DEFAULT_PLAN_NAME,))
+        self.assertEqual(rows, [(student_id, 1) for student_id in COHORT_IDS])
+
+if __name__ == '__main__':
+    unittest.main()
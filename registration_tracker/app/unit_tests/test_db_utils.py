@@ -0,0 +1,222 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sqlite3
+import threading
+import sys
+import os
+import tempfile
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_utils
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.opened = 0
+
+        def factory():
+            self.opened += 1
+            return sqlite3.connect(self.db_path, check_same_thread=False)
+
+        self.pool = db_utils.set_connection_factory(factory, size=2)
+
+    def tearDown(self):
+        db_utils.set_connection_factory(None)
+        self.tmpdir.cleanup()
+
+    def test_connection_is_reused(self):
+        con = db_utils.get_db_connection()
+        con.execute("CREATE TABLE T (x INTEGER)")
+        con.commit()
+        con.close()
+
+        con = db_utils.get_db_connection()
+        con.execute("SELECT * FROM T").fetchall()
+        con.close()
+
+        # Only one physical connection was ever opened
+        self.assertEqual(self.opened, 1)
+
+    def test_row_factory_applied(self):
+        con = db_utils.get_db_connection()
+        row = con.execute("SELECT 1 AS one").fetchone()
+        con.close()
+        self.assertEqual(row['one'], 1)
+
+    def test_close_twice_is_safe(self):
+        con = db_utils.get_db_connection()
+        con.close()
+        con.close()
+        self.assertEqual(self.pool._idle.qsize(), 1)
+
+    def test_use_after_close_raises(self):
+        con = db_utils.get_db_connection()
+        con.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            con.execute("SELECT 1")
+
+    def test_uncommitted_work_rolled_back_on_release(self):
+        con = db_utils.get_db_connection()
+        con.execute("CREATE TABLE T (x INTEGER)")
+        con.commit()
+        con.execute("INSERT INTO T VALUES (1)")
+        con.close()  # no commit
+
+        con = db_utils.get_db_connection()
+        count = con.execute("SELECT COUNT(*) FROM T").fetchone()[0]
+        con.close()
+        self.assertEqual(count, 0)
+
+    def test_nested_acquire_does_not_block(self):
+        # Pool of 2, but one thread may nest deeper without deadlocking
+        cons = [db_utils.get_db_connection() for _ in range(4)]
+        for con in cons:
+            con.close()
+        # Only `size` connections are kept idle afterwards
+        self.assertEqual(self.pool._idle.qsize(), 2)
+
+    def test_pool_is_bounded_across_threads(self):
+        self.pool.timeout = 0.1
+        held = [db_utils.get_db_connection()]
+        errors = []
+
+        def borrow():
+            con = db_utils.get_db_connection()
+            held.append(con)
+
+        t = threading.Thread(target=borrow)
+        t.start()
+        t.join()
+
+        def borrow_too_many():
+            try:
+                db_utils.get_db_connection()
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=borrow_too_many)
+        t.start()
+        t.join()
+
+        self.assertEqual(len(errors), 1)
+        for con in held:
+            con.close()
+
+    def test_dropped_connection_returns_its_slot(self):
+        self.pool.timeout = 1
+        errors = []
+
+        def leak():
+            # borrowed and never closed
+            con = db_utils.get_db_connection()
+            con.execute("SELECT 1").fetchone()
+
+        for _ in range(3):
+            t = threading.Thread(target=leak)
+            t.start()
+            t.join()
+
+        def borrow():
+            try:
+                db_utils.get_db_connection().close()
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=borrow)
+        t.start()
+        t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.pool._held(), 0)
+
+    def test_context_manager_commits_and_returns(self):
+        with db_utils.get_db_connection() as con:
+            con.execute("CREATE TABLE T (x INTEGER)")
+            con.execute("INSERT INTO T VALUES (1)")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            con.execute("SELECT 1")
+        self.assertEqual(self.pool._idle.qsize(), 1)
+
+        with self.assertRaises(ValueError):
+            with db_utils.get_db_connection() as con:
+                con.execute("INSERT INTO T VALUES (2)")
+                raise ValueError
+        with db_utils.get_db_connection() as con:
+            self.assertEqual([row[0] for row in con.execute("SELECT x FROM T")], [1])
+        self.assertEqual(self.pool._idle.qsize(), 1)
+
+    def test_set_connection_factory_accepts_fakes(self):
+        mock_conn = MagicMock()
+        mock_conn.in_transaction = False
+        db_utils.set_connection_factory(lambda: mock_conn)
+
+        con = db_utils.get_db_connection()
+        con.execute("SELECT 1")
+        con.close()
+
+        mock_conn.execute.assert_called_with("SELECT 1")
+        self.assertEqual(mock_conn.row_factory, sqlite3.Row)
+        mock_conn.close.assert_not_called()
+
+    def test_storage_profile_applied_on_open(self):
+        con = db_utils.get_db_connection()
+        journal_mode = con.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = con.execute("PRAGMA synchronous").fetchone()[0]
+        busy_timeout = con.execute("PRAGMA busy_timeout").fetchone()[0]
+        con.close()
+
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertEqual(busy_timeout, 5000)
+
+    def test_legacy_profile(self):
+        db_utils.set_connection_factory(
+            lambda: sqlite3.connect(self.db_path, check_same_thread=False),
+            profile="legacy"
+        )
+        con = db_utils.get_db_connection()
+        journal_mode = con.execute("PRAGMA journal_mode").fetchone()[0]
+        con.close()
+        self.assertEqual(journal_mode, "delete")
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            db_utils.get_storage_profile("turbo")
+
+class TestCascadeDelete(unittest.TestCase):
+
+    def setUp(self):
+        self.con = sqlite3.connect(":memory:")
+        self.con.executescript("""
+            CREATE TABLE Parent (id INTEGER PRIMARY KEY);
+            CREATE TABLE Child (parent_id INTEGER, FOREIGN KEY(parent_id) REFERENCES Parent(id));
+            INSERT INTO Parent VALUES (1), (2);
+            INSERT INTO Child VALUES (1), (1), (2);
+        """)
+
+    def tearDown(self):
+        self.con.close()
+
+    def test_counts_per_table(self):
+        counts = db_utils.cascade_delete(self.con, [
+            ("Child", "DELETE FROM Child WHERE parent_id = ?", (1,)),
+            ("Parent", "DELETE FROM Parent WHERE id = ?", (1,)),
+        ])
+        self.assertEqual(counts, {"Child": 2, "Parent": 1})
+        self.assertEqual(self.con.execute("SELECT COUNT(*) FROM Child").fetchone()[0], 1)
+
+    def test_missed_child_rolls_back(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            db_utils.cascade_delete(self.con, [
+                ("Child", "DELETE FROM Child WHERE parent_id = ?", (1,)),
+                ("Parent", "DELETE FROM Parent", ()),
+            ])
+        self.assertEqual(self.con.execute("SELECT COUNT(*) FROM Child").fetchone()[0], 3)
+        self.assertEqual(self.con.execute("SELECT COUNT(*) FROM Parent").fetchone()[0], 2)
+        # enforcement is switched back off for the next user of the connection
+        self.assertEqual(self.con.execute("PRAGMA foreign_keys").fetchone()[0], 0)
+
+if __name__ == '__main__':
+    unittest.main()
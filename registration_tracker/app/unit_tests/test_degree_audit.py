@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import degree_audit
+import reads
+import requirements
+import scheduler
+from db_fixture import DatabaseTestCase
+from controllers import plans
+
+class TestDegreeAudit(DatabaseTestCase):
+    """
+    Plan 1 (major 1, concentration 1) gets core, math and concentration
+    courses plus ARTZ 1000, which no requirement section lists.
+    """
+
+    seed_sql = """
+        INSERT INTO Plan_Semester_Courses VALUES
+            (1, 1, 'ITSC', 1212), (1, 1, 'MATH', 1103),
+            (1, 2, 'MATH', 1241), (1, 2, 'ITCS', 3153), (1, 2, 'ARTZ', 1000);
+        INSERT INTO Courses VALUES ('ARTZ', 1000, 'Studio Art', 3);
+    """
+
+    def by_name(self, audit):
+        return {progress.section.name: progress for progress in audit.sections}
+
+    def test_section_progress(self):
+        audit = degree_audit.audit_plan(1)
+        self.assertEqual(len(audit.sections), 12)
+        self.assertEqual(audit.credits_required, sum(section.credits_required
+                                                     for section in requirements.get_sections(1, 1)))
+        self.assertEqual(audit.total_credits, plans.load_plan_snapshot(1).total_credits)
+        self.assertFalse(audit.complete)
+
+        core = audit.sections[0]
+        self.assertEqual(core.section.name, "Core Courses")
+        self.assertIn(('ITSC', 1212), core.courses)
+        self.assertNotIn((('ITSC', 1212),), core.missing_groups)
+        self.assertIn((('ITSC', 1213),), core.missing_groups)
+        self.assertIn("ITSC 1213", requirements.describe_missing(core))
+
+    def test_course_counted_once(self):
+        audit = degree_audit.audit_plan(1)
+        sections = [progress for progress in audit.sections if ('ITCS', 3153) in progress.courses]
+        self.assertEqual(len(sections), 1)
+        counted = [course for progress in audit.sections for course in progress.courses]
+        self.assertEqual(len(counted), len(set(counted)))
+        self.assertEqual(audit.credits_counted, sum(min(progress.credits, progress.section.credits_required)
+                                                    for progress in audit.sections))
+        self.assertEqual(audit.other_courses, (('ARTZ', 1000),))
+
+    def test_generated_plan_leaves_only_unfillable_sections(self):
+        plan_id = plans.create_plan(1600343, 3409243, "Generated", 1, 1, "Fall 2025")
+        unmet = scheduler.generate_plan(plan_id)["schedule"].unmet
+        audit = degree_audit.audit_plan(plan_id)
+        outstanding = [(progress.section.name, progress.missing_credits)
+                       for progress in audit.sections if not requirements.is_complete(progress)]
+        self.assertEqual(outstanding, unmet)
+
+    def test_one_bulk_load(self):
+        statements = self.trace_statements()
+        degree_audit.audit_plan(1)
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        # the plan, its courses and the requirement sections
+        self.assertEqual(len(selects), 3)
+
+    def test_memoized_per_plan_revision(self):
+        audit = reads.get_degree_audit(1)
+        self.assertIs(reads.get_degree_audit(1), audit)
+        self.assertIs(reads.get_degree_audit(1), audit)
+
+        plans.add_plan_courses(1, [(2, ('ITSC', 1213))])
+        revised = reads.get_degree_audit(1)
+        self.assertIsNot(revised, audit)
+        self.assertIn(('ITSC', 1213), self.by_name(revised)["Core Courses"].courses)
+        self.assertIs(reads.get_degree_audit(1), revised)
+        self.assertIsNone(degree_audit.audit_plan(9999))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import eligibility
+import prereq_graph
+from db_fixture import DatabaseTestCase
+
+def per_course_available(con, plan_id, semester_id, major_id):
+    """The original algorithm: one prerequisite check (and its queries) per candidate."""
+    con.row_factory = sqlite3.Row
+    concentration_id = con.execute("SELECT concentration_id FROM Plans WHERE id = ?", (plan_id,)).fetchone()[0]
+    planned = {(r[0], r[1]) for r in con.execute(
+        "SELECT course_subject, course_number FROM Plan_Semester_Courses WHERE plan_id = ?", (plan_id,))}
+    rows = con.execute(eligibility.MAJOR_REQUIREMENTS_QUERY, (major_id,)).fetchall()
+    if concentration_id:
+        rows += con.execute(eligibility.CONCENTRATION_REQUIREMENTS_QUERY, (concentration_id,)).fetchall()
+    rows += con.execute(eligibility.GEN_ED_REQUIREMENTS_QUERY).fetchall()
+
+    semesters = [r[0] for r in con.execute("""
+        SELECT ps.semester_id FROM Plan_Semesters ps JOIN Semesters s ON ps.semester_id = s.id
+        WHERE ps.plan_id = ? ORDER BY s.year, CASE WHEN s.term = 'Spring' THEN 0 ELSE 1 END""", (plan_id,))]
+
+    available = []
+    for row in rows:
+        if (row[0], row[1]) in planned:
+            continue
+        prereqs = con.execute("""SELECT group_id, course_subject, course_number FROM Prerequisites
+                                 WHERE parent_subject = ? AND parent_number = ?""", (row[0], row[1])).fetchall()
+        if prereqs:
+            if semester_id not in semesters:
+                continue
+            previous = []
+            for sem in semesters[:semesters.index(semester_id)]:
+                previous += [(r[0], r[1]) for r in con.execute(
+                    """SELECT course_subject, course_number FROM Plan_Semester_Courses
+                       WHERE plan_id = ? AND semester_id = ?""", (plan_id, sem))]
+            groups = {}
+            for p in prereqs:
+                groups.setdefault(p[0], []).append((p[1], p[2]))
+            if not all(any(c in previous for c in group) for group in groups.values()):
+                continue
+        available.append({'subject': row[0], 'number': row[1], 'name': row[2],
+                          'credits': row[3], 'section': row[4]})
+    return available
+
+class TestEligibility(DatabaseTestCase):
+
+    # plan 1 gets a few more semesters and some courses
+    seed_sql = """
+        INSERT INTO Plan_Semesters VALUES (3, 1), (4, 1);
+        INSERT INTO Plan_Semester_Courses VALUES
+            (1, 1, 'ITSC', 1212), (1, 1, 'MATH', 1103),
+            (1, 2, 'ITSC', 1213), (1, 2, 'MATH', 1241),
+            (1, 3, 'ITSC', 2214);
+    """
+
+    def test_matches_per_course_checks(self):
+        con = sqlite3.connect(self.db_path)
+        for semester_id in (1, 2, 3, 4, 8):
+            with self.subTest(semester_id=semester_id):
+                expected = per_course_available(con, 1, semester_id, 1)
+                self.assertEqual(eligibility.get_available_courses(1, semester_id, 1), expected)
+        con.close()
+
+    def test_prerequisites_unlock_in_later_semesters(self):
+        def keys(courses):
+            return {(c['subject'], c['number']) for c in courses}
+        self.assertNotIn(('ITSC', 3155), keys(eligibility.get_available_courses(1, 3, 1)))
+        self.assertIn(('ITSC', 3155), keys(eligibility.get_available_courses(1, 4, 1)))
+
+    def test_constant_number_of_queries(self):
+        statements = self.trace_statements()
+        prereq_graph.get_graph()
+        del statements[:]
+
+        eligibility.get_available_courses(1, 4, 1)
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        self.assertLessEqual(len(selects), 5)
+
+    def test_matrix_matches_per_semester_results(self):
+        matrix = eligibility.get_eligibility_matrix(1, 1)
+        self.assertEqual(list(matrix), [1, 2, 3, 4])
+        for semester_id, courses in matrix.items():
+            with self.subTest(semester_id=semester_id):
+                self.assertEqual(courses, eligibility.get_available_courses(1, semester_id, 1))
+
+    def test_matrix_query_count_independent_of_semesters(self):
+        statements = self.trace_statements()
+        prereq_graph.get_graph()
+        del statements[:]
+
+        eligibility.get_eligibility_matrix(1, 1)
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        self.assertLessEqual(len(selects), 5)
+
+    def test_evaluate_candidates(self):
+        graph = prereq_graph.PrerequisiteGraph([('ITSC', 1213, 0, 'ITSC', 1212)])
+        candidates = [
+            {'subject': 'ITSC', 'number': 1212, 'name': 'CS I', 'credits': 4, 'section': 'Core'},
+            {'subject': 'ITSC', 'number': 1213, 'name': 'CS II', 'credits': 4, 'section': 'Core'},
+        ]
+        self.assertEqual(eligibility.evaluate_candidates(candidates, set(), set(), graph), candidates[:1])
+        self.assertEqual(eligibility.evaluate_candidates(candidates, {('ITSC', 1212)}, {('ITSC', 1212)}, graph),
+                         candidates[1:])
+        # target semester not in the plan: only courses without prerequisites
+        self.assertEqual(eligibility.evaluate_candidates(candidates, set(), None, graph), candidates[:1])
+
+    def test_section_index_matches_per_course_queries(self):
+        index = eligibility.get_section_index(1, 1)
+        con = sqlite3.connect(self.db_path)
+        self.assertEqual(index.sections["major"], tuple(
+            r[0] for r in con.execute("SELECT section FROM Major_Sections WHERE major_id = 1 ORDER BY id")))
+        for course in eligibility.get_requirement_courses(1, 1):
+            subject, number = course['subject'], course['number']
+            with self.subTest(course=(subject, number)):
+                major = con.execute("""SELECT ms.section FROM Major_Sections ms
+                                       JOIN Major_Section_Requirements msr ON ms.id = msr.section_id
+                                       WHERE ms.major_id = 1 AND msr.course_subject = ? AND msr.course_number = ?
+                                       ORDER BY ms.id""", (subject, number)).fetchone()
+                conc = con.execute("""SELECT cs.section FROM Concentration_Sections cs
+                                      JOIN Concentration_Section_Requirements csr ON cs.id = csr.section_id
+                                      WHERE cs.concentration_id = 1 AND csr.course_subject = ? AND csr.course_number = ?
+                                      ORDER BY cs.id""", (subject, number)).fetchone()
+                gen_ed = con.execute("""SELECT ges.section FROM Gen_Ed_Sections ges
+                                        JOIN Gen_Ed_Section_Requirements ger ON ges.id = ger.section_id
+                                        WHERE ger.course_subject = ? AND ger.course_number = ?
+                                        ORDER BY ges.id""", (subject, number)).fetchone()
+                if major:
+                    expected = ("major", major[0])
+                elif conc:
+                    expected = ("concentration", conc[0])
+                else:
+                    expected = ("gen_ed", gen_ed[0])
+                self.assertEqual(index.courses[(subject, int(number))], expected)
+        con.close()
+
+    def test_section_index_cached(self):
+        statements = self.trace_statements()
+        first = eligibility.get_section_index(1, None)
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+        self.assertEqual(first.sections["concentration"], ())
+        del statements[:]
+        self.assertIs(eligibility.get_section_index(1, None), first)
+        self.assertEqual(statements, [])
+
+    def test_group_by_section(self):
+        index = eligibility.SectionIndex(
+            {"major": ("Core", "Electives"), "concentration": (), "gen_ed": ("Writing",)},
+            {('ITSC', 1212): ("major", "Core"), ('ENGL', 1101): ("gen_ed", "Writing")})
+        courses = [
+            {'subject': 'ITSC', 'number': '1212', 'name': 'CS I', 'credits': 4, 'section': 'Core'},
+            {'subject': 'ENGL', 'number': 1101, 'name': 'Writing', 'credits': 3, 'section': 'Writing'},
+            {'subject': 'ART', 'number': 1000, 'name': 'Art', 'credits': 3, 'section': 'Arts'},
+        ]
+        self.assertEqual(eligibility.group_by_section(courses, index), {
+            "major": {"Core": courses[:1], "Electives": []},
+            "concentration": {},
+            "gen_ed": {"Writing": courses[1:2], eligibility.OTHER_SECTION: courses[2:]},
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import graduation
+import prereq_analysis
+import prereq_graph
+import reads
+import scheduler
+from requirements import Section
+from db_fixture import DatabaseTestCase
+from controllers import plans, prerequisites
+
+ROWS = [
+    ('CS', 2, 0, 'CS', 1),
+    ('CS', 3, 0, 'CS', 2),
+    ('CS', 4, 0, 'CS', 3),
+    # CS 5 needs one of CS 4 / MATH 1
+    ('CS', 5, 0, 'CS', 4),
+    ('CS', 5, 0, 'MATH', 1),
+    ('CS', 6, 0, 'XYZ', 1),
+]
+CREDITS = {course: 3 for course in [('CS', 1), ('CS', 2), ('CS', 3), ('CS', 4), ('CS', 5), ('CS', 6),
+                                    ('MATH', 1), ('ART', 1), ('ART', 2), ('ART', 3)]}
+
+class TestEstimate(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = prereq_graph.PrerequisiteGraph(ROWS)
+        self.analysis = prereq_analysis.PrerequisiteAnalysis(self.graph, CREDITS)
+
+    def estimate(self, sections, history, credit_cap=scheduler.MAX_CREDITS):
+        return graduation.estimate(history, sections, self.graph, self.analysis, CREDITS, credit_cap)
+
+    def test_critical_path(self):
+        sections = [Section("major", 1, "Core", 6, ((('CS', 4),), (('ART', 1),)))]
+        result = self.estimate(sections, [(1, set()), (2, set())])
+        self.assertEqual(result.critical_path, (('CS', 1), ('CS', 2), ('CS', 3), ('CS', 4)))
+        self.assertEqual((result.terms, result.remaining_terms), (4, 4))
+        self.assertEqual(result.remaining_credits, 15)
+
+    def test_planned_courses_shorten_the_chain(self):
+        sections = [Section("major", 1, "Core", 3, ((('CS', 4),),))]
+        history = [(1, {('CS', 1)}), (2, {('CS', '2')}), (3, set())]
+        result = self.estimate(sections, history)
+        self.assertEqual(result.critical_path, (('CS', 3), ('CS', 4)))
+        # CS 3 can go in the third semester at the earliest
+        self.assertEqual((result.terms, result.remaining_terms), (4, 2))
+
+    def test_cheapest_alternative(self):
+        sections = [Section("major", 1, "Core", 3, ((('CS', 5),),))]
+        result = self.estimate(sections, [(1, set())])
+        self.assertEqual(result.critical_path, (('MATH', 1), ('CS', 5)))
+        self.assertEqual(result.terms, 2)
+
+    def test_credit_cap_bound(self):
+        arts = ((('ART', 1),), (('ART', 2),), (('ART', 3),))
+        sections = [Section("gen_ed", 1, "Arts", 9, arts)]
+        self.assertEqual(self.estimate(sections, [(1, set())], credit_cap=3).terms, 3)
+        # a full first semester pushes everything later
+        self.assertEqual(self.estimate(sections, [(1, {('CS', 1)}), (2, set())], credit_cap=3).terms, 4)
+
+    def test_nothing_left(self):
+        sections = [Section("major", 1, "Core", 3, ((('CS', 1),),))]
+        result = self.estimate(sections, [(1, {('CS', 1)}), (2, set())])
+        self.assertEqual((result.terms, result.remaining_terms, result.critical_path), (1, 0, ()))
+
+    def test_blocked_and_unmet(self):
+        sections = [Section("major", 1, "Core", 6, ((('CS', 6),), (('XYZ', 2),)))]
+        result = self.estimate(sections, [(1, set())])
+        self.assertEqual(result.remaining, ())
+        self.assertEqual(result.unmet, (("Core", 6),))
+
+    def test_next_term(self):
+        self.assertEqual(graduation.next_term("Fall", 2025), ("Spring", 2026))
+        self.assertEqual(graduation.next_term("Spring", 2026), ("Fall", 2026))
+
+class TestEarliestGraduation(DatabaseTestCase):
+
+    def test_plan_with_two_semesters(self):
+        result = graduation.earliest_graduation(1)
+        self.assertEqual(result.critical_path[:2], (('ITSC', 1212), ('ITSC', 1213)))
+        self.assertGreater(result.terms, 2)
+        # counted on past the plan's Fall 2025 and Spring 2026
+        term = ("Spring", 2026)
+        for _ in range(result.terms - 2):
+            term = graduation.next_term(*term)
+        self.assertEqual(result.graduation_term, term)
+        self.assertIsNone(graduation.earliest_graduation(9999))
+
+    def test_generated_plan_needs_no_more_terms(self):
+        plan_id = plans.create_plan(1600343, 3409243, "Generated", 1, 1, "Fall 2025")
+        before = graduation.earliest_graduation(plan_id)
+        scheduler.generate_plan(plan_id)
+        after = graduation.earliest_graduation(plan_id)
+        self.assertEqual((after.remaining_terms, after.remaining, after.critical_path), (0, (), ()))
+        self.assertGreaterEqual(after.terms, before.terms)
+        snapshot = plans.load_plan_snapshot(plan_id)
+        last = snapshot.semesters[after.terms - 1]
+        self.assertEqual(after.graduation_term, (last.term, last.year))
+
+    def test_cached_per_plan_and_catalog_version(self):
+        result = reads.get_earliest_graduation(1)
+        self.assertIs(reads.get_earliest_graduation(1), result)
+
+        plans.add_plan_courses(1, [(1, ('ITSC', 1212))])
+        edited = reads.get_earliest_graduation(1)
+        self.assertIsNot(edited, result)
+        self.assertNotIn(('ITSC', 1212), edited.critical_path)
+        self.assertIs(reads.get_earliest_graduation(1), edited)
+
+        self.assertTrue(prerequisites.add_prereq('ITSC', 1212, 0, 'MATH', 1101)['success'])
+        self.assertIsNot(reads.get_earliest_graduation(1), edited)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,22 +7,13 @@ import os
 # Add parent directory to path to import the controllers
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from controllers import majors
+import db_utils
 
 class TestMajorsController(unittest.TestCase):
     
-    @patch('controllers.majors.sqlite3.connect')
-    def test_get_db_connection(self, mock_connect):
-        # Set up the mock
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-        
-        # Call the function
-        conn = majors.get_db_connection()
-        
-        # Assertions
-        mock_connect.assert_called_once_with(majors.DB_NAME)
-        self.assertEqual(conn, mock_conn)
-        self.assertEqual(conn.row_factory, sqlite3.Row)
+    def test_get_db_connection(self):
+        # Controllers borrow connections from the shared pool
+        self.assertIs(majors.get_db_connection, db_utils.get_db_connection)
     
     @patch('controllers.majors.get_db_connection')
     def test_get_major(self, mock_get_conn):
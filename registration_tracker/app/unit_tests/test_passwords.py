@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import passwords
+
+class TestPasswords(unittest.TestCase):
+
+    def test_hash_and_verify(self):
+        stored = passwords.hash_password("pword", iterations=1000)
+        self.assertTrue(stored.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(passwords.verify_password("pword", stored))
+        self.assertFalse(passwords.verify_password("wrong", stored))
+
+    def test_hashes_are_salted(self):
+        self.assertNotEqual(passwords.hash_password("pword", iterations=1000),
+                            passwords.hash_password("pword", iterations=1000))
+
+    def test_plaintext_still_verifies(self):
+        self.assertTrue(passwords.verify_password("pword", "pword"))
+        self.assertFalse(passwords.verify_password("pword", "other"))
+
+    def test_malformed_hash_rejected(self):
+        self.assertFalse(passwords.verify_password("pword", "pbkdf2_sha256$abc"))
+
+    def test_needs_rehash(self):
+        self.assertTrue(passwords.needs_rehash("pword"))
+        self.assertTrue(passwords.needs_rehash(passwords.hash_password("pword", iterations=1000), iterations=2000))
+        self.assertFalse(passwords.needs_rehash(passwords.hash_password("pword", iterations=1000), iterations=1000))
+
+    def test_verify_on_worker_pool(self):
+        stored = passwords.hash_password("pword", iterations=1000)
+        futures = [passwords.verify_password_async(guess, stored) for guess in ("pword", "wrong")]
+        self.assertEqual([f.result() for f in futures], [True, False])
+
+    def test_hash_many_keeps_order(self):
+        hashes = passwords.hash_passwords(["a", "b", "c"], iterations=1000)
+        self.assertEqual([passwords.verify_password(p, h) for p, h in zip("abc", hashes)], [True] * 3)
+        self.assertFalse(passwords.verify_password("a", hashes[1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import random
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import plan_validator
+import prereq_graph
+import read_cache
+from db_fixture import DatabaseTestCase
+from controllers import plans, prerequisites
+
+# (parent_subject, parent_number, group_id, course_subject, course_number)
+PREREQ_ROWS = [
+    ('ITSC', 1213, 0, 'ITSC', 1212),
+    ('ITSC', 1213, 1, 'MATH', 1103),
+    ('ITSC', 1213, 1, 'MATH', 1241),
+    ('ITSC', 2214, 0, 'ITSC', 1213),
+    ('ITSC', 2175, 0, 'ITSC', 1213),
+]
+
+def violation_keys(violations):
+    return [(v.semester_id, v.subject, v.number) for v in violations]
+
+class TestPlanValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = prereq_graph.PrerequisiteGraph(PREREQ_ROWS)
+        self.history = [
+            (10, {('ITSC', 1212), ('MATH', 1241)}),
+            (11, {('ITSC', 1213)}),
+            (12, {('ITSC', 2214), ('ITSC', 2175)}),
+        ]
+        self.validator = plan_validator.PlanValidator(1, self.history, self.graph)
+
+    def test_valid_plan(self):
+        self.assertEqual(self.validator.get_violations(), [])
+
+    def test_violation_lists_missing_groups(self):
+        validator = plan_validator.PlanValidator(1, [(10, {('ITSC', 1213)})], self.graph)
+        violation, = validator.get_violations()
+        self.assertEqual((violation.plan_id, violation.semester_id, violation.subject, violation.number),
+                         (1, 10, 'ITSC', 1213))
+        self.assertEqual(violation.missing, self.graph.get_groups('ITSC', 1213))
+
+    def test_remove_flags_downstream(self):
+        violations = self.validator.remove('ITSC', 1213, 11)
+        self.assertEqual(violation_keys(violations), [(12, 'ITSC', 2175), (12, 'ITSC', 2214)])
+        # putting it back clears them again
+        self.assertEqual(self.validator.add('ITSC', '1213', 11), [])
+
+    def test_remove_or_alternative(self):
+        self.validator.add('MATH', 1103, 10)
+        self.assertEqual(self.validator.remove('MATH', 1241, 10), [])
+        self.assertEqual(violation_keys(self.validator.remove('MATH', 1103, 10)), [(11, 'ITSC', 1213)])
+
+    def test_move(self):
+        violations = self.validator.move('ITSC', 1212, 10, 11)
+        self.assertEqual(violation_keys(violations), [(11, 'ITSC', 1213)])
+        self.assertEqual(self.validator.move('ITSC', 1212, 11, 10), [])
+
+    def test_set_graph_rechecks_changed_courses(self):
+        rows = PREREQ_ROWS + [('ITSC', 2214, 1, 'ITSC', 3155)]
+        violations = self.validator.set_graph(prereq_graph.PrerequisiteGraph(rows))
+        violation, = violations
+        self.assertEqual((violation.subject, violation.number), ('ITSC', 2214))
+        self.assertEqual(violation.missing, (frozenset({('ITSC', 3155)}),))
+
+    def test_incremental_matches_full_validation(self):
+        rng = random.Random(4155)
+        courses = [('ITSC', 1212), ('MATH', 1103), ('MATH', 1241), ('ITSC', 1213), ('ITSC', 2214), ('ITSC', 2175)]
+        semesters = [10, 11, 12]
+        for _ in range(300):
+            subject, number = rng.choice(courses)
+            action = rng.choice(("add", "remove", "move"))
+            if action == "add":
+                self.validator.add(subject, number, rng.choice(semesters))
+            elif action == "remove":
+                self.validator.remove(subject, number, rng.choice(semesters))
+            else:
+                self.validator.move(subject, number, rng.choice(semesters), rng.choice(semesters))
+            history = [(semester_id, {course for course, placed in self.validator.scheduled.items()
+                                      if semester_id in placed})
+                       for semester_id in semesters]
+            expected = plan_validator.PlanValidator(1, history, self.graph).get_violations()
+            self.assertEqual(self.validator.get_violations(), expected)
+
+class TestPlanValidation(DatabaseTestCase):
+
+    seed_sql = """
+        INSERT INTO Plan_Semester_Courses VALUES
+            (1, 1, 'ITSC', 1212), (1, 1, 'MATH', 1101),
+            (1, 2, 'ITSC', 1213);
+    """
+
+    def test_plan_histories_match_single_plan(self):
+        suggestion_id = plans.clone_plan(1, as_suggestion_by=3409243, name="Suggestion")
+        histories = plans.get_plan_histories()
+        self.assertEqual(histories[1], plans.get_plan_history(1))
+        self.assertEqual(histories[suggestion_id], plans.get_plan_history(suggestion_id))
+        self.assertEqual(list(plans.get_plan_histories([suggestion_id])), [suggestion_id])
+        self.assertEqual(plans.get_plan_histories([]), {})
+
+    def test_validate_all_plans(self):
+        self.assertEqual(plan_validator.validate_all_plans(), {1: []})
+
+        con = sqlite3.connect(self.db_path)
+        con.execute("DELETE FROM Plan_Semester_Courses WHERE course_subject = 'ITSC' AND course_number = 1212")
+        con.commit()
+        con.close()
+        self.assertEqual(violation_keys(plan_validator.validate_all_plans()[1]), [(2, 'ITSC', 1213)])
+
+    def test_validator_reused_until_plan_changes(self):
+        validator = plan_validator.get_validator(1)
+        self.assertIs(plan_validator.get_validator(1), validator)
+
+        read_cache.invalidate("plan", 1)
+        self.assertIsNot(plan_validator.get_validator(1), validator)
+
+    def test_recorded_edit_kept(self):
+        validator = plan_validator.get_validator(1)
+        read_cache.invalidate("plan", 1)
+        validator.remove('ITSC', 1212, 1)
+        plan_validator.record_edit(1, validator)
+        self.assertIs(plan_validator.get_validator(1), validator)
+        self.assertEqual(violation_keys(validator.get_violations()), [(2, 'ITSC', 1213)])
+
+    def test_prerequisite_edit_rechecks_cached_validator(self):
+        validator = plan_validator.get_validator(1)
+        self.assertEqual(validator.get_violations(), [])
+
+        self.assertTrue(prerequisites.add_prereq('ITSC', 1213, 5, 'ITSC', 3155)['success'])
+        self.assertIs(plan_validator.get_validator(1), validator)
+        self.assertEqual(violation_keys(validator.get_violations()), [(2, 'ITSC', 1213)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,22 +7,13 @@ import os
 # Add parent directory to path to import the controllers
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from controllers import plans
+import db_utils
 
 class TestPlansController(unittest.TestCase):
     
-    @patch('controllers.plans.sqlite3.connect')
-    def test_get_db_connection(self, mock_connect):
-        # Set up the mock
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-        
-        # Call the function
-        conn = plans.get_db_connection()
-        
-        # Assertions
-        mock_connect.assert_called_once_with(plans.DB_NAME)
-        self.assertEqual(conn, mock_conn)
-        self.assertEqual(conn.row_factory, sqlite3.Row)
+    def test_get_db_connection(self):
+        # Controllers borrow connections from the shared pool
+        self.assertIs(plans.get_db_connection, db_utils.get_db_connection)
     
     @patch('controllers.plans.get_db_connection')
     def test_create_plan_success(self, mock_get_conn):
@@ -95,6 +86,62 @@ class TestPlansController(unittest.TestCase):
         mock_conn.close.assert_called_once()
         self.assertFalse(result)  # Should return False
     
+    @patch('controllers.plans.get_db_connection')
+    def test_clone_plan_as_suggestion(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_cursor.lastrowid = 7  # id of the copy
+        mock_conn.execute.return_value = mock_cursor
+        
+        # Call the function
+        result = plans.clone_plan(1, as_suggestion_by=3409243, name="Suggestion")
+        
+        # Assertions: plan, semesters and courses copied in one transaction
+        mock_get_conn.assert_called_once()
+        self.assertEqual(mock_conn.execute.call_count, 3)
+        self.assertEqual(mock_conn.execute.call_args_list[0][0][1], ("Suggestion", 3409243, 1, 1, 1))
+        self.assertEqual(mock_conn.execute.call_args_list[1][0][1], (7, 1))
+        self.assertEqual(mock_conn.execute.call_args_list[2][0][1], (7, 1))
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_called_once()
+        self.assertEqual(result, 7)
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_clone_plan_not_found(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.rowcount = 0
+        
+        # Call the function
+        result = plans.clone_plan(99)
+        
+        # Assertions
+        mock_conn.execute.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+        self.assertFalse(result)
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_clone_plan_db_error(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.side_effect = sqlite3.Error("Database error")
+        
+        # Call the function
+        result = plans.clone_plan(1, as_suggestion_by=3409243)
+        
+        # Assertions
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+        self.assertFalse(result)
+    
     @patch('controllers.plans.get_db_connection')
     def test_get_plan_student(self, mock_get_conn):
         # Set up mocks
@@ -370,6 +417,97 @@ class TestPlansController(unittest.TestCase):
         mock_conn.close.assert_called_once()
         self.assertEqual(result, mock_plans)
     
+    @patch('controllers.plans.get_db_connection')
+    def test_load_plan_snapshot(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        
+        # Plan row, then one row per scheduled course (None for an empty semester)
+        mock_cursor = MagicMock()
+        mock_conn.execute.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = (
+            1, 'Test Degree Plan', 1600343, 3409243, 'Barry Benson',
+            1, 'Computer Science', 1, 'Artificial Intelligence', 0, None
+        )
+        mock_cursor.fetchall.return_value = [
+            (1, 'Fall', 2025, 'ITSC', 1212, 'Introduction to Computer Science I', 4),
+            (1, 'Fall', 2025, 'MATH', 1241, 'Calculus I', 3),
+            (2, 'Spring', 2026, None, None, None, None),
+            (3, 'Fall', 2026, 'ITSC', 1213, 'Introduction to Computer Science II', 4)
+        ]
+        
+        # Call the function
+        result = plans.load_plan_snapshot(1)
+        
+        # Assertions
+        mock_get_conn.assert_called_once()
+        self.assertEqual(mock_conn.execute.call_count, 2)
+        mock_conn.close.assert_called_once()
+        self.assertEqual(result.name, 'Test Degree Plan')
+        self.assertEqual(result.major_name, 'Computer Science')
+        self.assertEqual([s.id for s in result.semesters], [1, 2, 3])
+        self.assertEqual([s.credits for s in result.semesters], [7, 0, 4])
+        self.assertEqual(result.semesters[1].courses, ())
+        self.assertEqual(result.semesters[0].courses[1].name, 'Calculus I')
+        self.assertEqual(result.total_credits, 11)
+        with self.assertRaises(AttributeError):
+            result.name = 'Changed'
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_load_plan_snapshot_not_found(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = None
+        
+        # Call the function
+        result = plans.load_plan_snapshot(99)
+        
+        # Assertions
+        self.assertIsNone(result)
+        mock_conn.execute.assert_called_once()
+        mock_conn.close.assert_called_once()
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_get_prior_courses(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        
+        # Semesters come back in order, one row per scheduled course
+        mock_cursor = MagicMock()
+        mock_conn.execute.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            (1, 'ITSC', 1212),
+            (1, 'MATH', 1241),
+            (2, None, None),
+            (3, 'ITSC', 1213),
+            (4, 'ITSC', 2214)
+        ]
+        
+        # Call the function
+        result = plans.get_prior_courses(1, 3)
+        
+        # Assertions
+        mock_get_conn.assert_called_once()
+        mock_conn.execute.assert_called_once()
+        mock_conn.close.assert_called_once()
+        self.assertEqual(result, {('ITSC', 1212), ('MATH', 1241)})
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_get_prior_courses_semester_not_in_plan(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchall.return_value = [(1, 'ITSC', 1212)]
+        
+        # Call the function
+        result = plans.get_prior_courses(1, 99)
+        
+        # Assertions
+        self.assertIsNone(result)
+    
     @patch('controllers.plans.get_db_connection')
     def test_update_plan_all_fields(self, mock_get_conn):
         # Set up mocks
@@ -482,16 +620,18 @@ class TestPlansController(unittest.TestCase):
         # Set up mocks
         mock_conn = MagicMock()
         mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchall.return_value = [(5,)]  # one suggestion made from the plan
         
         # Call the function
         result = plans.delete_plan(1)
         
-        # Assertions
+        # Assertions: suggestions looked up, Plan_Violations ensured, then violations, notes,
+        # courses, semesters and plans deleted
         mock_get_conn.assert_called_once()
-        mock_conn.execute.assert_called_once_with(
-            " DELETE FROM Plans\n                WHERE id = ? ", 
-            (1,)
-        )
+        self.assertEqual(mock_conn.execute.call_count, 7)
+        for call in mock_conn.execute.call_args_list[2:]:
+            self.assertIn("DELETE FROM", call[0][0])
+            self.assertEqual(call[0][1], [1, 5])
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
         self.assertTrue(result['success'])
@@ -517,5 +657,109 @@ class TestPlansController(unittest.TestCase):
         self.assertFalse(result['success'])
         self.assertEqual(result['message'], "Error deleting plan: Database error")
 
+    @patch('controllers.plans.get_db_connection')
+    def test_accept_suggestion_success(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = (1,)  # original plan id
+        
+        # Call the function
+        result = plans.accept_suggestion(2)
+        
+        # Assertions: lookup, promote, move notes, rewire suggestions, ensure Plan_Violations, 5 deletes
+        mock_get_conn.assert_called_once()
+        self.assertEqual(mock_conn.execute.call_count, 10)
+        self.assertEqual(mock_conn.execute.call_args_list[1][0][1], (1, 2))
+        self.assertEqual(mock_conn.execute.call_args_list[2][0][1], (2, 1))
+        self.assertEqual(mock_conn.execute.call_args_list[3][0][1], (2, 1))
+        self.assertEqual(mock_conn.execute.call_args_list[-1][0][1], [1])
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_called_once()
+        self.assertTrue(result['success'])
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_accept_suggestion_not_found(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = None
+        
+        # Call the function
+        result = plans.accept_suggestion(2)
+        
+        # Assertions
+        mock_conn.execute.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+        self.assertFalse(result['success'])
+        self.assertEqual(result['message'], "Suggestion not found.")
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_accept_suggestion_error(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        lookup = MagicMock()
+        lookup.fetchone.return_value = (1,)  # original plan id
+        mock_conn.execute.side_effect = [lookup, sqlite3.Error("Database error")]
+        
+        # Call the function
+        result = plans.accept_suggestion(2)
+        
+        # Assertions
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+        self.assertFalse(result['success'])
+        self.assertEqual(result['message'], "Error accepting suggestion: Database error")
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_reject_suggestion_success(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = (2,)
+        
+        # Call the function
+        result = plans.reject_suggestion(2)
+        
+        # Assertions
+        self.assertEqual(mock_conn.execute.call_count, 7)
+        mock_conn.commit.assert_called_once()
+        mock_conn.close.assert_called_once()
+        self.assertTrue(result['success'])
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_reject_suggestion_not_a_suggestion(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = None
+        
+        # Call the function
+        result = plans.reject_suggestion(1)
+        
+        # Assertions
+        mock_conn.execute.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        self.assertFalse(result['success'])
+    
+    @patch('controllers.plans.get_db_connection')
+    def test_purge_orphans_dry_run(self, mock_get_conn):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.rowcount = 3
+        
+        # Call the function
+        result = plans.purge_orphans(dry_run=True)
+        
+        # Assertions
+        self.assertEqual(result, {"Plans": 3, "Plan_Violations": 3, "Notes": 3, "Plan_Semester_Courses": 3, "Plan_Semesters": 3})
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
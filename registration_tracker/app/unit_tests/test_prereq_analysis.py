@@ -0,0 +1,132 @@
+import unittest
+import random
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import prereq_analysis
+import prereq_graph
+from db_fixture import DatabaseTestCase
+from controllers import prerequisites
+
+def reachable(graph, course):
+    """Every course reachable through prerequisite edges, by plain DFS."""
+    seen = set()
+    stack = [alternative for group in graph.groups.get(course, ()) for alternative in group]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(alternative for group in graph.groups.get(current, ()) for alternative in group)
+    return seen
+
+def fixpoint_depths(graph, courses, missing=()):
+    """Depths by repeated relaxation until nothing changes."""
+    depth = {course: (None if course in missing or graph.groups.get(course) else 0) for course in courses}
+    changed = True
+    while changed:
+        changed = False
+        for course, groups in graph.groups.items():
+            values = []
+            for group in groups:
+                options = [depth[alternative] for alternative in group if depth[alternative] is not None]
+                values.append(min(options) if options else None)
+            value = None if None in values else 1 + max(values)
+            if value is not None and (depth[course] is None or value < depth[course]):
+                depth[course] = value
+                changed = True
+    return depth
+
+def random_rows(rng, size, edges):
+    courses = [('C', number) for number in range(size)]
+    rows = set()
+    for _ in range(edges):
+        parent, child = rng.choice(courses), rng.choice(courses)
+        rows.add((parent[0], parent[1], rng.randint(0, 2), child[0], child[1]))
+    return courses, sorted(rows)
+
+class TestPrerequisiteAnalysis(unittest.TestCase):
+
+    def test_chain(self):
+        graph = prereq_graph.PrerequisiteGraph([
+            ('ITSC', 1213, 0, 'ITSC', 1212),
+            ('ITSC', 2214, 0, 'ITSC', 1213),
+            ('ITSC', 2214, 1, 'MATH', 1103),
+            ('ITSC', 2214, 1, 'ITSC', 1212),
+        ])
+        analysis = prereq_analysis.PrerequisiteAnalysis(graph)
+        self.assertTrue(analysis.is_prerequisite('ITSC', 1212, 'ITSC', '2214'))
+        self.assertFalse(analysis.is_prerequisite('ITSC', 2214, 'ITSC', 1212))
+        self.assertFalse(analysis.is_prerequisite('ITSC', 1212, 'ITSC', 1212))
+        self.assertFalse(analysis.is_prerequisite('ART', 1000, 'ITSC', 1212))
+        self.assertEqual(analysis.prerequisites_of('ITSC', 2214),
+                         (('ITSC', 1212), ('ITSC', 1213), ('MATH', 1103)))
+        self.assertEqual([analysis.min_semesters_before(*course) for course in
+                          [('ITSC', 1212), ('ITSC', 1213), ('ITSC', 2214), ('ART', 1000)]], [0, 1, 2, 0])
+        self.assertEqual((analysis.cycles, analysis.untakeable), ((), ()))
+
+    def test_cycles(self):
+        graph = prereq_graph.PrerequisiteGraph([
+            ('A', 1, 0, 'A', 2),
+            ('A', 2, 0, 'A', 3),
+            ('A', 3, 0, 'A', 1),
+            ('B', 1, 0, 'B', 1),
+            ('C', 1, 0, 'A', 1),
+            # an alternative outside the cycle keeps C 2 takeable
+            ('C', 2, 0, 'A', 3),
+            ('C', 2, 0, 'D', 1),
+        ])
+        analysis = prereq_analysis.PrerequisiteAnalysis(graph)
+        self.assertEqual(sorted(analysis.cycles), [(('A', 1), ('A', 2), ('A', 3)), (('B', 1),)])
+        self.assertTrue(analysis.is_prerequisite('A', 1, 'A', 1))
+        self.assertTrue(analysis.is_prerequisite('A', 2, 'C', 1))
+        self.assertEqual(analysis.untakeable, (('A', 1), ('A', 2), ('A', 3), ('B', 1), ('C', 1)))
+        self.assertIsNone(analysis.min_semesters_before('C', 1))
+        self.assertEqual(analysis.min_semesters_before('C', 2), 1)
+
+    def test_missing_catalog_courses(self):
+        graph = prereq_graph.PrerequisiteGraph([('ITSC', 1213, 0, 'ITSC', 1212), ('ITSC', 2214, 0, 'ITSC', 1213)])
+        analysis = prereq_analysis.PrerequisiteAnalysis(graph, [('ITSC', 1213), ('ITSC', 2214), ('ART', 1000)])
+        self.assertEqual(analysis.missing, (('ITSC', 1212),))
+        self.assertEqual(analysis.untakeable, (('ITSC', 1212), ('ITSC', 1213), ('ITSC', 2214)))
+        self.assertEqual(analysis.min_semesters_before('ART', 1000), 0)
+
+    def test_matches_brute_force_on_random_graphs(self):
+        rng = random.Random(4155)
+        for trial in range(40):
+            courses, rows = random_rows(rng, rng.randint(2, 30), rng.randint(0, 60))
+            graph = prereq_graph.PrerequisiteGraph(rows)
+            analysis = prereq_analysis.PrerequisiteAnalysis(graph, courses)
+            depths = fixpoint_depths(graph, courses)
+            with self.subTest(trial=trial):
+                for course in courses:
+                    self.assertEqual(set(analysis.prerequisites_of(*course)), reachable(graph, course))
+                    self.assertEqual(analysis.min_semesters_before(*course), depths[course])
+                in_cycles = {course for cycle in analysis.cycles for course in cycle}
+                self.assertEqual(in_cycles, {course for course in courses if course in reachable(graph, course)})
+
+class TestCatalogAnalysis(DatabaseTestCase):
+
+    def test_seeded_catalog(self):
+        analysis = prereq_analysis.get_analysis()
+        self.assertEqual((analysis.cycles, analysis.untakeable, analysis.missing), ((), (), ()))
+        self.assertTrue(analysis.is_prerequisite('ITSC', 1212, 'ITSC', 3155))
+        self.assertEqual(analysis.min_semesters_before('ITSC', 1213), 1)
+        graph = prereq_graph.get_graph()
+        for course in analysis.courses:
+            self.assertEqual(set(analysis.prerequisites_of(*course)), reachable(graph, course))
+
+    def test_recomputed_after_prerequisite_edit(self):
+        analysis = prereq_analysis.get_analysis()
+        self.assertIs(prereq_analysis.get_analysis(), analysis)
+
+        self.assertTrue(prerequisites.add_prereq('ITSC', 1212, 0, 'ITSC', 1213)['success'])
+        edited = prereq_analysis.get_analysis()
+        self.assertIsNot(edited, analysis)
+        self.assertEqual(edited.cycles, ((('ITSC', 1212), ('ITSC', 1213)),))
+        self.assertIn(('ITSC', 3155), edited.untakeable)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import prereq_graph
+
+# (parent_subject, parent_number, group_id, course_subject, course_number)
+PREREQ_ROWS = [
+    ('ITSC', 1213, 0, 'ITSC', 1212),
+    ('ITSC', 1213, 1, 'MATH', 1101),
+    ('ITSC', 1213, 1, 'MATH', 1103),
+    ('ITSC', 1213, 1, 'MATH', 1241),
+    ('ITSC', 2214, 0, 'ITSC', 1213),
+]
+
+class TestPrerequisiteGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = prereq_graph.PrerequisiteGraph(PREREQ_ROWS)
+
+    def tearDown(self):
+        prereq_graph.invalidate()
+
+    def test_groups_compiled_in_order(self):
+        groups = self.graph.get_groups('ITSC', 1213)
+        self.assertEqual(groups, (
+            frozenset({('ITSC', 1212)}),
+            frozenset({('MATH', 1101), ('MATH', 1103), ('MATH', 1241)})
+        ))
+
+    def test_number_as_string(self):
+        # Pages parse course numbers out of strings
+        self.assertTrue(self.graph.has_prereqs('ITSC', '2214'))
+        self.assertFalse(self.graph.has_prereqs('ITSC', '1212'))
+
+    def test_all_groups_satisfied(self):
+        taken = {('ITSC', 1212), ('MATH', 1241)}
+        self.assertTrue(self.graph.is_satisfied('ITSC', 1213, taken))
+
+    def test_one_group_missing(self):
+        taken = {('ITSC', 1212)}
+        self.assertFalse(self.graph.is_satisfied('ITSC', 1213, taken))
+        self.assertEqual(self.graph.missing_groups('ITSC', 1213, taken), [
+            frozenset({('MATH', 1101), ('MATH', 1103), ('MATH', 1241)})
+        ])
+
+    def test_no_prereqs(self):
+        self.assertTrue(self.graph.is_satisfied('ITSC', 1212, set()))
+
+    def test_dependents_index(self):
+        self.assertEqual(self.graph.get_dependents('ITSC', 1212), {('ITSC', 1213)})
+        self.assertEqual(self.graph.get_dependents('MATH', '1103'), {('ITSC', 1213)})
+        self.assertEqual(self.graph.get_dependents('ITSC', 2214), frozenset())
+
+    def test_removal_breaks_later_dependent(self):
+        history = [(1, {('ITSC', 1212), ('MATH', 1241)}), (2, {('ITSC', 1213)}), (3, {('ITSC', 2214)})]
+        self.assertEqual(self.graph.broken_by_removal('ITSC', 1212, 1, history), [(2, ('ITSC', 1213))])
+        self.assertEqual(self.graph.broken_by_removal('ITSC', '1213', 2, history), [(3, ('ITSC', 2214))])
+        # nothing depends on the last course
+        self.assertEqual(self.graph.broken_by_removal('ITSC', 2214, 3, history), [])
+
+    def test_removal_allowed_when_alternative_scheduled(self):
+        history = [(1, {('ITSC', 1212), ('MATH', 1241)}), (2, {('MATH', 1103)}), (3, {('ITSC', 1213)})]
+        self.assertEqual(self.graph.broken_by_removal('MATH', 1241, 1, history), [])
+        self.assertEqual(self.graph.broken_by_removal('MATH', 1103, 2, history), [])
+        # the only alternative before ITSC 1213
+        history[1] = (2, set())
+        self.assertEqual(self.graph.broken_by_removal('MATH', 1241, 1, history), [(3, ('ITSC', 1213))])
+
+    def test_removal_ignores_same_and_earlier_semesters(self):
+        history = [(1, {('ITSC', 1213)}), (2, {('ITSC', 1212)})]
+        self.assertEqual(self.graph.broken_by_removal('ITSC', 1212, 2, history), [])
+        # also scheduled earlier: the earlier copy still counts
+        history = [(1, {('ITSC', 1212), ('MATH', 1103)}), (2, {('ITSC', 1212)}), (3, {('ITSC', 1213)})]
+        self.assertEqual(self.graph.broken_by_removal('ITSC', 1212, 2, history), [])
+
+    def test_removal_from_unknown_semester(self):
+        self.assertIsNone(self.graph.broken_by_removal('ITSC', 1212, 9, [(1, {('ITSC', 1212)})]))
+
+    @patch('prereq_graph.get_db_connection')
+    def test_graph_loaded_once(self, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchall.return_value = PREREQ_ROWS
+
+        prereq_graph.invalidate()
+        first = prereq_graph.get_graph()
+        second = prereq_graph.get_graph()
+
+        self.assertIs(first, second)
+        mock_get_conn.assert_called_once()
+        mock_conn.close.assert_called_once()
+
+    @patch('prereq_graph.get_db_connection')
+    def test_invalidate_reloads(self, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchall.return_value = PREREQ_ROWS
+
+        prereq_graph.invalidate()
+        first = prereq_graph.get_graph()
+        prereq_graph.invalidate()
+        second = prereq_graph.get_graph()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(mock_get_conn.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
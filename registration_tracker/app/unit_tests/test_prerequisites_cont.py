@@ -7,22 +7,13 @@ import os
 # Add parent directory to path to import the controllers
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from controllers import prerequisites
+import db_utils
 
 class TestPrerequisitesController(unittest.TestCase):
     
-    @patch('controllers.prerequisites.sqlite3.connect')
-    def test_get_db_connection(self, mock_connect):
-        # Set up the mock
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-        
-        # Call the function
-        conn = prerequisites.get_db_connection()
-        
-        # Assertions
-        mock_connect.assert_called_once_with(prerequisites.DB_NAME)
-        self.assertEqual(conn, mock_conn)
-        self.assertEqual(conn.row_factory, sqlite3.Row)
+    def test_get_db_connection(self):
+        # Controllers borrow connections from the shared pool
+        self.assertIs(prerequisites.get_db_connection, db_utils.get_db_connection)
     
     @patch('controllers.prerequisites.get_db_connection')
     def test_get_prereq(self, mock_get_conn):
@@ -357,5 +348,32 @@ class TestPrerequisitesController(unittest.TestCase):
         self.assertFalse(result['success'])
         self.assertEqual(result['message'], "Error deleting prerequisite: Database error")
 
+    @patch('controllers.prerequisites.prereq_graph.invalidate')
+    @patch('controllers.prerequisites.get_db_connection')
+    def test_add_prereq_invalidates_graph(self, mock_get_conn, mock_invalidate):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        
+        # Call the function
+        prerequisites.add_prereq('ITSC', 2214, 0, 'ITSC', 1213)
+        
+        # The compiled prerequisite graph must be reloaded
+        mock_invalidate.assert_called_once()
+    
+    @patch('controllers.prerequisites.prereq_graph.invalidate')
+    @patch('controllers.prerequisites.get_db_connection')
+    def test_delete_prereq_error_keeps_graph(self, mock_get_conn, mock_invalidate):
+        # Set up mocks
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.side_effect = sqlite3.Error("Database error")
+        
+        # Call the function
+        prerequisites.delete_prereq('ITSC', 1213, 0)
+        
+        # Nothing changed, so nothing to reload
+        mock_invalidate.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
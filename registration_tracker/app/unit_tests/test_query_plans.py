@@ -0,0 +1,83 @@
+import unittest
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_utils
+from db_fixture import DatabaseTestCase
+from controllers import plans, semesters, courses, prerequisites, students, advisors, admins, majors, concentration, notes
+
+class TestQueryPlans(DatabaseTestCase):
+    """
+    Builds a fresh database with database_creation.py, runs the controller lookups
+    against it and checks with EXPLAIN QUERY PLAN that none of them scans a table.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.statements = self.trace_statements()
+
+    def test_migration_created_indexes(self):
+        con = sqlite3.connect(self.db_path)
+        names = {row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        con.close()
+        self.assertIn("idx_prereq_parent", names)
+        self.assertIn("idx_plans_student", names)
+        self.assertIn("idx_notes_advisor_plan", names)
+
+    def test_migration_is_idempotent(self):
+        con = sqlite3.connect(self.db_path)
+        db_utils.apply_indexes(con)
+        db_utils.check_indexed_lookups(con)
+        con.close()
+
+    def test_check_detects_missing_index(self):
+        con = sqlite3.connect(":memory:")
+        con.execute("CREATE TABLE Plans (id INTEGER PRIMARY KEY, student_id INTEGER)")
+        with self.assertRaises(sqlite3.OperationalError):
+            db_utils.check_indexed_lookups(con, [("Plans", ("student_id",))])
+        con.close()
+
+    def test_controller_lookups_use_indexes(self):
+        plans.get_plan("Test Plan", "student", 1600343)
+        plans.get_plan("Test Plan", "advisor", 3409243)
+        plans.get_plan_from_id(1)
+        plans.get_first_plan(1600343)
+        plans.get_plans("student", 1600343)
+        plans.get_plans("advisor", 3409243)
+        semesters.get_semester("Fall", 2025)
+        semesters.get_semesters(1)
+        courses.get_course("ITSC", 1213)
+        courses.get_course_prereq("ITSC", 1213)
+        courses.get_semester_courses(1, 1)
+        prerequisites.get_prereq("ITSC", 1213)
+        students.get_student("username", "uname")
+        students.get_student("id", 1600343)
+        students.get_students(3409243)
+        advisors.get_advisor(3409243)
+        advisors.get_advisor_user("advisor")
+        admins.get_admin(1)
+        admins.get_admin_user("admin")
+        majors.get_major(1)
+        majors.get_major_id("Computer Science")
+        concentration.get_concentration(1)
+        concentration.get_concentration_id("Artificial Intelligence")
+        concentration.get_concentrations_by_major(1)
+        notes.get_advisor_notes(3409243, 1)
+        notes.get_student_notes(1600343, 1)
+
+        queries = [s for s in self.statements if s.lstrip().upper().startswith("SELECT")]
+        self.assertGreaterEqual(len(queries), 26)
+
+        con = sqlite3.connect(self.db_path)
+        copy = db_utils.schema_copy(con)
+        con.close()
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(db_utils.find_table_scans(copy, query), [])
+        copy.close()
+
+if __name__ == '__main__':
+    unittest.main()
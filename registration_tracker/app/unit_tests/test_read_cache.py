@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import threading
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import read_cache
+import catalog_cache
+import reads
+from controllers import plans, notes, students
+
+class TestReadCache(unittest.TestCase):
+
+    def setUp(self):
+        read_cache.clear()
+        self.calls = []
+
+        @read_cache.cached_read(plan="plan_id")
+        def by_plan(plan_id):
+            self.calls.append(("by_plan", plan_id))
+            return [plan_id]
+
+        @read_cache.cached_read(plan=None)
+        def all_plans(student_id):
+            self.calls.append(("all_plans", student_id))
+            return [student_id]
+
+        @read_cache.cached_read(catalog=None)
+        def catalog_read():
+            self.calls.append(("catalog",))
+            return "courses"
+
+        self.by_plan = by_plan
+        self.all_plans = all_plans
+        self.catalog_read = catalog_read
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.by_plan(1), (1,))
+        self.assertEqual(self.by_plan(plan_id=1), (1,))
+        self.by_plan(2)
+        self.assertEqual(self.calls, [("by_plan", 1), ("by_plan", 2)])
+        stats = read_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 2))
+
+    def test_keyed_invalidation(self):
+        self.by_plan(1)
+        self.by_plan(2)
+        self.all_plans(7)
+        read_cache.invalidate("plan", 1)
+        self.by_plan(1)
+        self.by_plan(2)
+        self.all_plans(7)
+        # plan 2 stays cached; the read that depends on every plan reloads
+        self.assertEqual(self.calls, [("by_plan", 1), ("by_plan", 2), ("all_plans", 7),
+                                      ("by_plan", 1), ("all_plans", 7)])
+
+    def test_whole_tag_invalidation(self):
+        self.by_plan(1)
+        self.all_plans(7)
+        read_cache.invalidate("plan")
+        self.by_plan(1)
+        self.all_plans(7)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_other_tags_unaffected(self):
+        self.by_plan(1)
+        read_cache.invalidate("student", 1600343)
+        read_cache.invalidate("advisor")
+        self.by_plan(1)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_catalog_tag_follows_catalog_version(self):
+        self.catalog_read()
+        catalog_cache.bump()
+        self.catalog_read()
+        read_cache.invalidate("catalog")
+        self.catalog_read()
+        self.assertEqual(len(self.calls), 3)
+
+    def test_write_during_load_leaves_entry_stale(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @read_cache.cached_read(plan="plan_id")
+        def slow(plan_id):
+            self.calls.append(plan_id)
+            started.set()
+            release.wait()
+            return "old"
+
+        t = threading.Thread(target=slow, args=(1,))
+        t.start()
+        started.wait()
+        read_cache.invalidate("plan", 1)
+        release.set()
+        t.join()
+        slow(1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_unknown_tag(self):
+        with self.assertRaises(ValueError):
+            read_cache.invalidate("course")
+        with self.assertRaises(ValueError):
+            read_cache.cached_read(course="id")
+
+    @patch('controllers.plans.get_db_connection')
+    def test_plan_write_invalidates_plan_reads(self, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = {'id': 1, 'name': 'test plan'}
+
+        self.assertIs(reads.get_plan_from_id(1), reads.get_plan_from_id(1))
+        self.assertEqual(mock_get_conn.call_count, 1)
+
+        self.assertTrue(plans.update_plan(1, name="renamed")["success"])
+        reads.get_plan_from_id(1)
+        self.assertEqual(mock_get_conn.call_count, 3)
+
+    @patch('controllers.notes.get_db_connection')
+    def test_note_write_invalidates_notes(self, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchall.return_value = []
+
+        reads.get_student_notes(1600343, 1)
+        reads.get_student_notes(1600343, 1)
+        self.assertEqual(mock_get_conn.call_count, 1)
+
+        notes.save_student_note(1600343, 1, "hello")
+        reads.get_student_notes(1600343, 1)
+        self.assertEqual(mock_get_conn.call_count, 3)
+
+    @patch('controllers.students.get_db_connection')
+    def test_student_write_invalidates_students(self, mock_get_conn):
+        mock_conn = MagicMock()
+        mock_get_conn.return_value = mock_conn
+        mock_conn.execute.return_value.fetchone.return_value = {'ID': 1600343}
+
+        reads.get_student("id", 1600343)
+        reads.get_student("id", 1600343)
+        self.assertEqual(mock_get_conn.call_count, 1)
+
+        students.delete_student(1600343)
+        reads.get_student("id", 1600343)
+        self.assertEqual(mock_get_conn.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
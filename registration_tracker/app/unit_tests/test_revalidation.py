@@ -0,0 +1,115 @@
+import unittest
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_utils
+import revalidation
+from db_fixture import DatabaseTestCase
+from controllers import plans, prerequisites
+
+class TestRevalidation(DatabaseTestCase):
+    """
+    Plan 1 schedules ITSC 1212 then ITSC 1213; two clones of it are made so the
+    job has several plans to spread over workers.
+    """
+
+    seed_sql = """
+        INSERT INTO Plan_Semester_Courses VALUES
+            (1, 1, 'ITSC', 1212), (1, 1, 'MATH', 1101),
+            (1, 2, 'ITSC', 1213);
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.clones = [plans.clone_plan(1, name=f"Copy {n}") for n in range(2)]
+        # a plan that doesn't schedule ITSC 1213
+        self.other = plans.clone_plan(1, name="Other")
+        con = sqlite3.connect(self.db_path)
+        con.execute("DELETE FROM Plan_Semester_Courses WHERE plan_id = ? AND course_number = 1213", (self.other,))
+        con.commit()
+        con.close()
+
+    def stored(self):
+        con = sqlite3.connect(self.db_path)
+        rows = con.execute(""" SELECT plan_id, semester_id, course_subject, course_number, missing
+                               FROM Plan_Violations ORDER BY plan_id """).fetchall()
+        con.close()
+        return rows
+
+    def break_itsc_1213(self):
+        self.assertTrue(prerequisites.add_prereq('ITSC', 1213, 5, 'ITSC', 3155)['success'])
+
+    def test_find_affected_plans(self):
+        self.assertEqual(revalidation.find_affected_plans([('ITSC', '1213')]), [1] + self.clones)
+        self.assertEqual(revalidation.find_affected_plans([('ITSC', 1213), ('MATH', 1101)]),
+                         sorted([1, self.other] + self.clones))
+        self.assertEqual(revalidation.find_affected_plans([]), [])
+
+    def test_affected_plans_found_by_index(self):
+        con = sqlite3.connect(self.db_path)
+        copy = db_utils.schema_copy(con)
+        con.close()
+        query = """ SELECT DISTINCT plan_id FROM Plan_Semester_Courses
+                    WHERE (course_subject = ? AND course_number = ?) OR (course_subject = ? AND course_number = ?) """
+        self.assertEqual(db_utils.find_table_scans(copy, query, ('ITSC', 1213, 'MATH', 1101)), [])
+        copy.close()
+
+    def test_revalidate_writes_violations(self):
+        self.assertEqual(revalidation.revalidate(workers=0)["violations"], 0)
+        self.assertEqual(self.stored(), [])
+
+        self.break_itsc_1213()
+        result = revalidation.revalidate(workers=0)
+        self.assertEqual(result["plans"], 4)
+        self.assertEqual(result["violations"], 3)
+        self.assertEqual(self.stored(), [(plan_id, 2, 'ITSC', 1213, 'ITSC 3155') for plan_id in [1] + self.clones])
+
+    def test_worker_processes_match_inline(self):
+        self.break_itsc_1213()
+        progress = []
+        result = revalidation.revalidate(workers=2, chunk_size=1,
+                                         progress=lambda done, total, rate: progress.append((done, total)))
+        in_processes = self.stored()
+        revalidation.revalidate(workers=0)
+        self.assertEqual(in_processes, self.stored())
+        self.assertEqual(sorted(progress), [(1, 4), (2, 4), (3, 4), (4, 4)])
+        self.assertGreater(result["plans_per_second"], 0)
+
+    def test_revalidate_courses_checks_affected_plans_only(self):
+        self.break_itsc_1213()
+        result = revalidation.revalidate_courses([('ITSC', 1213)], workers=0)
+        self.assertEqual(result["plans"], 3)
+        self.assertEqual(len(self.stored()), 3)
+        self.assertEqual(revalidation.revalidate_courses([('ITSC', 9999)])["plans"], 0)
+
+    def test_fixed_plans_and_deleted_plans_cleared(self):
+        self.break_itsc_1213()
+        revalidation.revalidate(workers=0)
+        self.assertTrue(prerequisites.delete_prereq('ITSC', 1213, 5)['success'])
+        plans.delete_plan(self.clones[0])
+
+        revalidation.revalidate([1], workers=0)
+        self.assertEqual([row[0] for row in self.stored()], [self.clones[1]])
+
+    def test_background_job(self):
+        self.break_itsc_1213()
+        revalidation.start_revalidation([('ITSC', '1213')]).join(30)
+        status = revalidation.get_status()
+        self.assertFalse(status["running"])
+        self.assertIsNone(status["error"])
+        self.assertEqual((status["done"], status["total"]), (3, 3))
+        self.assertEqual(status["last"]["violations"], 3)
+
+    def test_advisor_violations(self):
+        self.break_itsc_1213()
+        revalidation.revalidate_courses([('ITSC', 1213)], workers=0)
+        rows = plans.get_advisor_violations(3409243)
+        self.assertEqual([row['plan_id'] for row in rows], [1] + self.clones)
+        self.assertEqual((rows[0]['term'], rows[0]['year'], rows[0]['missing']), ('Spring', 2026, 'ITSC 3155'))
+        self.assertEqual(plans.get_advisor_violations(1), [])
+
+if __name__ == '__main__':
+    unittest.main()
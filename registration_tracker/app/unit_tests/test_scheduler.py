@@ -0,0 +1,164 @@
+import unittest
+import sqlite3
+import sys
+import os
+import time
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import prereq_analysis
+import prereq_graph
+import plan_validator
+import requirements
+import scheduler
+from requirements import Section
+from db_fixture import DatabaseTestCase
+from controllers import plans
+
+ROWS = [
+    ('CS', 2, 0, 'CS', 1),
+    ('CS', 3, 0, 'CS', 2),
+    ('CS', 4, 0, 'CS', 3),
+    # CS 5 needs CS 1 and one of MATH 1 / MATH 2
+    ('CS', 5, 0, 'CS', 1),
+    ('CS', 5, 1, 'MATH', 2),
+    ('CS', 5, 1, 'MATH', 1),
+    ('MATH', 2, 0, 'MATH', 1),
+]
+CREDITS = {course: 3 for course in [('CS', 1), ('CS', 2), ('CS', 3), ('CS', 4), ('CS', 5),
+                                    ('MATH', 1), ('MATH', 2), ('ART', 1), ('ART', 2), ('ART', 3)]}
+
+def semesters(count, existing=None):
+    existing = existing or {}
+    return [(semester_id, set(existing.get(semester_id, ()))) for semester_id in range(1, count + 1)]
+
+def check_order(test, schedule, history):
+    """Every placed course has each prerequisite group met in an earlier semester."""
+    graph = prereq_graph.PrerequisiteGraph(ROWS)
+    position = {semester_id: index for index, (semester_id, _) in enumerate(history)}
+    placed = {course: position[semester_id] for semester_id, course in schedule.placements}
+    placed.update({prereq_graph.course_key(*course): position[semester_id]
+                   for semester_id, courses in history for course in courses})
+    for course, index in placed.items():
+        for group in graph.get_groups(*course):
+            test.assertTrue(any(placed.get(alternative, len(history)) < index for alternative in group),
+                            f"{course} scheduled before its prerequisites")
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = prereq_graph.PrerequisiteGraph(ROWS)
+        self.analysis = prereq_analysis.PrerequisiteAnalysis(self.graph, CREDITS)
+
+    def schedule(self, sections, history, credit_cap=scheduler.MAX_CREDITS):
+        return scheduler.build_schedule(sections, history, self.graph, self.analysis, CREDITS, credit_cap)
+
+    def test_prerequisites_added_and_ordered(self):
+        sections = [Section("major", 1, "Core", 6, ((('CS', 4),), (('CS', 5),)))]
+        history = semesters(4)
+        schedule = self.schedule(sections, history)
+        self.assertEqual(sorted(course for _, course in schedule.placements),
+                         [('CS', 1), ('CS', 2), ('CS', 3), ('CS', 4), ('CS', 5), ('MATH', 1)])
+        check_order(self, schedule, history)
+        self.assertEqual((schedule.unscheduled, schedule.unmet), ([], []))
+        # the longest chain starts first
+        self.assertEqual(dict(schedule.placements)[4], ('CS', 4))
+
+    def test_credit_cap(self):
+        sections = [Section("gen_ed", 1, "Arts", 9, ((('ART', 1),), (('ART', 2),), (('ART', 3),)))]
+        schedule = self.schedule(sections, semesters(3), credit_cap=6)
+        self.assertEqual(schedule.credits, {1: 6, 2: 3, 3: 0})
+        schedule = self.schedule(sections, semesters(1), credit_cap=6)
+        self.assertEqual(schedule.unscheduled, [('ART', 3)])
+
+    def test_existing_courses_kept_and_counted(self):
+        sections = [Section("major", 1, "Core", 9, ((('CS', 2),), (('CS', 3),), (('MATH', 2), ('CS', 5))))]
+        history = semesters(3, {1: [('CS', '1')], 2: [('ART', 1)]})
+        schedule = self.schedule(sections, history, credit_cap=6)
+        self.assertNotIn(('CS', 1), [course for _, course in schedule.placements])
+        self.assertEqual(schedule.credits[1], 6)
+        check_order(self, schedule, history)
+
+    def test_choose_one_per_group(self):
+        # MATH 2 needs MATH 1, so the cheaper MATH 1 is picked
+        sections = [Section("major", 1, "Math", 3, ((('MATH', 2), ('MATH', 1)),))]
+        chosen, unmet = scheduler.choose_courses(sections, self.analysis, CREDITS)
+        self.assertEqual((chosen, unmet), ([('MATH', 1)], []))
+        # an option the plan already has wins
+        chosen, _ = scheduler.choose_courses(sections, self.analysis, CREDITS, taken={('MATH', 2)})
+        self.assertEqual(chosen, [])
+
+    def test_credits_from_large_group_and_no_double_counting(self):
+        arts = (('ART', 1), ('ART', 2), ('ART', 3))
+        sections = [Section("major", 1, "Electives", 6, (arts,)),
+                    Section("gen_ed", 2, "Arts", 6, (arts,))]
+        chosen, unmet = scheduler.choose_courses(sections, self.analysis, CREDITS)
+        self.assertEqual(sorted(chosen), list(arts))
+        self.assertEqual(unmet, [("Arts", 3)])
+
+    def test_unmet_sections(self):
+        sections = [Section("major", 1, "Other Disciplines", 15, ()),
+                    Section("major", 2, "Missing", 3, ((('XYZ', 1),),))]
+        schedule = self.schedule(sections, semesters(2))
+        self.assertEqual(schedule.placements, [])
+        self.assertEqual(schedule.unmet, [("Other Disciplines", 15), ("Missing", 3)])
+
+class TestGeneratePlan(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.plan_id = plans.create_plan(1600343, 3409243, "Generated", 1, 1, "Fall 2025")
+
+    def test_get_sections(self):
+        sections = requirements.get_sections(1, 1)
+        self.assertEqual([section.kind for section in sections], ["major"] * 4 + ["concentration"] * 3 + ["gen_ed"] * 5)
+        core = sections[0]
+        self.assertEqual((core.name, core.credits_required), ("Core Courses", 29))
+        self.assertIn((('ITSC', 1212),), core.groups)
+        self.assertEqual(sections[2].groups, ())
+        self.assertEqual(len(requirements.get_sections(1)), 9)
+
+    def test_generate_plan(self):
+        result = scheduler.generate_plan(self.plan_id)
+        self.assertTrue(result["success"])
+        schedule = result["schedule"]
+        self.assertTrue(all(credits <= scheduler.MAX_CREDITS for credits in schedule.credits.values()))
+        self.assertEqual(schedule.unscheduled, [])
+        self.assertIn(("Elective Courses in Other Disciplines", 15), schedule.unmet)
+
+        snapshot = plans.load_plan_snapshot(self.plan_id)
+        self.assertEqual(sum(len(semester.courses) for semester in snapshot.semesters), len(schedule.placements))
+        self.assertEqual(plan_validator.validate_all_plans([self.plan_id]), {self.plan_id: []})
+
+        # running it again finds nothing left to add
+        self.assertEqual(scheduler.generate_plan(self.plan_id)["schedule"].placements, [])
+
+    def test_keeps_existing_courses(self):
+        con = sqlite3.connect(self.db_path)
+        semester_id = con.execute("SELECT semester_id FROM Plan_Semesters WHERE plan_id = ? ORDER BY semester_id DESC",
+                                  (self.plan_id,)).fetchone()[0]
+        con.execute("INSERT INTO Plan_Semester_Courses VALUES (?, ?, 'ITSC', 1212)", (self.plan_id, semester_id))
+        con.commit()
+        con.close()
+        schedule = scheduler.generate_plan(self.plan_id)["schedule"]
+        self.assertNotIn(('ITSC', 1212), [course for _, course in schedule.placements])
+        # ITSC 1213 needs ITSC 1212, now only in the last semester
+        self.assertNotIn(('ITSC', 1213), [course for _, course in schedule.placements])
+        self.assertIn(('ITSC', 1213), schedule.unscheduled)
+
+    def test_fast_for_every_concentration(self):
+        analysis = prereq_analysis.get_analysis()
+        credits = requirements.get_course_credits()
+        history = plans.get_plan_history(self.plan_id)
+        for concentration_id in range(1, 10):
+            sections = requirements.get_sections(1, concentration_id)
+            started = time.perf_counter()
+            schedule = scheduler.build_schedule(sections, history, analysis.graph, analysis, credits)
+            self.assertLess(time.perf_counter() - started, 0.1)
+            self.assertGreaterEqual(sum(credits[course] for _, course in schedule.placements), 90)
+
+    def test_missing_plan(self):
+        self.assertFalse(scheduler.generate_plan(9999)["success"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,22 +7,13 @@ import os
 # Add parent directory to path to import the controllers
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from controllers import semesters
+import db_utils
 
 class TestSemestersController(unittest.TestCase):
     
-    @patch('controllers.semesters.sqlite3.connect')
-    def test_get_db_connection(self, mock_connect):
-        # Set up the mock
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-        
-        # Call the function
-        conn = semesters.get_db_connection()
-        
-        # Assertions
-        mock_connect.assert_called_once_with(semesters.DB_NAME)
-        self.assertEqual(conn, mock_conn)
-        self.assertEqual(conn.row_factory, sqlite3.Row)
+    def test_get_db_connection(self):
+        # Controllers borrow connections from the shared pool
+        self.assertIs(semesters.get_db_connection, db_utils.get_db_connection)
     
     @patch('controllers.semesters.get_db_connection')
     def test_get_semester(self, mock_get_conn):
@@ -7,22 +7,14 @@ import os
 # Add parent directory to path to import the controllers
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from controllers import students
+import db_utils
+import passwords
 
 class TestStudentsController(unittest.TestCase):
     
-    @patch('controllers.students.sqlite3.connect')
-    def test_get_db_connection(self, mock_connect):
-        # Set up the mock
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-        
-        # Call the function
-        conn = students.get_db_connection()
-        
-        # Assertions
-        mock_connect.assert_called_once_with(students.DB_NAME)
-        self.assertEqual(conn, mock_conn)
-        self.assertEqual(conn.row_factory, sqlite3.Row)
+    def test_get_db_connection(self):
+        # Controllers borrow connections from the shared pool
+        self.assertIs(students.get_db_connection, db_utils.get_db_connection)
     
     @patch('controllers.students.get_db_connection')
     def test_get_student_by_username(self, mock_get_conn):
@@ -209,10 +201,16 @@ class TestStudentsController(unittest.TestCase):
         
         # Assertions
         mock_get_conn.assert_called_once()
-        mock_conn.execute.assert_called_once_with(
-            " INSERT INTO Students (id, f_name, l_name, username, password, major_id, graduation_date, advisor_id)\n                VALUES (?, ?, ?, ?, ?, ?, ?, ?) ", 
-            (1600345, 'Sally', 'Smith', 'ssmith', 'secure_pass', 1, None, 3409243)
+        mock_conn.execute.assert_called_once()
+        query, values = mock_conn.execute.call_args[0]
+        self.assertEqual(
+            query,
+            " INSERT INTO Students (id, f_name, l_name, username, password, major_id, graduation_date, advisor_id)\n                VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
         )
+        self.assertEqual(values[:4] + values[5:], (1600345, 'Sally', 'Smith', 'ssmith', 1, None, 3409243))
+        # The password is stored as a salted hash
+        self.assertNotEqual(values[4], 'secure_pass')
+        self.assertTrue(passwords.verify_password('secure_pass', values[4]))
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
         self.assertTrue(result['success'])
@@ -285,7 +283,7 @@ class TestStudentsController(unittest.TestCase):
         self.assertEqual(values[0], 'Updated')
         self.assertEqual(values[1], 'Student')
         self.assertEqual(values[2], 'updated_user')
-        self.assertEqual(values[3], 'new_password')
+        self.assertTrue(passwords.verify_password('new_password', values[3]))
         self.assertEqual(values[4], 2)
         self.assertEqual(values[5], '2026-05-15')
         self.assertEqual(values[6], 3409244)
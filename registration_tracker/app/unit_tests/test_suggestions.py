@@ -0,0 +1,91 @@
+import unittest
+import sqlite3
+import sys
+import os
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from db_fixture import DatabaseTestCase
+from controllers import plans
+
+class TestSuggestions(DatabaseTestCase):
+    """
+    Accepts, rejects and purges suggestions against a seeded database and checks
+    that no plan semesters, courses, notes or violations are left pointing at a deleted plan.
+    """
+
+    seed_sql = """
+        INSERT INTO Plan_Semester_Courses VALUES (1, 1, 'ITSC', 1212);
+        INSERT INTO Plan_Violations VALUES (1, 1, 'ITSC', 1212, 'ITSC 1200', '2025-01-01T00:00:00');
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.suggestion_id = plans.clone_plan(1, as_suggestion_by=3409243, name="Suggestion")
+
+    def count(self, query, params=()):
+        con = sqlite3.connect(self.db_path)
+        value = con.execute(query, params).fetchone()[0]
+        con.close()
+        return value
+
+    def orphans(self):
+        return sum(self.count(f"SELECT COUNT(*) FROM {table} WHERE plan_id NOT IN (SELECT id FROM Plans)")
+                   for table in ("Plan_Violations", "Notes", "Plan_Semester_Courses", "Plan_Semesters"))
+
+    def test_accept_replaces_original(self):
+        other_id = plans.clone_plan(1, as_suggestion_by=3409243, name="Other")
+        result = plans.accept_suggestion(self.suggestion_id)
+
+        self.assertTrue(result['success'])
+        self.assertIsNone(plans.get_plan_from_id(1))
+        promoted = plans.get_plan_from_id(self.suggestion_id)
+        self.assertEqual(promoted['name'], "test plan")
+        self.assertEqual(promoted['student_id'], 1600343)
+        self.assertEqual(promoted['is_suggestion'], 0)
+        self.assertIsNone(promoted['original_plan_id'])
+        # notes moved over, pending suggestions rewired, nothing left behind
+        self.assertEqual(self.count("SELECT COUNT(*) FROM Notes WHERE plan_id = ?", (self.suggestion_id,)), 2)
+        self.assertEqual(plans.get_plan_from_id(other_id)['original_plan_id'], self.suggestion_id)
+        self.assertEqual(self.orphans(), 0)
+
+    def test_accept_rejects_plain_plan(self):
+        result = plans.accept_suggestion(1)
+        self.assertFalse(result['success'])
+        self.assertIsNotNone(plans.get_plan_from_id(1))
+
+    def test_reject_removes_suggestion_only(self):
+        result = plans.reject_suggestion(self.suggestion_id)
+
+        self.assertTrue(result['success'])
+        self.assertIsNone(plans.get_plan_from_id(self.suggestion_id))
+        self.assertIsNotNone(plans.get_plan_from_id(1))
+        self.assertEqual(self.count("SELECT COUNT(*) FROM Plan_Semester_Courses WHERE plan_id = 1"), 1)
+        self.assertEqual(self.orphans(), 0)
+
+    def test_delete_plan_cascades(self):
+        plans.delete_plan(1)
+        self.assertEqual(self.count("SELECT COUNT(*) FROM Plans"), 0)
+        self.assertEqual(self.orphans(), 0)
+
+    def test_purge_orphans(self):
+        # what the old delete_plan left behind
+        con = sqlite3.connect(self.db_path)
+        con.execute("DELETE FROM Plans WHERE id = 1")
+        con.commit()
+        con.close()
+
+        self.assertEqual(plans.purge_orphans(dry_run=True), {
+            "Plans": 1, "Plan_Violations": 1, "Notes": 2, "Plan_Semester_Courses": 2, "Plan_Semesters": 4
+        })
+        self.assertEqual(self.count("SELECT COUNT(*) FROM Plans"), 1)
+
+        plans.purge_orphans()
+        self.assertEqual(self.count("SELECT COUNT(*) FROM Plans"), 0)
+        self.assertEqual(self.orphans(), 0)
+        self.assertEqual(plans.purge_orphans(), {
+            "Plans": 0, "Plan_Violations": 0, "Notes": 0, "Plan_Semester_Courses": 0, "Plan_Semesters": 0
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import sqlite3
+import sys
+import os
+import time
+
+# Add parent directory to path to import the controllers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import requirements
+import scheduler
+import whatif
+from requirements import Section
+from db_fixture import DatabaseTestCase
+from controllers import plans
+
+CREDITS = {('CS', 1): 3, ('CS', 2): 3, ('CS', 3): 4, ('ART', 1): 3, ('ART', 2): 3, ('ART', 3): 3}
+
+class TestEvaluate(unittest.TestCase):
+
+    def test_groups_and_credits(self):
+        sections = [Section("major", 1, "Core", 7, ((('CS', 1),), (('CS', 2), ('CS', 3)))),
+                    Section("gen_ed", 2, "Arts", 6, ((('ART', 1), ('ART', 2), ('ART', 3)),))]
+        core, arts = requirements.evaluate(sections, {('CS', '1'), ('CS', 3), ('ART', 2)}, CREDITS)
+        self.assertEqual((core.courses, core.credits, core.missing_groups, core.missing_credits),
+                         ((('CS', 1), ('CS', 3)), 7, (), 0))
+        self.assertTrue(requirements.is_complete(core))
+        self.assertEqual((arts.courses, arts.missing_credits), ((('ART', 2),), 3))
+        self.assertFalse(requirements.is_complete(arts))
+        self.assertEqual(requirements.describe_missing(arts), "3 credits")
+
+    def test_course_counts_once(self):
+        arts = (('ART', 1), ('ART', 2), ('ART', 3))
+        sections = [Section("major", 1, "Electives", 6, (arts,)), Section("gen_ed", 2, "Arts", 6, (arts,))]
+        electives, gen_ed = requirements.evaluate(sections, set(arts), CREDITS)
+        self.assertEqual(electives.courses, (('ART', 1), ('ART', 2)))
+        self.assertEqual((gen_ed.courses, gen_ed.missing_credits), ((('ART', 3),), 3))
+
+    def test_required_course_shared_by_sections(self):
+        sections = [Section("major", 1, "Core", 3, ((('CS', 1),),)),
+                    Section("concentration", 2, "Required", 3, ((('CS', 1),),))]
+        core, required = requirements.evaluate(sections, {('CS', 1)}, CREDITS)
+        self.assertEqual(core.courses, (('CS', 1),))
+        # the group is met, but its credits already went to Core
+        self.assertEqual((required.courses, required.missing_groups, required.missing_credits), ((), (), 3))
+
+    def test_describe_missing(self):
+        sections = [Section("major", 1, "Core", 10, ((('CS', 1),), (('CS', 2), ('CS', 3)),
+                                                     tuple(('ART', number) for number in range(1, 6))))]
+        progress, = requirements.evaluate(sections, set(), CREDITS)
+        self.assertEqual(requirements.describe_missing(progress),
+                         "10 credits; CS 1; one of CS 2 / CS 3; one of 5 courses")
+
+class TestWhatIf(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.plan_id = plans.create_plan(1600343, 3409243, "Generated", 1, 1, "Fall 2025")
+        scheduler.generate_plan(self.plan_id)
+
+    def test_own_requirements(self):
+        result = whatif.what_if(self.plan_id)
+        self.assertEqual((result.major_id, result.concentration_id), (1, 1))
+        # the scheduler leaves only what the catalog can't fill
+        self.assertEqual([progress.section.name for progress in result.outstanding],
+                         ["Elective Courses in Other Disciplines", "Concentration Technical Elective Courses"])
+        self.assertEqual(len(result.satisfied) + len(result.outstanding), len(result.sections))
+        self.assertIsNone(whatif.what_if(9999))
+
+    def test_other_concentration(self):
+        result = whatif.what_if(self.plan_id, concentration_id=4)
+        self.assertEqual(result.concentration_id, 4)
+        names = [progress.section.name for progress in result.outstanding]
+        self.assertIn("Concentration Required Courses", names)
+        self.assertLess(result.credits, whatif.what_if(self.plan_id).credits)
+
+    def row_counts(self):
+        con = sqlite3.connect(self.db_path)
+        counts = [con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("Plans", "Plan_Semesters", "Plan_Semester_Courses")]
+        con.close()
+        return counts
+
+    def test_compare_concentrations_writes_nothing(self):
+        before = self.row_counts()
+        started = time.perf_counter()
+        comparison = whatif.compare_concentrations(self.plan_id)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(self.row_counts(), before)
+
+        self.assertEqual(len(comparison), 9)
+        self.assertEqual(comparison[0][0], "AI, Robotics, and Gaming, B.S.")
+        own = whatif.what_if(self.plan_id)
+        self.assertEqual(comparison[0][1], own)
+        self.assertTrue(all(result.credits <= own.credits for _, result in comparison))
+        self.assertEqual(whatif.compare_concentrations(9999), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Check every plan's scheduled courses against the current prerequisites.
+
+Prints each course whose prerequisites are not met by earlier semesters, for
+example after an admin changed the Prerequisites table. With --store the check
+runs on worker processes and refreshes Plan_Violations (what the advisor
+dashboard shows) instead. Prerequisite cycles and prerequisites missing from
+the catalog are listed first. Run it from the app directory:
+
+    python validate_plans.py --plan 1 --plan 2
+    python validate_plans.py --store --workers 4
+"""
+import argparse
+import plan_validator
+import prereq_analysis
+import revalidation
+
+
+def store(plan_ids, workers):
+    def progress(done, total, plans_per_second):
+        print(f"\r{done}/{total} plans ({plans_per_second:.0f} plans/s)", end="", flush=True)
+
+    result = revalidation.revalidate(plan_ids, workers=workers, progress=progress)
+    print(f"\n{result['plans']} plans checked in {result['seconds']:.2f}s "
+          f"({result['plans_per_second']:.0f} plans/s), {result['violations']} violations stored")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--plan", type=int, action="append", dest="plans",
+                        help="plan id to check (repeatable; default: all plans)")
+    parser.add_argument("--store", action="store_true", help="write the results to Plan_Violations")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --store (default: revalidation.REVALIDATION_WORKERS)")
+    args = parser.parse_args()
+
+    analysis = prereq_analysis.get_analysis()
+    for cycle in analysis.cycles:
+        print("courses in a prerequisite cycle: " + ", ".join(f"{subject} {number}" for subject, number in cycle))
+    for subject, number in analysis.missing:
+        print(f"prerequisite not in the catalog: {subject} {number}")
+
+    if args.store:
+        store(args.plans, args.workers)
+        return
+
+    results = plan_validator.validate_all_plans(args.plans)
+    invalid = 0
+    for plan_id, violations in results.items():
+        if violations:
+            invalid += 1
+        for violation in violations:
+            print(f"plan {plan_id:<6} semester {violation.semester_id:<4} "
+                  f"{violation.subject} {violation.number} needs {plan_validator.describe_missing(violation.missing)}")
+    print(f"{len(results)} plans checked, {invalid} with unmet prerequisites")
+    if invalid:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from collections import namedtuple
+import catalog
+import controllers.plans as c_plans
+import requirements
+
+# What-if analysis: how a plan's courses would count under another major or
+# concentration. The plan is loaded once and matched in memory against the
+# cached requirement sections of each candidate (requirements.evaluate);
+# nothing is written, so advisors don't need a suggestion copy to find out.
+
+# sections: [SectionProgress] in requirement order
+# credits: credits counted toward the sections, at most each section's requirement
+# satisfied / outstanding: the complete and incomplete SectionProgress entries
+WhatIf = namedtuple("WhatIf", [
+    "major_id", "concentration_id", "sections", "credits", "credits_required", "satisfied", "outstanding"
+])
+
+
+def evaluate_courses(courses, major_id, concentration_id=None):
+    """WhatIf for a set of (subject, number) courses under a major and concentration."""
+    sections = requirements.evaluate(requirements.get_sections(major_id, concentration_id), courses,
+                                     requirements.get_course_credits())
+    return WhatIf(
+        major_id, concentration_id, tuple(sections),
+        sum(min(progress.credits, progress.section.credits_required) for progress in sections),
+        sum(progress.section.credits_required for progress in sections),
+        tuple(progress for progress in sections if requirements.is_complete(progress)),
+        tuple(progress for progress in sections if not requirements.is_complete(progress)),
+    )
+
+
+def _plan_courses(snapshot):
+    return {(course.subject, course.number) for semester in snapshot.semesters for course in semester.courses}
+
+
+def what_if(plan_id, major_id=None, concentration_id=None):
+    """
+    How the plan's courses count under `major_id` / `concentration_id`. Either
+    defaults to the plan's own; a different major without a concentration is
+    evaluated with its major and gen ed sections only. None if the plan doesn't exist.
+    """
+    snapshot = c_plans.load_plan_snapshot(plan_id)
+    if snapshot is None:
+        return None
+    if major_id is None:
+        major_id = snapshot.major_id
+    if concentration_id is None and major_id == snapshot.major_id:
+        concentration_id = snapshot.concentration_id
+    return evaluate_courses(_plan_courses(snapshot), major_id, concentration_id)
+
+
+def compare_concentrations(plan_id, major_id=None):
+    """
+    [(concentration name, WhatIf)] for every concentration of `major_id`
+    (default: the plan's major), from a single load of the plan. [] if the plan doesn't exist.
+    """
+    snapshot = c_plans.load_plan_snapshot(plan_id)
+    if snapshot is None:
+        return []
+    major_id = snapshot.major_id if major_id is None else major_id
+    courses = _plan_courses(snapshot)
+    return [(concentration['name'], evaluate_courses(courses, major_id, concentration['id']))
+            for concentration in catalog.get_concentrations_by_major(major_id)]